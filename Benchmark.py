@@ -0,0 +1,495 @@
+"""
+Time operations of the data structures in DataStructures/
+
+Run from the repository root:
+    python Benchmark.py
+"""
+import collections
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from DataStructures.BinaryMaxHeap import BinaryMaxHeap
+from DataStructures.PairingHeap import PairingHeap
+from DataStructures.BinarySearchTree import BinarySearchTree
+from DataStructures.AVLTree import AVLTree
+from DataStructures.RedBlackTree import RedBlackTree
+from DataStructures.SplayTree import SplayTree
+from DataStructures.CompactBinarySearchTree import CompactBinarySearchTree
+from DataStructures.BPlusTree import BPlusTree
+from DataStructures.OpenAddressingHashTable import OpenAddressingHashTable
+from DataStructures.ChainedHashTable import ChainedHashTable
+from DataStructures.Stack import Stack
+from DataStructures.Queue import Queue
+from DataStructures.LinkedList import LinkedList
+from DataStructures.CompactLinkedList import CompactLinkedList
+
+
+def time_it(function, *args):
+    """
+    Time one call of function
+    :param function: function to be timed
+    :param args: arguments of function
+    :return: float seconds taken
+    """
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def show_result(title, count, seconds, baseline_seconds=None):
+    """
+    Output time per operation, and speedup over a baseline
+    :param title: name of operation
+    :param count: int number of operations timed
+    :param seconds: float seconds taken by all operations
+    :param baseline_seconds: float seconds taken by baseline, if any
+    :return: no return value
+    """
+    line = '{:<45} {:>10.3f} us/op'.format(title, seconds / count * 1e6)
+    if baseline_seconds is not None:
+        line += '   x{:.2f}'.format(baseline_seconds / seconds)
+    print (line)
+
+
+def benchmark_heap_sift(n=100000):
+    """
+    Compare fast sift loops (hole-moving, memoryview buffer)
+    against stepping through swaps, as verbose output does
+    :param n: int number of items
+    :return: no return value
+    """
+    print ('\nBinaryMaxHeap sift, n =', n)
+    values = [random.randint(0, 1 << 30) for _ in range(n)]
+
+    def add_all(heap):
+        for value in values:
+            heap.add_item(value)
+
+    def extract_all(heap):
+        for _ in range(n):
+            heap.extract_max()
+
+    results = {}
+    for fast_sift in (False, True):
+        heap = BinaryMaxHeap()
+        heap.fast_sift = fast_sift
+        results[fast_sift] = (time_it(add_all, heap), time_it(extract_all, heap))
+
+    slow_add, slow_extract = results[False]
+    fast_add, fast_extract = results[True]
+    show_result('add_item, swaps', n, slow_add)
+    show_result('add_item, fast sift', n, fast_add, slow_add)
+    show_result('extract_max, swaps', n, slow_extract)
+    show_result('extract_max, fast sift', n, fast_extract, slow_extract)
+
+
+def benchmark_heap_merge(n=100000, shards=8):
+    """
+    Compare merging shards of a BinaryMaxHeap (copy and rebuild)
+    against merging shards of a PairingHeap (link roots)
+    :param n: int number of items across all shards
+    :param shards: int number of heaps merged into the first
+    :return: no return value
+    """
+    print ('\nMerge', shards, 'heaps, n =', n)
+    values = [random.randint(0, 1 << 30) for _ in range(n)]
+    shard_values = [values[i::shards] for i in range(shards)]
+
+    def merge_all(heaps):
+        for heap in heaps[1:]:
+            heaps[0].merge(heap)
+
+    binary_heaps = [BinaryMaxHeap(shard) for shard in shard_values]
+    pairing_heaps = [PairingHeap(shard) for shard in shard_values]
+    binary_seconds = time_it(merge_all, binary_heaps)
+    pairing_seconds = time_it(merge_all, pairing_heaps)
+    show_result('BinaryMaxHeap.merge', shards - 1, binary_seconds)
+    show_result('PairingHeap.merge', shards - 1, pairing_seconds, binary_seconds)
+
+
+def benchmark_tree_writes(n=20000, sorted_n=2000):
+    """
+    Compare insert and delete throughput of the binary search trees
+    on random keys, and on sorted keys (worst case of the unbalanced tree)
+    :param n: int number of random keys
+    :param sorted_n: int number of sorted keys
+    :return: no return value
+    """
+    tree_classes = (BinarySearchTree, AVLTree, RedBlackTree)
+
+    def insert_all(tree, keys):
+        for key in keys:
+            tree.insert(key)
+
+    def delete_all(tree, keys):
+        for key in keys:
+            tree.delete(key)
+
+    for title, count, keys in (('random', n, random.sample(range(n * 10), n)),
+                               ('sorted', sorted_n, list(range(sorted_n)))):
+        print ('\nTree insert/delete,', title, 'keys, n =', count)
+        delete_keys = random.sample(keys, len(keys))
+        baseline = None
+        for tree_class in tree_classes:
+            tree = tree_class()
+            insert_seconds = time_it(insert_all, tree, keys)
+            delete_seconds = time_it(delete_all, tree, delete_keys)
+            if baseline is None:
+                baseline = (insert_seconds, delete_seconds)
+            show_result(tree_class.__name__ + '.insert', count, insert_seconds, baseline[0])
+            show_result(tree_class.__name__ + '.delete', count, delete_seconds, baseline[1])
+
+
+def benchmark_tree_skewed_search(n=10000, searches=50000, zipf_a=1.3):
+    """
+    Compare search throughput of the binary search trees
+    when a few keys take most searches (Zipf distribution)
+    :param n: int number of keys in tree
+    :param searches: int number of searches
+    :param zipf_a: float Zipf parameter, larger is more skewed
+    :return: no return value
+    """
+    print ('\nTree search, Zipf({}) keys, n = {}'.format(zipf_a, n))
+    keys = random.sample(range(n * 10), n)
+    # Rank r is searched with probability proportional to r^-a
+    ranks = np.minimum(np.random.zipf(zipf_a, searches), n) - 1
+    search_keys = [keys[rank] for rank in ranks]
+
+    def search_all(tree):
+        for key in search_keys:
+            tree.search(key)
+
+    baseline = None
+    for tree_class in (BinarySearchTree, AVLTree, SplayTree):
+        tree = tree_class()
+        for key in keys:
+            tree.insert(key)
+        seconds = time_it(search_all, tree)
+        baseline = baseline or seconds
+        show_result(tree_class.__name__ + '.search', searches, seconds, baseline)
+
+
+def benchmark_tree_memory(n=100000):
+    """
+    Compare memory and insert time of a node-object BinarySearchTree
+    and the array-backed CompactBinarySearchTree
+    :param n: int number of keys inserted
+    :return: no return value
+    """
+    print ('\nTree memory, n = {}'.format(n))
+    keys = random.sample(range(n * 10), n)
+
+    def insert_all(tree):
+        for key in keys:
+            tree.insert(key)
+
+    baseline = None
+    for tree_class in (BinarySearchTree, CompactBinarySearchTree):
+        tracemalloc.start()
+        tree = tree_class()
+        seconds = time_it(insert_all, tree)
+        allocated, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        baseline = baseline or seconds
+        show_result(tree_class.__name__ + '.insert', n, seconds, baseline)
+        print ('    {:.1f} bytes/node ({:.1f} MB peak)'.format(allocated / n, peak / 2**20))
+
+
+def benchmark_tree_bulk_load(n=100000):
+    """
+    Compare building a tree by repeated insert
+    with building it balanced by from_array
+    :param n: int number of keys
+    :return: no return value
+    """
+    print ('\nTree bulk load, n = {}'.format(n))
+    keys = np.random.permutation(n * 10)[:n]
+
+    def insert_all(tree_class):
+        tree = tree_class()
+        for key in keys.tolist():
+            tree.insert(key)
+
+    for tree_class in (BinarySearchTree, AVLTree, RedBlackTree):
+        baseline = time_it(insert_all, tree_class)
+        show_result(tree_class.__name__ + '.insert', n, baseline, baseline)
+        seconds = time_it(tree_class.from_array, keys)
+        show_result(tree_class.__name__ + '.from_array', n, seconds, baseline)
+
+
+def benchmark_tree_batches(n=100000, batch=50000):
+    """
+    Compare one search or insert per key
+    with contains_many and insert_many on a whole batch
+    :param n: int number of keys in tree
+    :param batch: int number of keys in batch
+    :return: no return value
+    """
+    print ('\nTree batches, n = {}, batch = {}'.format(n, batch))
+    keys = np.random.permutation(n * 10)[:n + batch]
+    tree_keys = keys[:n]
+    batch_keys = keys[n:]
+
+    def search_each(tree):
+        for key in batch_keys.tolist():
+            tree.search(key)
+
+    def insert_each(tree):
+        for key in batch_keys.tolist():
+            tree.insert(key)
+
+    for tree_class in (BinarySearchTree, AVLTree):
+        tree = tree_class.from_array(tree_keys)
+        baseline = time_it(search_each, tree)
+        show_result(tree_class.__name__ + '.search', batch, baseline, baseline)
+        seconds = time_it(tree.contains_many, batch_keys)
+        show_result(tree_class.__name__ + '.contains_many', batch, seconds, baseline)
+
+        baseline = time_it(insert_each, tree_class.from_array(tree_keys))
+        show_result(tree_class.__name__ + '.insert', batch, baseline, baseline)
+        seconds = time_it(tree_class.from_array(tree_keys).insert_many, batch_keys)
+        show_result(tree_class.__name__ + '.insert_many', batch, seconds, baseline)
+
+
+def benchmark_tree_delete(n=1000000, deletes=20000):
+    """
+    Compare delete, which relinks pointers directly,
+    with removing the node one subtree at a time (the path verbose delete shows)
+    Both delete from the same tree, different keys
+    :param n: int number of keys in tree
+    :param deletes: int number of deletes with each path
+    :return: no return value
+    """
+    print ('\nTree delete, n = {}'.format(n))
+    keys = np.random.permutation(n * 10)[:n]
+    tree = BinarySearchTree.from_array(keys)
+    delete_keys = keys[:2 * deletes].tolist()
+
+    def delete_in_steps(keys_to_delete):
+        for key in keys_to_delete:
+            tree.remove_node_in_steps(tree.search(key))
+
+    def delete_each(keys_to_delete):
+        for key in keys_to_delete:
+            tree.delete(key)
+
+    baseline = time_it(delete_in_steps, delete_keys[:deletes])
+    show_result('BinarySearchTree.remove_node_in_steps', deletes, baseline, baseline)
+    seconds = time_it(delete_each, delete_keys[deletes:])
+    show_result('BinarySearchTree.delete', deletes, seconds, baseline)
+
+
+def benchmark_b_plus_tree(n=200000, searches=100000, ranges=1000, range_size=1000):
+    """
+    Compare a B+ tree with an AVL tree
+    on inserts, point searches and range scans
+    :param n: int number of keys inserted
+    :param searches: int number of searches
+    :param ranges: int number of range scans
+    :param range_size: int keys in each range
+    :return: no return value
+    """
+    print ('\nB+ tree, n = {}'.format(n))
+    keys = np.random.permutation(n * 10)[:n].tolist()
+    search_keys = random.sample(keys, searches)
+    sorted_keys = sorted(keys)
+    starts = [random.randrange(n - range_size) for _ in range(ranges)]
+    range_bounds = [(sorted_keys[i], sorted_keys[i + range_size - 1]) for i in starts]
+
+    def insert_all(tree):
+        for key in keys:
+            tree.insert(key)
+
+    def search_all(tree):
+        for key in search_keys:
+            tree.search(key)
+
+    def range_all(tree):
+        for low, high in range_bounds:
+            for _ in tree.range(low, high):
+                pass
+
+    trees = (AVLTree(), BPlusTree(fanout=64))
+    for operation, count in ((insert_all, n), (search_all, searches), (range_all, ranges * range_size)):
+        baseline = None
+        for tree in trees:
+            seconds = time_it(operation, tree)
+            baseline = baseline or seconds
+            show_result('{}.{}'.format(type(tree).__name__, operation.__name__.split('_')[0]),
+                        count, seconds, baseline)
+
+
+def benchmark_hash_tables(n=200000, batch=100000):
+    """
+    Compare hash tables with an AVL tree
+    on one put or search per key, and on whole batches
+    :param n: int number of keys in each structure
+    :param batch: int number of keys searched
+    :return: no return value
+    """
+    print ('\nHash tables, n = {}, batch = {}'.format(n, batch))
+    keys = np.random.permutation(n * 10)[:n]
+    # Half of the searched keys are in the structures
+    search_keys = np.concatenate((keys[:batch // 2], np.random.randint(n * 10, n * 20, batch - batch // 2)))
+
+    def insert_each(structure):
+        for key in keys.tolist():
+            structure.insert(key)
+
+    def put_each(table):
+        for key in keys.tolist():
+            table.put(key, key)
+
+    def search_each(structure):
+        for key in search_keys.tolist():
+            structure.search(key)
+
+    def get_each(table):
+        for key in search_keys.tolist():
+            table.get(key)
+
+    tree = AVLTree()
+    baseline_put = time_it(insert_each, tree)
+    show_result('AVLTree.insert', n, baseline_put, baseline_put)
+    baseline_get = time_it(search_each, tree)
+    show_result('AVLTree.search', batch, baseline_get, baseline_get)
+    show_result('AVLTree.contains_many', batch, time_it(tree.contains_many, search_keys), baseline_get)
+
+    for table_class in (OpenAddressingHashTable, ChainedHashTable):
+        name = table_class.__name__
+        show_result(name + '.put', n, time_it(put_each, table_class()), baseline_put)
+        table = table_class()
+        show_result(name + '.put_many', n, time_it(table.put_many, keys, keys), baseline_put)
+        show_result(name + '.get', batch, time_it(get_each, table), baseline_get)
+        show_result(name + '.get_many', batch, time_it(table.get_many, search_keys), baseline_get)
+        show_result(name + '.contains_many', batch, time_it(table.contains_many, search_keys), baseline_get)
+
+
+def benchmark_stack_and_queue(n=1000000, batch=1000):
+    """
+    Compare collections.deque with Stack and Queue,
+    one item at a time and in batches of whole slices
+    :param n: int number of items pushed and popped
+    :param batch: int items in each push_many and pop_many
+    :return: no return value
+    """
+    print ('\nStack and queue, n = {}, batch = {}'.format(n, batch))
+    items = np.random.randint(0, n, n)
+    batches = [items[i:i + batch] for i in range(0, n, batch)]
+
+    def through_deque(pop_left):
+        deque = collections.deque()
+        pop = deque.popleft if pop_left else deque.pop
+        for item in items.tolist():
+            deque.append(item)
+        for _ in range(n):
+            pop()
+
+    def through_each(structure):
+        for item in items.tolist():
+            structure.push(item)
+        for _ in range(n):
+            structure.pop()
+
+    def through_many(structure):
+        for items_batch in batches:
+            structure.push_many(items_batch)
+        for _ in batches:
+            structure.pop_many(batch)
+
+    for structure_class, pop_left in ((Stack, False), (Queue, True)):
+        name = structure_class.__name__
+        baseline = time_it(through_deque, pop_left)
+        show_result('collections.deque, as ' + name, n, baseline, baseline)
+        show_result(name + '.push, pop', n, time_it(through_each, structure_class()), baseline)
+        show_result(name + '.push_many, pop_many', n, time_it(through_many, structure_class()), baseline)
+
+
+def benchmark_linked_lists(n=100000, operations=500000, hit_rate=0.8):
+    """
+    Run an LRU cache of n keys on each linked list:
+    a hit moves its node to the front, a miss evicts the back and pushes the new key to the front
+    :param n: int number of keys in cache
+    :param operations: int number of lookups
+    :param hit_rate: float fraction of lookups that hit
+    :return: no return value
+    """
+    print ('\nLinked lists, LRU cache of n = {}'.format(n))
+    is_hit = (np.random.random(operations) < hit_rate).tolist()
+    hit_keys = np.random.randint(0, n, operations).tolist()
+
+    def run_cache(linked_list):
+        # Node of each key in cache, by slot
+        nodes = [linked_list.push_front(key) for key in range(n)]
+        for hit, slot in zip(is_hit, hit_keys):
+            if hit:
+                linked_list.move_to_front(nodes[slot])
+            else:
+                linked_list.pop_back()
+                nodes[slot] = linked_list.push_front(slot)
+
+    baseline = None
+    for name, new_list in (('LinkedList', lambda: LinkedList()),
+                           ('LinkedList, pool_size = 1024', lambda: LinkedList(pool_size=1024)),
+                           ('CompactLinkedList', lambda: CompactLinkedList(list_size=n))):
+        tracemalloc.start()
+        linked_list = new_list()
+        seconds = time_it(run_cache, linked_list)
+        allocated, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        baseline = baseline or seconds
+        show_result(name, operations, seconds, baseline)
+        print ('    {:.1f} bytes/node ({:.1f} MB peak)'.format(allocated / n, peak / 2**20))
+
+
+def benchmark_snapshots(n=500000):
+    """
+    Compare rebuilding a tree or heap by inserting every key again
+    with saving it to a snapshot and loading that
+    :param n: int number of keys
+    :return: no return value
+    """
+    print ('\nSnapshots, n = {}'.format(n))
+    keys = np.random.permutation(n * 10)[:n]
+    path = os.path.join(tempfile.mkdtemp(), 'snapshot.bin')
+
+    def insert_all(structure):
+        for key in keys.tolist():
+            structure.insert(key)
+
+    tree = BinarySearchTree()
+    baseline = time_it(insert_all, tree)
+    show_result('BinarySearchTree.insert', n, baseline, baseline)
+    show_result('BinarySearchTree.save', n, time_it(tree.save, path), baseline)
+    show_result('BinarySearchTree.load', n, time_it(BinarySearchTree.load, path), baseline)
+    show_result('CompactBinarySearchTree.load', n, time_it(CompactBinarySearchTree.load, path), baseline)
+
+    heap = BinaryMaxHeap()
+
+    def add_all():
+        for key in keys.tolist():
+            heap.add_item(key)
+
+    baseline = time_it(add_all)
+    show_result('BinaryMaxHeap.add_item', n, baseline, baseline)
+    show_result('BinaryMaxHeap.save', n, time_it(heap.save, path), baseline)
+    show_result('BinaryMaxHeap.load', n, time_it(BinaryMaxHeap.load, path), baseline)
+    os.remove(path)
+
+
+benchmark_heap_sift()
+benchmark_heap_merge()
+benchmark_tree_writes()
+benchmark_tree_skewed_search()
+benchmark_tree_bulk_load()
+benchmark_tree_batches()
+benchmark_tree_delete()
+benchmark_b_plus_tree()
+benchmark_snapshots()
+benchmark_hash_tables()
+benchmark_stack_and_queue()
+benchmark_linked_lists()
+benchmark_tree_memory()
@@ -0,0 +1,27 @@
+from DataStructures.BinarySearchNode import BinarySearchNode
+
+
+class AVLNode(BinarySearchNode):
+    """
+    Binary search node that knows the balance of its subtree
+    Heights are kept by BinarySearchNode
+    """
+    __slots__ = ()
+
+    @classmethod
+    def or_none(cls, node):
+        """
+        Verify passed node is a member of this class
+        Return either the node or None
+        :param node: node in question
+        :return: AVLNode object || None
+        """
+        return node if isinstance(node, cls) else None
+
+    def get_balance(self):
+        """
+        Balance factor, height of left subtree minus height of right subtree
+        An AVL tree keeps every balance factor in [-1, 1]
+        :return: int balance factor
+        """
+        return AVLNode.height_of(self.get_left()) - AVLNode.height_of(self.get_right())
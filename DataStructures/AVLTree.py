@@ -0,0 +1,105 @@
+from DataStructures.AVLNode import AVLNode
+from DataStructures.BinarySearchTree import BinarySearchTree
+
+
+class AVLTree(BinarySearchTree):
+    """
+    Implement AVL tree, a self-balancing binary search tree
+
+    The heights of the two subtrees of every node differ by at most one,
+    so the height of the tree stays O(log n)
+    and so do insert, search and delete.
+
+    For simplicity, all input must be integers
+    """
+    node_class = AVLNode
+    rebalances = True
+
+    def insert(self, key, verbose=False):
+        """
+        Insert key into tree, then rebalance from its parent up
+        @overrides method in BinarySearchTree
+        :param key: key of new node
+        :param verbose: boolean show actions during insert
+        :return: new node
+        """
+        node = super().insert(key, verbose=verbose)
+        self.rebalance(node.get_parent(), verbose=verbose)
+
+        if self.debug:
+            self.validate()
+
+        return node
+
+    def delete(self, key, verbose=False) -> AVLNode or None:
+        """
+        Delete a node in the tree by the passed key value,
+        then rebalance from the lowest node whose subtree changed
+        @overrides method in BinarySearchTree
+        :param key: key of node to delete
+        :param verbose: boolean show actions during delete
+        :return: returns the node if it is in the tree
+        """
+        # Assert valid input
+        assert(isinstance(key, int))
+
+        node = self.search(key, verbose=verbose)
+        if node is None:
+            return None
+
+        lowest_changed = self.remove_node(node, verbose=verbose)
+        self.rebalance(lowest_changed, verbose=verbose)
+
+        if self.debug:
+            self.validate()
+
+        return node
+
+    def rebalance(self, node, verbose=False):
+        """
+        Walk from node up to the head,
+        rotating where a subtree is out of balance
+        Heights are already up to date, except above rotations made here,
+        so each height is refreshed on the way up
+        :param node: AVLNode lowest node whose subtree changed
+        :param verbose: boolean show rotations
+        :return: no return value
+        """
+        while node is not None:
+            # Inlined update_height and get_balance, this runs up the whole path
+            left = node.left
+            right = node.right
+            left_height = left.height if left is not None else 0
+            right_height = right.height if right is not None else 0
+            node.height = 1 + (left_height if left_height > right_height else right_height)
+            balance = left_height - right_height
+
+            if balance > 1:
+                # Left side too tall
+                # Left-right case, first turn left child into left-left case
+                if left.get_balance() < 0:
+                    self.rotate(left, left_rotation=True, verbose=verbose)
+                node = self.rotate(node, left_rotation=False, verbose=verbose)
+            elif balance < -1:
+                # Right side too tall
+                # Right-left case, first turn right child into right-right case
+                if right.get_balance() > 0:
+                    self.rotate(right, left_rotation=False, verbose=verbose)
+                node = self.rotate(node, left_rotation=True, verbose=verbose)
+
+            node = node.get_parent()
+
+    @staticmethod
+    def rotate(node, left_rotation, verbose=False):
+        """
+        Rotate subtree rooted at node
+        BinarySearchNode rotations update the sizes and heights of the two nodes that moved,
+        and the head of the tree. Ancestors are left to rebalance
+        :param node: AVLNode root of subtree
+        :param left_rotation: boolean rotate left if True, else right
+        :param verbose: boolean show rotation
+        :return: AVLNode new root of subtree
+        """
+        if left_rotation:
+            return node.rotate_left(verbose=verbose, update_ancestors=False)
+        return node.rotate_right(verbose=verbose, update_ancestors=False)
@@ -0,0 +1,74 @@
+import numpy as np
+
+
+class BPlusNode:
+    """
+    Node of a B+ tree
+    Sorted keys are kept in a contiguous NumPy array, so finding a key
+    is one binary search over an array instead of a chain of node objects
+    Internal nodes hold a list of children, one more than their keys
+    Leaves hold no children, and link to the next leaf to the right
+    """
+    __slots__ = ('keys', 'key_buffer', 'count', 'children', 'next_leaf')
+
+    def __init__(self, capacity, is_leaf=True):
+        """
+        :param capacity: int number of keys that fit in this node
+        :param is_leaf: boolean node is a leaf (no children)
+        """
+        self.keys = np.zeros(capacity, dtype=np.int64)
+        # Indexing a memoryview yields Python ints, which bisect compares quickly
+        self.key_buffer = memoryview(self.keys)
+        # Number of keys in use, keys[:count]
+        self.count = 0
+        self.children = None if is_leaf else []
+        self.next_leaf = None
+
+    def is_leaf(self):
+        """
+        :return: True if (node is a leaf) else False
+        """
+        return self.children is None
+
+    def get_keys(self):
+        """
+        :return: np.ndarray view of the keys in use
+        """
+        return self.keys[:self.count]
+
+    def set_keys(self, keys):
+        """
+        Replace all keys of this node
+        :param keys: np.ndarray of sorted keys, no more than capacity
+        :return: no return value
+        """
+        count = len(keys)
+        self.keys[:count] = keys
+        self.count = count
+
+    def insert_key_at(self, index, key):
+        """
+        Insert key at index, shifting the keys after it to the right
+        There must be room for one more key
+        :param index: int position of new key
+        :param key: int new key
+        :return: no return value
+        """
+        count = self.count
+        if index < count:
+            self.keys[index + 1:count + 1] = self.keys[index:count]
+        self.key_buffer[index] = key
+        self.count = count + 1
+
+    def remove_key_at(self, index):
+        """
+        Remove key at index, shifting the keys after it to the left
+        :param index: int position of key
+        :return: int removed key
+        """
+        key = self.key_buffer[index]
+        count = self.count
+        if index < count - 1:
+            self.keys[index:count - 1] = self.keys[index + 1:count]
+        self.count = count - 1
+        return key
@@ -0,0 +1,460 @@
+import numpy as np
+from bisect import bisect_left, bisect_right
+from DataStructures.BPlusNode import BPlusNode
+from DataStructures.BinarySearchTree import TreePropertyException
+# Support for terminal colors in linux, max, and windows
+import colorama
+colorama.init()
+
+
+class BPlusTree:
+    """
+    Implement B+ tree, a search tree of wide nodes
+
+    Each node holds up to fanout - 1 sorted keys in a NumPy array,
+    and an internal node has one child more than it has keys.
+    Every key is in a leaf, internal keys only separate the children:
+    keys in children[i] are between keys[i - 1] and keys[i].
+    All leaves are at the same depth, and each links to the next one,
+    so a range of keys is read leaf after leaf.
+    The height is O(log n / log fanout), and finding a key
+    takes one binary search per level.
+
+    Same interface as BinarySearchTree: insert, search, delete, show
+    For simplicity, all input must be integers
+    """
+    HIGHLIGHT_FORE = colorama.Fore.MAGENTA
+    HIGHLIGHT_BACK = colorama.Back.WHITE
+    # For debugging and staging, not production
+    debug = False
+
+    def __init__(self, fanout=64):
+        """
+        :param fanout: int largest number of children of a node, at least 3
+        """
+        assert(fanout >= 3)
+        self.fanout = int(fanout)
+        # Largest and smallest number of keys in a node other than the head
+        self.max_keys = self.fanout - 1
+        self.min_keys = self.max_keys // 2
+        # Head of tree is a BPlusNode or None(empty)
+        self.head = None
+        # Number of keys in tree
+        self.count = 0
+
+    def new_node(self, is_leaf):
+        """
+        Create an empty node, with room for one extra key before it splits
+        :param is_leaf: boolean node is a leaf
+        :return: BPlusNode
+        """
+        return BPlusNode(self.fanout, is_leaf=is_leaf)
+
+    def is_empty(self):
+        """
+        :return: True if (tree is empty) else False
+        """
+        return self.head is None
+
+    def __len__(self):
+        """
+        Number of keys in tree, O(1)
+        :return: int key count
+        """
+        return self.count
+
+    def insert(self, key, verbose=False) -> BPlusNode:
+        """
+        Insert key into tree
+        Equal keys go right, as in BinarySearchTree
+        A node that overflows splits in two, and its parent takes a new separator key
+        When the head splits, the tree grows one level at the top
+        :param key: key to insert
+        :param verbose: boolean show tree after insert
+        :return: leaf holding new key
+        """
+        # Assert valid input
+        assert(isinstance(key, int))
+
+        if self.head is None:
+            self.head = self.new_node(is_leaf=True)
+
+        leaf, separator, new_node = self.insert_into(self.head, key)
+        if new_node is not None:
+            # Head split, new head has the two halves as children
+            head = self.new_node(is_leaf=False)
+            head.insert_key_at(0, separator)
+            head.children.extend((self.head, new_node))
+            self.head = head
+        self.count += 1
+
+        # Show tree if verbose
+        if verbose:
+            self.show(primary_highlights=leaf)
+
+        if self.debug:
+            self.validate()
+
+        return leaf
+
+    def insert_into(self, node, key):
+        """
+        Insert key into the subtree of node
+        Recursion is only as deep as the tree
+        :param node: BPlusNode head of subtree
+        :param key: key to insert
+        :return: (
+            BPlusNode leaf holding new key,
+            int separator key for new_node or None,
+            BPlusNode right half of node if it split, else None
+            )
+        """
+        index = bisect_right(node.key_buffer, key, 0, node.count)
+        if node.is_leaf():
+            node.insert_key_at(index, key)
+            leaf = node
+        else:
+            leaf, separator, new_child = self.insert_into(node.children[index], key)
+            if new_child is None:
+                return leaf, None, None
+            node.insert_key_at(index, separator)
+            node.children.insert(index + 1, new_child)
+
+        if node.count <= self.max_keys:
+            return leaf, None, None
+
+        separator, new_node = self.split(node)
+        if leaf is node and key >= separator:
+            leaf = new_node
+        return leaf, separator, new_node
+
+    def split(self, node):
+        """
+        Move the upper half of an overflowing node into a new node to its right
+        A leaf keeps a copy of the separator (the first key of the new leaf),
+        an internal node moves its middle key up to the parent
+        :param node: BPlusNode with one key too many
+        :return: (int separator key, BPlusNode new right node)
+        """
+        count = node.count
+        middle = count // 2
+        new_node = self.new_node(is_leaf=node.is_leaf())
+        if node.is_leaf():
+            new_node.set_keys(node.keys[middle:count])
+            node.count = middle
+            separator = new_node.key_buffer[0]
+            # Link new leaf into the list of leaves
+            new_node.next_leaf = node.next_leaf
+            node.next_leaf = new_node
+        else:
+            separator = node.key_buffer[middle]
+            new_node.set_keys(node.keys[middle + 1:count])
+            new_node.children = node.children[middle + 1:]
+            del node.children[middle + 1:]
+            node.count = middle
+
+        return separator, new_node
+
+    def find_leaf(self, key):
+        """
+        Find the leftmost leaf that may hold key
+        :param key: search key
+        :return: BPlusNode leaf, or None if tree is empty
+        """
+        node = self.head
+        while node is not None and node.children is not None:
+            node = node.children[bisect_left(node.key_buffer, key, 0, node.count)]
+        return node
+
+    def search(self, key, verbose=False) -> BPlusNode or None:
+        """
+        Find the leaf with the first instance of key
+        :param key: search key
+        :param verbose: boolean show found leaf
+        :return: BPlusNode leaf holding key, or None if not found
+        """
+        leaf = self.find_leaf(key)
+        if leaf is None:
+            return None
+
+        index = bisect_left(leaf.key_buffer, key, 0, leaf.count)
+        if index == leaf.count:
+            # Every key here is smaller, key can only be first in the next leaf
+            leaf = leaf.next_leaf
+            index = 0
+        if leaf is None or leaf.key_buffer[index] != key:
+            return None
+
+        # Show found leaf if verbose
+        if verbose:
+            self.show(primary_highlights=leaf)
+
+        return leaf
+
+    def delete(self, key, verbose=False) -> int or None:
+        """
+        Delete one instance of key from the tree
+        Do not raise exception on not found.
+        A node left with too few keys borrows one from a sibling,
+        or else merges with it. When the head is left with one child,
+        the tree shrinks one level at the top
+        :param key: key to delete
+        :param verbose: boolean show tree after delete
+        :return: int deleted key, or None if not found
+        """
+        # Assert valid input
+        assert(isinstance(key, int))
+
+        if self.head is None or not self.delete_from(self.head, key):
+            return None
+        self.count -= 1
+
+        head = self.head
+        if head.count == 0:
+            # Empty leaf, or internal head with a single child
+            self.head = None if head.is_leaf() else head.children[0]
+
+        # Show tree if verbose
+        if verbose:
+            self.show()
+
+        if self.debug:
+            self.validate()
+
+        return key
+
+    def delete_from(self, node, key):
+        """
+        Delete key from the subtree of node, fixing children left too small
+        Recursion is only as deep as the tree
+        :param node: BPlusNode head of subtree
+        :param key: key to delete
+        :return: boolean key was found and deleted
+        """
+        keys = node.key_buffer
+        index = bisect_left(keys, key, 0, node.count)
+        if node.is_leaf():
+            if index < node.count and keys[index] == key:
+                node.remove_key_at(index)
+                return True
+            return False
+
+        # Equal keys may continue into the next children,
+        # as long as their separator is the key
+        while True:
+            if self.delete_from(node.children[index], key):
+                if node.children[index].count < self.min_keys:
+                    self.fix_underflow(node, index)
+                return True
+            if index < node.count and keys[index] == key:
+                index += 1
+            else:
+                return False
+
+    def fix_underflow(self, parent, index):
+        """
+        Child at index has one key too few
+        Borrow a key from a sibling that can spare one, or else merge with a sibling
+        :param parent: BPlusNode parent of the child
+        :param index: int index of the child in parent
+        :return: no return value
+        """
+        child = parent.children[index]
+        left = parent.children[index - 1] if index > 0 else None
+        right = parent.children[index + 1] if index < parent.count else None
+
+        if left is not None and left.count > self.min_keys:
+            # Move last key of left sibling to the front of child
+            if child.is_leaf():
+                child.insert_key_at(0, left.remove_key_at(left.count - 1))
+                parent.key_buffer[index - 1] = child.key_buffer[0]
+            else:
+                # Separator comes down, last key of left goes up
+                child.insert_key_at(0, parent.key_buffer[index - 1])
+                child.children.insert(0, left.children.pop())
+                parent.key_buffer[index - 1] = left.remove_key_at(left.count - 1)
+        elif right is not None and right.count > self.min_keys:
+            # Move first key of right sibling to the end of child
+            if child.is_leaf():
+                child.insert_key_at(child.count, right.remove_key_at(0))
+                parent.key_buffer[index] = right.key_buffer[0]
+            else:
+                # Separator comes down, first key of right goes up
+                child.insert_key_at(child.count, parent.key_buffer[index])
+                child.children.append(right.children.pop(0))
+                parent.key_buffer[index] = right.remove_key_at(0)
+        elif left is not None:
+            self.merge(parent, index - 1)
+        else:
+            self.merge(parent, index)
+
+    def merge(self, parent, index):
+        """
+        Merge child at index + 1 into child at index, and drop their separator
+        Both fit in one node, since neither could spare a key
+        :param parent: BPlusNode parent of both children
+        :param index: int index of the left child in parent
+        :return: no return value
+        """
+        left = parent.children[index]
+        right = parent.children.pop(index + 1)
+        separator = parent.remove_key_at(index)
+
+        count = left.count
+        if left.is_leaf():
+            # Leaves already hold every key, the separator is only a copy
+            left.keys[count:count + right.count] = right.get_keys()
+            left.count = count + right.count
+            left.next_leaf = right.next_leaf
+        else:
+            # Separator comes down between the two halves
+            left.key_buffer[count] = separator
+            left.keys[count + 1:count + 1 + right.count] = right.get_keys()
+            left.count = count + 1 + right.count
+            left.children.extend(right.children)
+
+    def first_leaf(self):
+        """
+        :return: BPlusNode leftmost leaf, or None if tree is empty
+        """
+        node = self.head
+        while node is not None and node.children is not None:
+            node = node.children[0]
+        return node
+
+    def range(self, low=None, high=None):
+        """
+        Generate keys from low to high, both inclusive, in order
+        Finds the first leaf once, then reads leaves left to right
+        Do not change the tree while iterating
+        :param low: smallest key to yield, None for no lower bound
+        :param high: largest key to yield, None for no upper bound
+        :return: generator of keys
+        """
+        if low is None:
+            leaf = self.first_leaf()
+            index = 0
+        else:
+            leaf = self.find_leaf(low)
+            index = bisect_left(leaf.key_buffer, low, 0, leaf.count) if leaf is not None else 0
+
+        while leaf is not None:
+            count = leaf.count
+            if high is not None and count > 0 and leaf.key_buffer[count - 1] > high:
+                # Last leaf in range
+                yield from leaf.keys[index:bisect_right(leaf.key_buffer, high, index, count)].tolist()
+                return
+            yield from leaf.keys[index:count].tolist()
+            leaf = leaf.next_leaf
+            index = 0
+
+    def __iter__(self):
+        """
+        Iterate over keys in order, see range
+        :return: generator of keys
+        """
+        return self.range()
+
+    def get_levels(self):
+        """
+        :return: list [list [BPlusNode]] nodes of each level, head first
+        """
+        levels = []
+        level = [self.head] if self.head is not None else []
+        while len(level) > 0:
+            levels.append(level)
+            if level[0].is_leaf():
+                break
+            level = [child for node in level for child in node.children]
+        return levels
+
+    def validate(self):
+        """
+        Check every node, O(n)
+        Keys are sorted and between the separators of their parent,
+        nodes other than the head have enough keys, internal nodes
+        have one more child than keys, all leaves are at the same depth
+        and linked left to right
+        :return: True if tree is consistent
+        :raises TreePropertyException: at the first node that is not
+        """
+        if self.head is None:
+            if self.count != 0:
+                raise TreePropertyException(message="Empty tree has count {}".format(self.count))
+            return True
+
+        # Stack of (node, depth, lowest allowed key, highest allowed key)
+        leaves = []
+        leaf_depth = None
+        stack = [(self.head, 1, None, None)]
+        while len(stack) > 0:
+            node, depth, low, high = stack.pop()
+            keys = node.get_keys()
+            if node is not self.head and node.count < self.min_keys:
+                raise TreePropertyException(message="Node {} has too few keys".format(keys))
+            if node.count > self.max_keys:
+                raise TreePropertyException(message="Node {} has too many keys".format(keys))
+            if np.any(keys[1:] < keys[:-1]):
+                raise TreePropertyException(message="Node {} is not sorted".format(keys))
+            if node.count > 0 and ((low is not None and keys[0] < low) or (high is not None and keys[-1] > high)):
+                raise TreePropertyException(
+                    message="Node {} is outside of its separators [{}, {}]".format(keys, low, high))
+
+            if node.is_leaf():
+                if leaf_depth is not None and depth != leaf_depth:
+                    raise TreePropertyException(message="Leaf {} is at depth {}, not {}".format(keys, depth, leaf_depth))
+                leaf_depth = depth
+                leaves.append(node)
+                continue
+
+            if len(node.children) != node.count + 1:
+                raise TreePropertyException(message="Node {} has {} children".format(keys, len(node.children)))
+            # Push right to left, so leaves are reached left to right
+            bounds = [low] + keys.tolist() + [high]
+            for i in range(node.count, -1, -1):
+                stack.append((node.children[i], depth + 1, bounds[i], bounds[i + 1]))
+
+        for i, leaf in enumerate(leaves):
+            expected = leaves[i + 1] if i + 1 < len(leaves) else None
+            if leaf.next_leaf is not expected:
+                raise TreePropertyException(message="Leaf {} links to the wrong leaf".format(leaf.get_keys()))
+
+        if sum(leaf.count for leaf in leaves) != self.count:
+            raise TreePropertyException(message="Tree count {} does not match its leaves".format(self.count))
+
+        return True
+
+    def show(self, primary_highlights=(None,)):
+        """
+        Show B+ tree, one line per level, each node as [key key ...]
+        :param primary_highlights: tuple (BPlusNode,) or BPlusNode to be highlighted
+        :return: no return value
+        """
+        primary_highlights = primary_highlights if type(primary_highlights) is tuple else (None, primary_highlights)
+
+        if self.is_empty():
+            print ('****************')
+            print ('No items in tree')
+            print ('****************')
+            return
+
+        lines = []
+        for level in self.get_levels():
+            cells = []
+            for node in level:
+                cell = '[' + ' '.join(str(key) for key in node.get_keys().tolist()) + ']'
+                # Highlight may not change the width, pad before coloring
+                cells.append((cell, node in primary_highlights))
+            lines.append(cells)
+
+        # Lowest level is the widest, center the others over it
+        width = max(sum(len(cell) + 1 for cell, _ in cells) for cells in lines)
+        print (''.center(width, '*'))
+        for cells in lines:
+            plain = ' '.join(cell for cell, _ in cells)
+            padding = ' ' * ((width - len(plain)) // 2)
+            colored = ' '.join(self.HIGHLIGHT_FORE + self.HIGHLIGHT_BACK + cell + colorama.Style.RESET_ALL
+                               if highlighted else cell
+                               for cell, highlighted in cells)
+            print (padding + colored)
+        print (''.center(width, '*'))
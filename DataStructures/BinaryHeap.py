@@ -1,35 +1,130 @@
 import numpy as np
+import operator
+from DataStructures.FastBuffer import FastBuffer
+from DataStructures.Snapshot import Snapshot, SnapshotException
 # Support for terminal colors in linux, max, and windows
 import colorama
 colorama.init()
 
 
+class HeapPropertyException(Exception):
+    def __init__(self, expression="HeapProperty", message="Heap property not satisfied"):
+        self.expression = expression
+        self.message = message
+
+
+class HandleNotFoundException(Exception):
+    def __init__(self, expression="HandleNotFound", message="Handle not found in heap"):
+        self.expression = expression
+        self.message = message
+
+
+class OutputStrings:
+    BEFORE =    'Before action performed.'
+    ADDED =     'Value added to end of heap. Heap property not necessarily satisfied.'
+    ADDED_MANY = 'Values added to end of heap. Heap property not necessarily satisfied.'
+    EXTRACTED = 'Top value extracted. Heap property not necessarily satisfied.'
+    MIDDLE =    'Intermediate heap. Heap property not necessarily satisfied.'
+    END =       'Final heap. Heap property satisfied.'
+
+
 class BinaryHeap:
     """
     Implement heap data structure as np.ndarray
 
-    For simplicity, only allow integers
+    Items are numbers of any NumPy dtype (int64 by default)
+    or records of a NumPy structured dtype, ordered by one key field.
+    Either way, items are stored contiguously.
+
+    The order of the heap is left to extending classes (see has_priority).
+    Every node has arity children, 2 for a binary heap.
+    Wider heaps (4, 8) are shallower, so sifting down visits fewer levels.
     """
 
-    # Heap as unlimited numpy array
-    # Useful for math functions such as max
-    heap_size = 10
-    heap = np.array([0] * heap_size, dtype=np.int)
-    # Last item points to size
-    last_item = -1
-    # Deepest level, zero-indexed1
-    level = 0
     # When an item is not found
     default_value = 0
+    # Whether the largest key is on top, set by extending classes
+    # Must agree with has_priority, used by vectorized (NumPy) operations
+    largest_first = None
+    # Sift without verbose output through sift_up and sift_down
+    # Turn off to always step through swaps, as verbose output does
+    fast_sift = True
+    # Validate the whole heap after every change, O(n)
+    # For debugging and staging, not production
+    debug = False
+    # Memory management
+    # When full, allocate growth_factor times the current space
+    growth_factor = 2
+    # When extracting leaves the heap only 1 / growth_factor^2 full,
+    # release memory down to 1 / growth_factor of the current space
+    # Shrinking by less than growing keeps add/extract pairs from thrashing
+    auto_shrink = True
+    # Never automatically shrink below this size
+    min_heap_size = 10
+    # Verbose messages
+    output_strings = OutputStrings
     # Highlight colors for verbose
     HIGHLIGHT_FORE = colorama.Fore.MAGENTA
     HIGHLIGHT_BACK = colorama.Back.WHITE
 
-    def add_item(self, new_value):
+    def __init__(self, heap_size=10, dtype=np.int64, key_field=None, key=None, arity=2, track_handles=False):
         """
-        Add item to heap
+        Each heap owns its own memory
+        :param heap_size: int number of items that fit before more memory is allocated
+        :param dtype: NumPy dtype of items in the heap, may be structured
+                      e.g. [('priority', np.float64), ('id', np.int64)]
+        :param key_field: for structured dtypes, name of the field that orders the heap
+                          (default: first field)
+        :param key: optional function of an item, the heap is ordered by its return values
+        :param arity: int number of children of each node
+        :param track_handles: boolean give each item a handle, kept up to date
+                              with the index of the item, so that it may be
+                              updated or removed in O(log n)
+        """
+        assert arity >= 2
+        self.arity = int(arity)
+        self.key = key
+        dtype = np.dtype(dtype)
+        # Records are ordered by one of their fields, numbers by themselves
+        if dtype.names is not None:
+            self.key_field = key_field if key_field is not None else dtype.names[0]
+            assert self.key_field in dtype.names
+        else:
+            assert key_field is None
+            self.key_field = None
+        # Heap as unlimited numpy array
+        # Useful for math functions such as max
+        self.heap_size = int(heap_size)
+        self.heap = np.zeros(self.heap_size, dtype=dtype)
+        # Handles, if tracked
+        #   handles[index] == handle of item at index, parallel to heap
+        #   positions[handle] == index of item, or -1 if handle is free
+        #   free_handles == stack of handles to be reused
+        self.track_handles = track_handles
+        self.handles = np.zeros(self.heap_size, dtype=np.int64) if track_handles else None
+        self.positions = np.zeros(0, dtype=np.int64) if track_handles else None
+        self.free_handles = []
+        self.handle_count = 0
+        self.update_sift_buffers()
+        # Last item points to size
+        self.last_item = -1
+
+    @property
+    def level(self):
+        """
+        Deepest level, zero-indexed
+        Only needed to show the heap, so found on demand
+        rather than on every add and extract
+        :return: int deepest level
+        """
+        return self.get_level_of(max(self.last_item, 0))
+
+    def append_item(self, new_value):
+        """
+        Add item to the end of the heap
+        Heap property is NOT updated, see add_item
         :param new_value: new value
-        :return: No return value
+        :return: int handle of item if tracked, else None
         """
 
         # Allocate more memory if necessary
@@ -37,18 +132,771 @@ class BinaryHeap:
         # Otherwise, have to duplicate ndarray every time
         # last_item is an index, heap_size is a limit (index + 1)
         if self.last_item >= self.heap_size - 1:
-            # Allocate double the memory
-            new_heap_list = self.heap.tolist() + [0] * self.heap_size
-            self.heap = np.array(new_heap_list, dtype=np.int)
-            self.heap_size *= 2
+            self.grow(self.last_item + 2)
 
         # Add item index and value
         # to already allocated memory
         self.last_item = self.last_item + 1
         self.heap[self.last_item] = new_value
 
-        # Update heap level
-        self.level = np.floor(np.log(self.last_item + 1) / np.log(2))
+        if self.track_handles:
+            handle = self.new_handles(1)[0]
+            self.handles[self.last_item] = handle
+            self.positions[handle] = self.last_item
+            return handle
+        return None
+
+    def append_items(self, new_values):
+        """
+        Add many items to the end of the heap in one copy
+        Heap property is NOT updated, see extend
+        :param new_values: iterable or np.ndarray of new values
+        :return: np.ndarray handles of new items if tracked, else int number of items added
+        """
+        # Copy into an ndarray once instead of one Python call per value
+        if isinstance(new_values, np.ndarray):
+            values = new_values.ravel()
+        else:
+            values = np.fromiter(new_values, dtype=self.heap.dtype)
+        count = len(values)
+        if count == 0:
+            return self.new_handles(0) if self.track_handles else 0
+
+        # Allocate enough memory for every new item at once
+        # last_item is an index, heap_size is a limit (index + 1)
+        first_new = self.last_item + 1
+        needed_size = first_new + count
+        if needed_size > self.heap_size:
+            self.grow(needed_size)
+
+        # Add values to already allocated memory
+        self.heap[first_new:needed_size] = values
+        self.last_item = needed_size - 1
+
+        if self.track_handles:
+            new_handles = self.new_handles(count)
+            self.handles[first_new:needed_size] = new_handles
+            self.positions[new_handles] = np.arange(first_new, needed_size)
+            return new_handles
+        return count
+
+    def add_item(self, new_value, verbose=False):
+        """
+        Add item to heap
+        Update heap property
+        :param new_value: new value
+        :param verbose: boolean show node movement for heap property
+        :return: int handle of item if tracked, else None
+        """
+
+        # Verbose: show heap before addition
+        if verbose:
+            self.log('BEFORE')
+
+        # Add as last item
+        # Update heap last_item
+        handle = self.append_item(new_value)
+
+        # Verbose: show heap before heap property satisfied
+        if verbose:
+            self.log('ADDED', highlight=self.last_item)
+
+        # Update heap property upwards
+        self.update_heap_property_up(self.last_item, verbose=verbose)
+
+        if self.debug:
+            self.validate()
+
+        return handle
+
+    def extend(self, new_values, verbose=False):
+        """
+        Add many items to heap
+        Update heap property
+        Few items relative to the heap are sifted up one at a time, O(k log n),
+        otherwise the whole heap is rebuilt bottom-up, O(n + k)
+        :param new_values: iterable or np.ndarray of new values
+        :param verbose: boolean show node movement for heap property
+        :return: np.ndarray handles of new items if tracked, else None
+        """
+
+        # Verbose: show heap before addition
+        if verbose:
+            self.log('BEFORE')
+
+        # Add as last items in one copy
+        # Update heap last_item
+        first_new = self.last_item + 1
+        new_handles = self.append_items(new_values)
+        count = self.last_item + 1 - first_new
+        if count == 0:
+            return new_handles if self.track_handles else None
+
+        # Verbose: show heap before heap property satisfied
+        if verbose:
+            self.log('ADDED_MANY')
+
+        # Sifting each new item up costs about log2(n) swaps apiece,
+        # rebuilding costs about n, pick the cheaper
+        size = self.last_item + 1
+        if first_new > 0 and count * np.log2(size) < size:
+            for i in range(first_new, size):
+                self.update_heap_property_up(i, verbose=verbose)
+        else:
+            self.heapify(verbose=verbose)
+
+        if self.debug:
+            self.validate()
+
+        return new_handles if self.track_handles else None
+
+    def merge(self, other, verbose=False):
+        """
+        Add all items of another heap to this heap
+        The items are copied in one step and, unless there are few of them,
+        the whole heap is rebuilt bottom-up in O(n + k) (see extend)
+        The other heap is not changed, and may be in any order
+        :param other: BinaryHeap whose items are added
+        :param verbose: boolean show node movement for heap property
+        :return: np.ndarray handles of new items if tracked, else None
+        """
+        assert isinstance(other, BinaryHeap)
+        return self.extend(other.heap[:other.last_item + 1], verbose=verbose)
+
+    def heapify(self, verbose=False):
+        """
+        Rebuild heap property over the whole heap, bottom-up
+        Leaves already satisfy the property, so start at the last parent
+        Sum of sift-down distances is O(n)
+        :param verbose: boolean show node movement for heap property
+        :return: no return value
+        """
+        last_parent = self.get_parent_index(self.last_item)
+        for i in range(last_parent, -1, -1):
+            self.update_heap_property_down(i, verbose=verbose)
+
+    def extract_top(self, verbose=False):
+        """
+        Remove first item (highest priority) and update heap property
+        :param verbose: boolean show node movement for heap property
+        :return: first item or default value if heap is empty
+        """
+        if self.last_item < 0:
+            return self.default_value
+
+        # Verbose: Show tree before popping
+        if verbose:
+            self.log('BEFORE')
+
+        # Remove first item
+        top_value = self.get_value_at(0)
+        if self.track_handles:
+            self.free_handle(self.handles[0])
+        # Replace first item with last item
+        self.move_item(self.last_item, 0)
+        self.last_item = self.last_item - 1
+
+        # Verbose: Show tree before fixing heap property
+        if verbose:
+            self.log('EXTRACTED', highlight=0)
+
+        # Update heap property downwards
+        # Nothing to update if the heap is now empty
+        if self.last_item >= 0:
+            self.update_heap_property_down(0, verbose=verbose)
+
+        # Release memory if the heap has been drained
+        self.check_shrink()
+
+        if self.debug:
+            self.validate()
+
+        return top_value
+
+    def extract_many(self, k, verbose=False):
+        """
+        Remove the first k items (highest priority) and update heap property
+        Few items relative to the heap are extracted one at a time, O(k log n),
+        otherwise the top k are partitioned out with NumPy
+        and the rest of the heap is rebuilt, O(n)
+        :param k: int number of items to extract
+        :param verbose: boolean show node movement for heap property
+                        (items are always extracted one at a time)
+        :return: np.ndarray up to k items in order of priority
+        """
+        size = self.last_item + 1
+        k = max(min(int(k), size), 0)
+
+        # Extracting each item sifts down about log2(n) levels,
+        # rebuilding sifts down about n / arity parents, pick the cheaper
+        if verbose or k * np.log2(max(size, 2)) < size / self.arity:
+            top_values = np.empty(k, dtype=self.heap.dtype)
+            for i in range(k):
+                top_values[i] = self.extract_top(verbose=verbose)
+            return top_values
+
+        # Partition out the top k items
+        top_indexes = self.get_top_indexes(k)
+        items = self.heap[:size]
+        top_values = items[top_indexes]
+
+        # Move the rest of the items to the front of the heap
+        is_rest = np.ones(size, dtype=bool)
+        is_rest[top_indexes] = False
+        rest_size = size - k
+        self.heap[:rest_size] = items[is_rest]
+        if self.track_handles:
+            for handle in self.handles[top_indexes]:
+                self.free_handle(handle)
+            rest_handles = self.handles[:size][is_rest]
+            self.handles[:rest_size] = rest_handles
+            self.positions[rest_handles] = np.arange(rest_size)
+        self.last_item = rest_size - 1
+
+        # Update heap property for the rest of the items
+        self.heapify()
+
+        # Release memory if the heap has been drained
+        self.check_shrink()
+
+        if self.debug:
+            self.validate()
+
+        return top_values
+
+    def get_top(self, k):
+        """
+        Get the first k items (highest priority) without removing them
+        :param k: int number of items
+        :return: np.ndarray up to k items in order of priority
+        """
+        return self.heap[self.get_top_indexes(k)]
+
+    def get_top_indexes(self, k):
+        """
+        Get indexes of the first k items (highest priority) by partitioning keys, O(n + k log k)
+        :param k: int number of items
+        :return: np.ndarray up to k indexes in order of priority
+        """
+        size = self.last_item + 1
+        k = max(min(int(k), size), 0)
+        if k == 0:
+            return np.empty(0, dtype=np.intp)
+
+        keys = self.get_keys()
+        # Only sort the top k keys, argpartition puts them on one side
+        if k == size:
+            indexes = np.arange(size)
+        elif self.largest_first:
+            indexes = np.argpartition(keys, size - k)[size - k:]
+        else:
+            indexes = np.argpartition(keys, k - 1)[:k]
+
+        order = np.argsort(keys[indexes], kind='stable')
+        if self.largest_first:
+            order = order[::-1]
+
+        return indexes[order]
+
+    def update_priority(self, handle, new_value, verbose=False):
+        """
+        Replace the item with the given handle, e.g. to change its priority,
+        and update heap property, O(log n)
+        Requires track_handles
+        :param handle: int handle of item
+        :param new_value: new value of item
+        :param verbose: boolean show node movement for heap property
+        :return: no return value
+        """
+        i_this = self.get_position(handle)
+
+        # Verbose: show heap before update
+        if verbose:
+            self.log('BEFORE', highlight=i_this)
+
+        self.set_value_at(i_this, new_value)
+
+        # The item moves either up or down, not both
+        self.update_heap_property_up(i_this, verbose=verbose)
+        if self.positions[handle] == i_this:
+            self.update_heap_property_down(i_this, verbose=verbose)
+
+        if self.debug:
+            self.validate()
+
+    def remove(self, handle, verbose=False):
+        """
+        Remove the item with the given handle and update heap property, O(log n)
+        Requires track_handles
+        :param handle: int handle of item
+        :param verbose: boolean show node movement for heap property
+        :return: removed item
+        """
+        i_this = self.get_position(handle)
+
+        # Verbose: show heap before removal
+        if verbose:
+            self.log('BEFORE', highlight=i_this)
+
+        removed_value = self.get_value_at(i_this)
+        self.free_handle(handle)
+
+        # Replace item with last item, which may move up or down
+        i_last = self.last_item
+        self.move_item(i_last, i_this)
+        self.last_item = i_last - 1
+        if i_this < i_last:
+            moved_handle = self.handles[i_this]
+            self.update_heap_property_up(i_this, verbose=verbose)
+            if self.positions[moved_handle] == i_this:
+                self.update_heap_property_down(i_this, verbose=verbose)
+
+        # Release memory if the heap has been drained
+        self.check_shrink()
+
+        if self.debug:
+            self.validate()
+
+        return removed_value
+
+    def get_position(self, handle):
+        """
+        Get index of the item with the given handle
+        Requires track_handles
+        :param handle: int handle of item
+        :return: int index of item
+        :raises HandleNotFoundException: if handle is not in the heap
+        """
+        if not self.track_handles:
+            raise HandleNotFoundException(message="Heap does not track handles")
+        if not 0 <= handle < len(self.positions) or self.positions[handle] < 0:
+            raise HandleNotFoundException(message="Handle {} not in heap".format(handle))
+        return int(self.positions[handle])
+
+    def get_value_of(self, handle):
+        """
+        Get item with the given handle
+        Requires track_handles
+        :param handle: int handle of item
+        :return: item
+        """
+        return self.get_value_at(self.get_position(handle))
+
+    def new_handles(self, count):
+        """
+        Get handles for new items, reusing freed handles first
+        :param count: int number of handles
+        :return: np.ndarray new handles
+        """
+        reused_count = min(count, len(self.free_handles))
+        reused = [self.free_handles.pop() for _ in range(reused_count)]
+
+        # Then handles never given out
+        first_fresh = self.handle_count
+        self.handle_count += count - reused_count
+        if self.handle_count > len(self.positions):
+            # Grow positions like the heap, a geometric amount at a time
+            new_length = max(int(np.ceil(len(self.positions) * self.growth_factor)), self.handle_count)
+            new_positions = np.full(new_length, -1, dtype=np.int64)
+            new_positions[:first_fresh] = self.positions[:first_fresh]
+            self.positions = new_positions
+            self.update_sift_buffers()
+
+        fresh = np.arange(first_fresh, self.handle_count, dtype=np.int64)
+        return np.concatenate((np.array(reused, dtype=np.int64), fresh))
+
+    def free_handle(self, handle):
+        """
+        Mark handle as no longer in the heap, so that it may be reused
+        :param handle: int handle of removed item
+        :return: no return value
+        """
+        self.positions[handle] = -1
+        self.free_handles.append(int(handle))
+
+    def move_item(self, i_from, i_to):
+        """
+        Copy item, and its handle if tracked, to another index
+        :param i_from: index of item
+        :param i_to: new index of item
+        :return: no return value
+        """
+        if i_from == i_to:
+            return
+        self.set_value_at(i_to, self.get_value_at(i_from))
+        if self.track_handles:
+            handle = self.handles[i_from]
+            self.handles[i_to] = handle
+            self.positions[handle] = i_to
+
+    def validate(self):
+        """
+        Check the heap property at every item, O(n)
+        No child may have priority over its parent
+        :return: True if heap property is satisfied
+        :raises HeapPropertyException: at the first item out of order
+        """
+        size = self.last_item + 1
+        if size <= 1:
+            return True
+
+        if self.key is None and self.largest_first is not None:
+            # Compare every child with its parent at once
+            keys = self.get_keys()
+            i_children = np.arange(1, size)
+            i_parents = (i_children - 1) // self.arity
+            if self.largest_first:
+                out_of_order = keys[i_children] > keys[i_parents]
+            else:
+                out_of_order = keys[i_children] < keys[i_parents]
+            bad_children = i_children[out_of_order]
+        else:
+            bad_children = [i for i in range(1, size)
+                            if self.has_priority(self.get_key_at(i), self.get_key_at(self.get_parent_index(i)))]
+
+        if len(bad_children) > 0:
+            i_child = int(bad_children[0])
+            raise HeapPropertyException(
+                message="Item at index {} has priority over its parent at index {}".format(
+                    i_child, self.get_parent_index(i_child)))
+
+        return True
+
+    def has_priority(self, key_0, key_1):
+        """
+        Whether an item with key_0 belongs above an item with key_1
+        Defines the order of the heap, must be overridden
+        :param key_0: key of first item
+        :param key_1: key of second item
+        :return: boolean key_0 strictly before key_1
+        """
+        raise NotImplementedError
+
+    def update_heap_property_up(self, starting_index, verbose=False):
+        """
+        Update heap property upwards
+        :param starting_index: index of value from which to start
+        :param verbose: boolean show node movement for heap property
+        :return: no return value
+        """
+        if not verbose and self.can_sift_fast():
+            self.sift_up(starting_index)
+            return
+
+        i_this = starting_index
+        # This node key does not change as it moves
+        this = self.get_key_at(i_this)
+        while i_this > 0:
+            # Parent node
+            i_parent = self.get_parent_index(i_this)
+            parent = self.get_key_at(i_parent)
+
+            if self.has_priority(this, parent):
+                self.swap(i_this, i_parent)
+                i_this = i_parent
+            else:
+                break
+
+            # Verbose: show intermediate heaps
+            if verbose and i_this > 0:
+                self.log('MIDDLE', highlight=i_this)
+
+        if verbose:
+            self.log('END', highlight=i_this)
+
+    def update_heap_property_down(self, starting_index, verbose=False):
+        """
+        Update heap property downwards
+        Swap with the child of highest priority so that it can become the parent
+        :param starting_index: index from which to start
+        :param verbose: boolean show node movement for heap property
+        :return: no return value
+        """
+        if not verbose and self.can_sift_fast():
+            self.sift_down(starting_index)
+            return
+
+        i_this = starting_index
+        # This node key does not change as it moves
+        this = self.get_key_at(i_this)
+        while True:
+            # Children are contiguous, stop at a leaf
+            i_first = self.get_child_index(i_this, 0)
+            if i_first > self.last_item:
+                break
+            i_end = min(i_first + self.arity, self.last_item + 1)
+
+            # Find the child of highest priority
+            i_best = i_first
+            best = self.get_key_at(i_first)
+            for i_child in range(i_first + 1, i_end):
+                child = self.get_key_at(i_child)
+                if self.has_priority(child, best):
+                    i_best = i_child
+                    best = child
+
+            # Check if changes are needed
+            if self.has_priority(best, this):
+                # This and child are out of order
+                self.swap(i_this, i_best)
+                i_this = i_best
+            else:
+                # No changes needed
+                break
+
+            # Verbose: Show intermediate heaps
+            if verbose:
+                self.log('MIDDLE', highlight=i_this)
+
+        # Verbose: show final heap
+        if verbose:
+            self.log('END', highlight=i_this)
+
+    def can_sift_fast(self):
+        """
+        Fast sifts compare keys directly, so they need
+        keys stored in the heap (no key function)
+        and a known order (largest_first)
+        :return: boolean sift_up and sift_down may be used
+        """
+        return self.fast_sift and self.key is None and self.largest_first is not None
+
+    def update_sift_buffers(self):
+        """
+        Set buffers for the fast sift loops, whenever the heap is (re)allocated
+        Numbers are read through a memoryview where possible (see FastBuffer),
+        which yields Python numbers instead of boxed NumPy scalars
+        Records are read through the heap and a view of their key field
+        :return: no return value
+        """
+        if self.key_field is not None:
+            self.sift_values = self.heap
+            self.sift_keys = self.heap[self.key_field]
+        else:
+            self.sift_values = self.sift_keys = FastBuffer.of(self.heap)
+
+        if self.track_handles:
+            self.sift_handles = FastBuffer.of(self.handles)
+            self.sift_positions = FastBuffer.of(self.positions)
+        else:
+            self.sift_handles = self.sift_positions = None
+
+    def sift_up(self, i_this):
+        """
+        Update heap property upwards, without verbose output
+        Rather than swapping, move a hole up the heap:
+        each parent out of order is moved down with one write,
+        and the sifted value is written once at its final index
+        :param i_this: index of value from which to start
+        :return: int final index of value
+        """
+        values = self.sift_values
+        keys = self.sift_keys
+        handles = self.sift_handles
+        positions = self.sift_positions
+        before = operator.gt if self.largest_first else operator.lt
+        arity = self.arity
+
+        value = values[i_this]
+        if self.key_field is not None:
+            # Records are views, keep the value before it is overwritten
+            value = value.copy()
+        this = keys[i_this]
+        if handles is not None:
+            handle = handles[i_this]
+
+        while i_this > 0:
+            i_parent = (i_this - 1) // arity
+            if not before(this, keys[i_parent]):
+                break
+            values[i_this] = values[i_parent]
+            if handles is not None:
+                moved_handle = handles[i_parent]
+                handles[i_this] = moved_handle
+                positions[moved_handle] = i_this
+            i_this = i_parent
+
+        values[i_this] = value
+        if handles is not None:
+            handles[i_this] = handle
+            positions[handle] = i_this
+        return i_this
+
+    def sift_down(self, i_this):
+        """
+        Update heap property downwards, without verbose output
+        Rather than swapping, move a hole down the heap:
+        the child of highest priority is moved up with one write,
+        and the sifted value is written once at its final index
+        :param i_this: index from which to start
+        :return: int final index of value
+        """
+        values = self.sift_values
+        keys = self.sift_keys
+        handles = self.sift_handles
+        positions = self.sift_positions
+        before = operator.gt if self.largest_first else operator.lt
+        arity = self.arity
+        size = self.last_item + 1
+
+        value = values[i_this]
+        if self.key_field is not None:
+            # Records are views, keep the value before it is overwritten
+            value = value.copy()
+        this = keys[i_this]
+        if handles is not None:
+            handle = handles[i_this]
+
+        while True:
+            # Children are contiguous, stop at a leaf
+            i_best = arity * i_this + 1
+            if i_best >= size:
+                break
+
+            # Find the child of highest priority
+            best = keys[i_best]
+            if arity == 2:
+                # Binary heaps skip the loop over children
+                i_right = i_best + 1
+                if i_right < size:
+                    right = keys[i_right]
+                    if before(right, best):
+                        i_best = i_right
+                        best = right
+            else:
+                for i_child in range(i_best + 1, min(i_best + arity, size)):
+                    child = keys[i_child]
+                    if before(child, best):
+                        i_best = i_child
+                        best = child
+
+            if not before(best, this):
+                break
+            values[i_this] = values[i_best]
+            if handles is not None:
+                moved_handle = handles[i_best]
+                handles[i_this] = moved_handle
+                positions[moved_handle] = i_this
+            i_this = i_best
+
+        values[i_this] = value
+        if handles is not None:
+            handles[i_this] = handle
+            positions[handle] = i_this
+        return i_this
+
+    def grow(self, needed_size):
+        """
+        Allocate growth_factor times the current memory,
+        or more if that is not enough for needed_size items
+        Geometric growth keeps add_item amortized O(1)
+        :param needed_size: int minimum number of items to fit
+        :return: no return value
+        """
+        new_heap_size = max(int(np.ceil(self.heap_size * self.growth_factor)), needed_size, 1)
+        self.reallocate(new_heap_size)
+
+    def reserve(self, new_heap_size):
+        """
+        Pre-size the heap so that new_heap_size items fit
+        without any further allocation
+        Never shrinks the heap
+        :param new_heap_size: int number of items to fit
+        :return: no return value
+        """
+        if new_heap_size > self.heap_size:
+            self.reallocate(new_heap_size)
+
+    def shrink_to_fit(self):
+        """
+        Release all memory not used by items in the heap
+        :return: no return value
+        """
+        self.reallocate(max(self.last_item + 1, 1))
+
+    def check_shrink(self):
+        """
+        After items are removed, release memory
+        if the heap is mostly empty (see auto_shrink)
+        The size is divided by growth_factor as many times as the rule allows,
+        so that one reallocation follows removing many items at once (extract_many)
+        :return: no return value
+        """
+        if not self.auto_shrink or self.heap_size <= self.min_heap_size:
+            return
+
+        size = self.last_item + 1
+        new_heap_size = self.heap_size
+        while new_heap_size > self.min_heap_size and size * self.growth_factor * self.growth_factor <= new_heap_size:
+            smaller_size = int(new_heap_size // self.growth_factor)
+            # A growth_factor of 1 or less never shrinks
+            if smaller_size >= new_heap_size:
+                break
+            new_heap_size = smaller_size
+
+        if new_heap_size < self.heap_size:
+            self.reallocate(max(new_heap_size, self.min_heap_size, size))
+
+    def reallocate(self, new_heap_size):
+        """
+        Move the items of the heap into a new array of new_heap_size
+        Only the items in the heap are copied, not the unused space
+        :param new_heap_size: int new size, at least the number of items
+        :return: no return value
+        """
+        size = self.last_item + 1
+        assert new_heap_size >= size
+        new_heap = np.zeros(new_heap_size, dtype=self.heap.dtype)
+        new_heap[:size] = self.heap[:size]
+        self.heap = new_heap
+        if self.track_handles:
+            new_handles = np.zeros(new_heap_size, dtype=np.int64)
+            new_handles[:size] = self.handles[:size]
+            self.handles = new_handles
+        self.heap_size = new_heap_size
+        self.update_sift_buffers()
+
+    def save(self, path):
+        """
+        Write the items of the heap to a snapshot file, as they are in memory
+        Handles and key functions are not saved
+        :param path: str path of file, overwritten
+        :return: no return value
+        """
+        meta = {'structure': 'heap',
+                'class': type(self).__name__,
+                'largest_first': self.largest_first,
+                'arity': self.arity,
+                'key_field': self.key_field}
+        Snapshot.write(path, {'heap': self.heap[:self.last_item + 1]}, meta)
+
+    @classmethod
+    def load(cls, path, key=None, mode='c'):
+        """
+        Map a heap snapshot into a new heap, O(1)
+        Items are paged in from the file as they are used.
+        The first item added beyond the snapshot copies the heap into memory
+        :param path: str path of file written by save
+        :param key: optional function of an item, must match the heap that was saved
+        :param mode: np.memmap mode, 'c' (default) keeps changes in memory,
+                     'r' maps read-only. Changes are never written back to the file,
+                     save again to keep them
+        :return: heap of this class
+        :raises SnapshotException: if the file does not hold a heap of the same order, or mode is not 'c' or 'r'
+        """
+        arrays, meta = Snapshot.read(path, mode=mode)
+        Snapshot.check(meta, 'heap', path)
+        if meta['largest_first'] != cls.largest_first:
+            raise SnapshotException(message="{} holds a {}, not a {}".format(path, meta['class'], cls.__name__))
+
+        items = arrays['heap']
+        heap = cls(heap_size=0, dtype=items.dtype, key_field=meta['key_field'], key=key, arity=meta['arity'])
+        heap.heap = items
+        heap.heap_size = len(items)
+        heap.last_item = len(items) - 1
+        heap.update_sift_buffers()
+
+        return heap
 
     def show(self, highlight=None):
         """
@@ -72,8 +920,8 @@ class BinaryHeap:
             Show line of asterisks to demarcate bounds of heap
             :return: no return value
             """
-            # Number of nodes on bottom is 2^hgt
-            max_nodes = int(np.power(2, hgt))
+            # Number of nodes on bottom is arity^hgt
+            max_nodes = int(np.power(self.arity, hgt))
             print (''.center(cell_wid * max_nodes, '*'))
 
         # Output each level
@@ -81,13 +929,13 @@ class BinaryHeap:
         last_level = 0
         for i in range(0, self.last_item + 1, 1):
             # Center each level so that has appropriate width
-            level = np.floor(np.log(i + 1) / np.log(2))
+            level = self.get_level_of(i)
             # At level up, break line
             if level > last_level:
                 last_level = level
                 print ('\n', end='')
             # On last line, pad each item by one space each side
-            width_each = int(np.power(2, self.level - level)) * minimum_cell
+            width_each = int(np.power(self.arity, self.level - level)) * minimum_cell
 
             # Get string value
             value_str = str(self.get_value_at(i))
@@ -101,50 +949,97 @@ class BinaryHeap:
         print ('\n', end='')
         demarcate_heap()
 
-    @staticmethod
-    def get_parent_index(i):
+    def get_parent_index(self, i):
         """
         Get index of parent node
         :param i: index (0-indexed) of node in question
         :return: parent node index
         """
         # Indexing for i_parent == i // 2 is NOT ZERO-INDEXED
-        pos = i + 1
-        parent_pos = pos // 2
-        parent_index = parent_pos - 1
-        return parent_index
+        # With zero-indexing, children of p are arity * p + 1 ... arity * p + arity
+        return (i - 1) // self.arity
 
-    @staticmethod
-    def get_left_index(i):
+    def get_child_index(self, i, n):
         """
-        Get index of left child
+        Get index of nth child
+        :param i: index (0-indexed) of parent item
+        :param n: which child (0-indexed), less than arity
+        :return: child index
+        """
+        return self.arity * i + n + 1
+
+    def get_left_index(self, i):
+        """
+        Get index of left (first) child
         :param i: index (0-indexed) of parent item
         :return: left child index
         """
-        pos = i + 1
-        left_pos = 2 * pos
-        left_index = left_pos - 1
-        return left_index
+        return self.get_child_index(i, 0)
 
-    @staticmethod
-    def get_right_index(i):
+    def get_right_index(self, i):
         """
-        Get index of right child
+        Get index of right (last) child
         :param i: index (0-indexed) of parent item
         :return: right child index
         """
-        pos = i + 1
-        right_pos = 2 * pos + 1
-        right_index = right_pos - 1
-        return right_index
+        return self.get_child_index(i, self.arity - 1)
+
+    def get_level_of(self, i):
+        """
+        Get level (zero-indexed) of index
+        Counted exactly rather than with logarithms,
+        which round badly at powers of arity
+        :param i: index (0-indexed) of item
+        :return: int level of item
+        """
+        level = 0
+        # Index after the last item of this level
+        level_end = 1
+        level_width = 1
+        while i >= level_end:
+            level_width *= self.arity
+            level_end += level_width
+            level += 1
+        return level
 
     def get_value_at(self, i):
         """
-        Get value at index or -np.inf if it doesn't exist
+        Get value at index or default_value if it doesn't exist
+        (-np.inf for max-heaps, np.inf for min-heaps)
+        Records are copied, otherwise they are views into the heap
         :param i: potential index
-        :return: value at index or default value
+        :return: value at index, as stored (a number of the heap dtype, or a record),
+                 or default_value
         """
-        return self.default_value if i > self.last_item else self.heap[i]
+        if i > self.last_item:
+            return self.default_value
+        value = self.heap[i]
+        return value.copy() if self.key_field is not None else value
+
+    def get_key_at(self, i):
+        """
+        Get key that orders the heap at index or default value if it doesn't exist
+        For numbers, the key is the value itself
+        :param i: potential index
+        :return: key at index or default value
+        """
+        if i > self.last_item:
+            return self.default_value
+        if self.key is not None:
+            return self.key(self.get_value_at(i))
+        if self.key_field is not None:
+            return self.heap[i][self.key_field]
+        return self.heap[i]
+
+    def get_keys(self):
+        """
+        Get keys of all items in the heap, in heap order
+        :return: np.ndarray view of keys (a copy if ordered by a key function)
+        """
+        items = self.heap[:self.last_item + 1]
+        if self.key is not None:
+            return np.array([self.key(item) for item in items])
+        return items[self.key_field] if self.key_field is not None else items
 
     def get_max_digs(self):
         """
@@ -153,12 +1048,18 @@ class BinaryHeap:
         :return (int, int): height, max_digs
         """
 
-        # Get maximum number of digits
-        # 20200607: np.ceil --> np.floor + 1
-        #   Consider edge case n = 9 vs n = 10
-        #   ceil(log_10(9)) == 1,       ceil(log_10(10)) == 1
-        #   floor(log_10(9)) + 1 == 1,  floor(log_10(10)) + 1 == 2
-        max_digs = int(np.floor(np.log10(np.max(self.heap))) + 1)
+        items = self.heap[:self.last_item + 1]
+        if np.issubdtype(items.dtype, np.integer) and np.min(items) > 0:
+            # Get maximum number of digits
+            # 20200607: np.ceil --> np.floor + 1
+            #   Consider edge case n = 9 vs n = 10
+            #   ceil(log_10(9)) == 1,       ceil(log_10(10)) == 1
+            #   floor(log_10(9)) + 1 == 1,  floor(log_10(10)) + 1 == 2
+            max_digs = int(np.floor(np.log10(np.max(items))) + 1)
+        else:
+            # Zero, negatives, floats and records
+            # have no simple formula, measure their strings
+            max_digs = max(len(str(item)) for item in items)
 
         return max_digs
 
@@ -182,4 +1083,23 @@ class BinaryHeap:
         value_0 = self.get_value_at(index_0)
         value_1 = self.get_value_at(index_1)
         self.set_value_at(index_0, value_1)
-        self.set_value_at(index_1, value_0)
\ No newline at end of file
+        self.set_value_at(index_1, value_0)
+
+        # Keep handles pointing to their items
+        if self.track_handles:
+            handle_0 = self.handles[index_0]
+            handle_1 = self.handles[index_1]
+            self.handles[index_0] = handle_1
+            self.handles[index_1] = handle_0
+            self.positions[handle_1] = index_0
+            self.positions[handle_0] = index_1
+
+    def log(self, string, highlight=None):
+        """
+        For verbose output, show message and heap state
+        :param string: string from strings[] list
+        :return: no return value
+        """
+        print (getattr(self.output_strings, string))
+        self.show(highlight=highlight)
+        print ('\n', end='')
@@ -5,6 +5,7 @@ import numpy as np
 class OutputStrings:
     BEFORE =    'Before action performed.'
     ADDED =     'Value added to end of heap. Max-heap property not necessarily satisfied.'
+    ADDED_MANY = 'Values added to end of heap. Max-heap property not necessarily satisfied.'
     EXTRACTED = 'Maximum value extracted. Max-heap property not necessarily satisfied.'
     MIDDLE =    'Intermediate heap. Max-heap property not necessarily satisfied.'
     END =       'Final heap. Max-heap property satisfied.'
@@ -14,14 +15,39 @@ class BinaryMaxHeap(BinaryHeap):
     """
     Implement max binary heap structure, extending BinaryHeap
     """
+    output_strings = OutputStrings
+    largest_first = True
 
-    def __init__(self):
+    def __init__(self, values=None, heap_size=10, dtype=np.int64, key_field=None, key=None, arity=2,
+                 track_handles=False):
         """
         Set default value of heap to negative infinity
+        :param values: optional iterable or np.ndarray of initial values,
+                       built into a heap in O(n)
+        :param heap_size: int number of items that fit before more memory is allocated
+        :param dtype: NumPy dtype of items in the heap, may be structured
+        :param key_field: for structured dtypes, name of the field that orders the heap
+        :param key: optional function of an item, the heap is ordered by its return values
+        :param arity: int number of children of each node
+        :param track_handles: boolean give each item a handle to update or remove it by
         """
-        super().__init__()
+        super().__init__(heap_size=heap_size, dtype=dtype, key_field=key_field, key=key, arity=arity,
+                         track_handles=track_handles)
         self.default_value = -np.inf
 
+        if values is not None:
+            self.extend(values)
+
+    def has_priority(self, key_0, key_1):
+        """
+        Larger keys belong above smaller keys
+        @overrides method in Heap
+        :param key_0: key of first item
+        :param key_1: key of second item
+        :return: boolean key_0 > key_1
+        """
+        return key_0 > key_1
+
     def update_max_heap_property_up(self, starting_index, verbose=False):
         """
         Update max heap property upwards
@@ -29,27 +55,7 @@ class BinaryMaxHeap(BinaryHeap):
         :param verbose: boolean show node movement for max-heap property
         :return: no return value
         """
-        i_this = starting_index
-        while i_this > 0:
-            # This node value
-            this = self.get_value_at(i_this)
-
-            # Parent node
-            i_parent = self.get_parent_index(i_this)
-            parent = self.get_value_at(i_parent)
-
-            if this > parent:
-                self.swap(i_this, i_parent)
-                i_this = i_parent
-            else:
-                break
-
-            # Verbose: show intermediate heaps
-            if verbose and i_this > 0:
-                self.log('MIDDLE', highlight=i_this)
-
-        if verbose:
-            self.log('END', highlight=i_this)
+        self.update_heap_property_up(starting_index, verbose=verbose)
 
     def update_max_heap_property_down(self, starting_index, verbose=False):
         """
@@ -58,65 +64,7 @@ class BinaryMaxHeap(BinaryHeap):
         :param verbose: boolean show node movement for max-heap property
         :return: no return value
         """
-        i_this = starting_index
-        while True:
-            # This node value
-            this = self.get_value_at(i_this)
-
-            # Left child
-            i_left = self.get_left_index(i_this)
-            left = self.get_value_at(i_left)
-
-            # Right child
-            i_right = self.get_right_index(i_this)
-            right = self.get_value_at(i_right)
-
-            # Check if changes are needed
-            if this < left:
-                # This and left child are out of order
-                self.swap(i_this, i_left)
-                i_this = i_left
-            elif this < right:
-                # This and right child are out of order
-                self.swap(i_this, i_right)
-                i_this = i_right
-            else:
-                # No changes needed
-                # Default value -inf reaches here
-                break
-
-            # Verbose: Show intermediate heaps
-            if verbose:
-                self.log('MIDDLE', highlight=i_this)
-
-        # Verbose: show final heap
-        if verbose:
-            self.log('END', highlight=i_this)
-
-    def add_item(self, new_value, verbose=False):
-        """
-        Add item to heap
-        Update max heap property
-        @overrides method in Heap
-        :param new_value: new integer value
-        :param verbose: boolean show node movement for max-heap property
-        :return: No return value
-        """
-
-        # Verbose: show heap before addition
-        if verbose:
-            self.log('BEFORE')
-
-        # Add as last item
-        # Update heap last_item and level
-        super().add_item(new_value)
-
-        # Verbose: show heap before max-heap property satisfied
-        if verbose:
-            self.log('ADDED', highlight=self.last_item)
-
-        # Update max heap property upwards
-        self.update_max_heap_property_up(self.last_item, verbose=verbose)
+        self.update_heap_property_down(starting_index, verbose=verbose)
 
     def extract_max(self, verbose=False):
         """
@@ -124,34 +72,12 @@ class BinaryMaxHeap(BinaryHeap):
         :param verbose: boolean show node movement for max-heap property
         :return: int first item (max)
         """
-        if self.last_item < 0:
-            return self.default_value
-
-        # Verbose: Show tree before popping
-        if verbose:
-            self.log('BEFORE')
-
-        # Remove first item
-        max_value = self.get_value_at(0)
-        # Replace first item with last item
-        self.set_value_at(0, self.get_value_at(self.last_item))
-        self.last_item = self.last_item - 1
-
-        # Verbose: Show tree before fixing max heap property
-        if verbose:
-            self.log('EXTRACTED', highlight=0)
+        return self.extract_top(verbose=verbose)
 
-        # Update max heap property downwards
-        self.update_max_heap_property_down(0, verbose=verbose)
-
-        return max_value
-
-    def log(self, string, highlight=None):
+    def nlargest(self, k):
         """
-        For verbose output, show message and heap state
-        :param string: string from strings[] list
-        :return: no return value
+        Get the k largest items without removing them
+        :param k: int number of items
+        :return: np.ndarray up to k items, largest first
         """
-        print (OutputStrings.__getattribute__(OutputStrings, string))
-        self.show(highlight=highlight)
-        print ('\n', end='')
+        return self.get_top(k)
@@ -0,0 +1,65 @@
+from DataStructures.BinaryHeap import BinaryHeap
+import numpy as np
+
+
+class OutputStrings:
+    BEFORE =    'Before action performed.'
+    ADDED =     'Value added to end of heap. Min-heap property not necessarily satisfied.'
+    ADDED_MANY = 'Values added to end of heap. Min-heap property not necessarily satisfied.'
+    EXTRACTED = 'Minimum value extracted. Min-heap property not necessarily satisfied.'
+    MIDDLE =    'Intermediate heap. Min-heap property not necessarily satisfied.'
+    END =       'Final heap. Min-heap property satisfied.'
+
+
+class BinaryMinHeap(BinaryHeap):
+    """
+    Implement min binary heap structure, extending BinaryHeap
+    """
+    output_strings = OutputStrings
+    largest_first = False
+
+    def __init__(self, values=None, heap_size=10, dtype=np.int64, key_field=None, key=None, arity=2,
+                 track_handles=False):
+        """
+        Set default value of heap to positive infinity
+        :param values: optional iterable or np.ndarray of initial values,
+                       built into a heap in O(n)
+        :param heap_size: int number of items that fit before more memory is allocated
+        :param dtype: NumPy dtype of items in the heap, may be structured
+        :param key_field: for structured dtypes, name of the field that orders the heap
+        :param key: optional function of an item, the heap is ordered by its return values
+        :param arity: int number of children of each node
+        :param track_handles: boolean give each item a handle to update or remove it by
+        """
+        super().__init__(heap_size=heap_size, dtype=dtype, key_field=key_field, key=key, arity=arity,
+                         track_handles=track_handles)
+        self.default_value = np.inf
+
+        if values is not None:
+            self.extend(values)
+
+    def has_priority(self, key_0, key_1):
+        """
+        Smaller keys belong above larger keys
+        @overrides method in Heap
+        :param key_0: key of first item
+        :param key_1: key of second item
+        :return: boolean key_0 < key_1
+        """
+        return key_0 < key_1
+
+    def extract_min(self, verbose=False):
+        """
+        Remove first item (min) and update min-heap property
+        :param verbose: boolean show node movement for min-heap property
+        :return: int first item (min)
+        """
+        return self.extract_top(verbose=verbose)
+
+    def nsmallest(self, k):
+        """
+        Get the k smallest items without removing them
+        :param k: int number of items
+        :return: np.ndarray up to k items, smallest first
+        """
+        return self.get_top(k)
@@ -2,10 +2,7 @@ from DataStructures.BinaryTree import BinaryTree
 from DataStructures.Node import Node
 
 class BinaryNode(Node):
-    tree    = None
-    parent  = None
-    left    = None
-    right   = None
+    __slots__ = ('tree', 'parent', 'left', 'right')
 
     @classmethod
     def or_none(cls, node):
@@ -85,6 +82,9 @@ class BinaryNode(Node):
         if node is not None:
             node.parent = self
 
+        # Subtree of self changed
+        self.update_upwards()
+
     def set_right(self, new_right_child):
         """
         Set right child to passed node if valid
@@ -99,6 +99,18 @@ class BinaryNode(Node):
         if node is not None:
             node.parent = self
 
+        # Subtree of self changed
+        self.update_upwards()
+
+    def update_upwards(self):
+        """
+        Called by set_left and set_right after the subtree of self changed
+        Nodes that keep data about their subtree update it here,
+        for self and its ancestors. A BinaryNode keeps none
+        :return: no return value
+        """
+        pass
+
     def set_tree(self, new_tree):
         """
         Set the tree of this node
@@ -179,6 +191,8 @@ class BinaryNode(Node):
         # Remove node from tree
         self.set_parent(None)
 
+        return replacement
+
     def __contains__(self, compare):
         """
         Dummy function to prevent exceptions
@@ -2,6 +2,10 @@ from DataStructures.BinaryNode import BinaryNode
 
 
 class BinarySearchNode(BinaryNode):
+    # Number of nodes in subtree rooted at this node, a leaf has size 1
+    # Height of subtree rooted at this node, a leaf has height 1
+    __slots__ = ('size', 'height')
+
     @classmethod
     def or_none(cls, node):
         """
@@ -12,6 +16,88 @@ class BinarySearchNode(BinaryNode):
         """
         return node if isinstance(node, cls) else None
 
+    @staticmethod
+    def size_of(node):
+        """
+        Number of nodes in subtree rooted at node
+        :param node: BinarySearchNode or None
+        :return: int size, 0 for an empty subtree
+        """
+        return node.size if node is not None else 0
+
+    @staticmethod
+    def height_of(node):
+        """
+        Height of subtree rooted at node
+        :param node: BinarySearchNode or None
+        :return: int height, 0 for an empty subtree
+        """
+        return node.height if node is not None else 0
+
+    def __init__(self, key, tree=None, parent=None, left=None, right=None):
+        """
+        Initialize with kwargs for each object variable
+        :param key: key value for new node
+        :param parent: BinarySearchNode parent of new new node
+        :param left: BinarySearchNode left child of new node
+        :param right: BinarySearchNode right child of new node
+        """
+        super().__init__(key, tree=tree, parent=parent, left=left, right=right)
+        self.update_size()
+        self.update_height()
+
+    def update_size(self):
+        """
+        Set size from the sizes of both children
+        Children must already be up to date
+        :return: int new size
+        """
+        self.size = 1 + BinarySearchNode.size_of(self.left) + BinarySearchNode.size_of(self.right)
+        return self.size
+
+    def update_height(self):
+        """
+        Set height from the heights of both children
+        Children must already be up to date
+        :return: int new height
+        """
+        left = self.left
+        right = self.right
+        left_height = left.height if left is not None else 0
+        right_height = right.height if right is not None else 0
+        self.height = 1 + (left_height if left_height > right_height else right_height)
+        return self.height
+
+    def update_upwards(self):
+        """
+        Update size and height of self, then of its ancestors
+        Stop at the first node where neither changed,
+        nothing above it changed either
+        @overrides method in BinaryNode
+        :return: no return value
+        """
+        # Inlined update_size and update_height, this runs on every insert and delete
+        node = self
+        while node is not None:
+            left = node.left
+            right = node.right
+            if left is not None:
+                size = 1 + left.size
+                height = left.height
+            else:
+                size = 1
+                height = 0
+            if right is not None:
+                size += right.size
+                if right.height > height:
+                    height = right.height
+            height += 1
+            if size == node.size and height == node.height:
+                break
+            node.size = size
+            node.height = height
+            node = node.parent
+
     def predecessor(self, verbose=False):
         """
         Get the predecessor node of this node by using the binary search tree property
@@ -60,18 +146,22 @@ class BinarySearchNode(BinaryNode):
         # Finish
         return successor
 
-    def rotate_left(self, verbose=False):
+    def rotate_left(self, verbose=False, update_ancestors=True):
         """
         Rotate subtree rooted at self to the left
         Recommended this be called from a Tree function of the same name
         So that Tree.head can be accounted for
+        Pointers are relinked directly, rotations are on the hot path
+        of every self-balancing tree
         :param verbose: boolean show actions during insert
+        :param update_ancestors: boolean update heights above the subtree,
+            False if the caller will (e.g. it keeps rotating up to the head)
         :return: new root of subtree
         """
         #
-        new_subroot = self.get_right()
+        new_subroot = self.right
         if new_subroot is None:
-            print ("Cannot rotate subtree rooted at node (%d) to the left".format(self.get_key()))
+            print ("Cannot rotate subtree rooted at node ({}) to the left".format(self.get_key()))
             return
 
         # Show root nodes that will be rotated
@@ -80,33 +170,41 @@ class BinarySearchNode(BinaryNode):
 
         # If right child has a left child,
         # it needs to jump to the other side of the new root
-        problem_child = new_subroot.get_left()
-        if problem_child is not None:
-            # Show the problem child before it is removed
-            if verbose:
-                self.show(primary_highlights=new_subroot, secondary_highlights=(self, problem_child))
-
-            problem_child = problem_child.remove_as_subtree()
+        problem_child = new_subroot.left
+        if problem_child is not None and verbose:
+            # Show the problem child before it is moved
+            self.show(primary_highlights=new_subroot, secondary_highlights=(self, problem_child))
 
         # Shift new subroot up
-        parent = self.get_parent()
-        new_subroot.set_parent(parent)
+        parent = self.parent
+        new_subroot.parent = parent
         if parent is not None:
-            if self.is_left_child():
-                parent.set_left(new_subroot)
+            if parent.left is self:
+                parent.left = new_subroot
             else:
-                parent.set_right(new_subroot)
-
-        # Update pointer to tree head if necessary
-        if self.tree and self.tree.head == self:
+                parent.right = new_subroot
+        elif self.tree is not None and self.tree.head is self:
+            # Update pointer to tree head if necessary
             self.tree.head = new_subroot
 
         # Shift self down
-        new_subroot.set_left(self)
+        new_subroot.left = self
+        self.parent = new_subroot
 
         # Reattach problem child
-        self.set_parent(new_subroot)
-        self.set_right(problem_child)
+        self.right = problem_child
+        if problem_child is not None:
+            problem_child.parent = self
+
+        # Subtree holds the same nodes, only the two that moved change size
+        new_subroot.size = self.size
+        self.update_size()
+        # Heights of the two that moved may change, and so the height of the subtree
+        self.update_height()
+        new_subroot.update_height()
+        # show() takes the height of the tree from its head, keep it current when verbose
+        if (update_ancestors or verbose) and parent is not None:
+            parent.update_upwards()
 
         # Show final tree
         if verbose:
@@ -115,15 +213,19 @@ class BinarySearchNode(BinaryNode):
         # Return new subroot of tree
         return new_subroot
 
-    def rotate_right(self, verbose=False):
+    def rotate_right(self, verbose=False, update_ancestors=True):
         """
         Rotate subtree rooted at self to the right
         Recommended this be called from a Tree function of the same name
         So that Tree.head can be accounted for
+        Pointers are relinked directly, rotations are on the hot path
+        of every self-balancing tree
         :param verbose: boolean show actions during insert
+        :param update_ancestors: boolean update heights above the subtree,
+            False if the caller will (e.g. it keeps rotating up to the head)
         :return: new root of subtree
         """
-        new_subroot = self.get_left()
+        new_subroot = self.left
         if new_subroot is None:
             return None
 
@@ -133,33 +235,41 @@ class BinarySearchNode(BinaryNode):
 
         # If left child has a right child,
         # It needs to jump from left side to right side
-        problem_child = new_subroot.get_right()
-        if problem_child is not None:
-            # Show the problem child before it is removed
-            if verbose:
-                self.show(primary_highlights=new_subroot, secondary_highlights=(self, problem_child))
-
-            problem_child = problem_child.remove_as_subtree()
+        problem_child = new_subroot.right
+        if problem_child is not None and verbose:
+            # Show the problem child before it is moved
+            self.show(primary_highlights=new_subroot, secondary_highlights=(self, problem_child))
 
         # Shift new subroot up
-        parent = self.get_parent()
-        new_subroot.set_parent(parent)
+        parent = self.parent
+        new_subroot.parent = parent
         if parent is not None:
-            if self.is_left_child():
-                parent.set_left(new_subroot)
+            if parent.left is self:
+                parent.left = new_subroot
             else:
-                parent.set_right(new_subroot)
-
-        # Update pointer to tree head if necessary
-        if self.tree and self.tree.head == self:
+                parent.right = new_subroot
+        elif self.tree is not None and self.tree.head is self:
+            # Update pointer to tree head if necessary
             self.tree.head = new_subroot
 
         # Shift self down
-        new_subroot.set_right(self)
+        new_subroot.right = self
+        self.parent = new_subroot
 
         # Reattach problem child
-        self.set_parent(new_subroot)
-        self.set_left(problem_child)
+        self.left = problem_child
+        if problem_child is not None:
+            problem_child.parent = self
+
+        # Subtree holds the same nodes, only the two that moved change size
+        new_subroot.size = self.size
+        self.update_size()
+        # Heights of the two that moved may change, and so the height of the subtree
+        self.update_height()
+        new_subroot.update_height()
+        # show() takes the height of the tree from its head, keep it current when verbose
+        if (update_ancestors or verbose) and parent is not None:
+            parent.update_upwards()
 
         # Show final tree
         if verbose:
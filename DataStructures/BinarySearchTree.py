@@ -1,5 +1,8 @@
+import numpy as np
+from bisect import bisect_left
 from DataStructures.BinarySearchNode import BinarySearchNode
 from DataStructures.BinaryTree import BinaryTree
+from DataStructures.Snapshot import Snapshot
 
 
 class EmptyTreeException(Exception):
@@ -14,25 +17,187 @@ class NodeNotFoundException(Exception):
         self.message = message
 
 
+class TreePropertyException(Exception):
+    def __init__(self, expression="TreeProperty", message="Tree property not satisfied"):
+        self.expression = expression
+        self.message = message
+
+
 class BinarySearchTree(BinaryTree):
     """
     Implement binary search tree
 
     For simplicity, all input must be integers
     """
+    # Class of nodes created by insert
+    # Trees that extend this one may store more in each node
+    node_class = BinarySearchNode
+    # Trees that rebalance after each insert set this,
+    # insert_many then inserts one key at a time instead of attaching subtrees
+    rebalances = False
+
+    @classmethod
+    def from_sorted(cls, keys):
+        """
+        Build a perfectly balanced tree from keys in O(n)
+        Each subtree is headed by the middle key of its range,
+        so the height is floor(log2(n)) + 1
+        Unsorted input is sorted with NumPy first, O(n log n)
+        :param keys: iterable of integers, preferably sorted ascending
+        :return: new tree of this class
+        """
+        keys = np.asarray(keys if isinstance(keys, np.ndarray) else list(keys))
+        if keys.size > 1 and np.any(keys[1:] < keys[:-1]):
+            keys = np.sort(keys, kind='stable')
+
+        return cls.build_balanced(keys)
+
+    @classmethod
+    def from_array(cls, keys):
+        """
+        Build a perfectly balanced tree from an array of keys in any order
+        Sorts with NumPy, O(n log n), then builds as from_sorted, O(n)
+        :param keys: np.ndarray of integers
+        :return: new tree of this class
+        """
+        return cls.build_balanced(np.sort(np.asarray(keys).ravel(), kind='stable'))
+
+    @classmethod
+    def build_balanced(cls, sorted_keys):
+        """
+        Link nodes for sorted_keys into a new tree, middle key first
+        Each node is passed to bulk_loaded once its subtrees are complete
+        :param sorted_keys: np.ndarray of integers, sorted ascending
+        :return: new tree of this class
+        """
+        # Assert valid input
+        assert(sorted_keys.size == 0 or np.issubdtype(sorted_keys.dtype, np.integer))
+
+        tree = cls()
+        # Python ints, as insert would store them
+        keys = sorted_keys.tolist()
+        # Depth of the lowest level, the head is at depth 1
+        tree.head = tree.build_subtree(keys, 0, len(keys), 1, len(keys).bit_length())
+
+        return tree
+
+    def build_subtree(self, keys, low, high, depth, height):
+        """
+        Build a balanced subtree of new nodes for keys[low:high]
+        :param keys: list of integers, sorted ascending
+        :param low: int index of first key
+        :param high: int index after last key
+        :param depth: int depth the head of the subtree will have
+        :param height: int depth of the lowest level of the whole tree
+        :return: head of new subtree (parent not set) or None if no keys
+        """
+        if low >= high:
+            return None
+
+        middle = (low + high) // 2
+        node = self.node_class(key=keys[middle], tree=self)
+        # Link both ways directly, children are new nodes
+        # Recursion is only log2(high - low) + 1 deep
+        left = self.build_subtree(keys, low, middle, depth + 1, height)
+        right = self.build_subtree(keys, middle + 1, high, depth + 1, height)
+        if left is not None:
+            node.left = left
+            left.parent = node
+        if right is not None:
+            node.right = right
+            right.parent = node
+        # Sizes of halves differ by at most one, the left half is larger
+        node.size = high - low
+        node.height = node.size.bit_length()
+        self.bulk_loaded(node, depth, height)
+
+        return node
+
+    def bulk_loaded(self, node, depth, height):
+        """
+        Called by build_balanced for each node once both its subtrees are built
+        Trees that store more in each node set it here
+        :param node: node whose subtrees are complete
+        :param depth: int depth of node, the head is at depth 1
+        :param height: int depth of the lowest level of the tree
+        :return: no return value
+        """
+        pass
+
+    def __len__(self):
+        """
+        Number of nodes in tree, O(1)
+        Every node keeps the size of its subtree
+        :return: int node count
+        """
+        return self.head.size if self.head is not None else 0
+
+    def get_count_height_and_max_digs(self) -> (int, int, int):
+        """
+        Get number of nodes in tree
+        and height of tree
+        and largest number of digits in any entry in tree
+        Count and height are kept by the head, the largest key is the rightmost node, O(height)
+        @overrides method in BinaryTree
+        :return (int, int, int): (node count, height of tree, max # digits)
+        """
+        if self.is_empty():
+            return 0
+
+        node = self.head
+        while node.right is not None:
+            node = node.right
+        max_num = max(node.key, 1)
+
+        # Git maximum number of digits from largest number
+        max_digs = int(np.floor(np.log10(max_num)) + 1)
+
+        return self.head.size, self.head.height, max_digs
+
+    def validate(self):
+        """
+        Check every node, O(n)
+        Links run both ways, keys are in order,
+        and sizes and heights match the children
+        :return: True if tree is consistent
+        :raises TreePropertyException: at the first node that is not
+        """
+        if self.head is not None and self.head.parent is not None:
+            raise TreePropertyException(message="Head ({}) has a parent".format(self.head.key))
+
+        last_key = None
+        for node in self.in_order():
+            key = node.key
+            if last_key is not None and key < last_key:
+                raise TreePropertyException(message="Node ({}) is after larger key ({})".format(key, last_key))
+            last_key = key
+
+            for child in (node.left, node.right):
+                if child is not None and child.parent is not node:
+                    raise TreePropertyException(
+                        message="Child ({}) of node ({}) has another parent".format(child.key, key))
+
+            size = node.size
+            height = node.height
+            if size != 1 + BinarySearchNode.size_of(node.left) + BinarySearchNode.size_of(node.right):
+                raise TreePropertyException(message="Node ({}) has wrong size {}".format(key, size))
+            if height != 1 + max(BinarySearchNode.height_of(node.left), BinarySearchNode.height_of(node.right)):
+                raise TreePropertyException(message="Node ({}) has wrong height {}".format(key, height))
+
+        return True
 
     def insert(self, key, verbose=False):
         """
         Insert key into tree
         :param key: key of new node
         :param verbose: boolean show actions during insert
-        :return: no return value
+        :return: new node
         """
         # Assert valid input
         assert(isinstance(key, int))
 
         # Create a new node with this key
-        node = BinarySearchNode(key=key, tree=self)
+        node = self.node_class(key=key, tree=self)
 
         # If empty tree, add as Head
         if self.head is None:
@@ -43,6 +208,7 @@ class BinarySearchTree(BinaryTree):
 
             # Insert node here
             # set_left and set_right link both nodes together
+            # set_left and set_right also update sizes and heights above node
             if parent is not None:
                 if is_left_child:
                     parent.set_left(node)
@@ -54,6 +220,11 @@ class BinarySearchTree(BinaryTree):
             # Primary colors for inserted node
             self.show(primary_highlights=node)
 
+        if self.debug:
+            self.validate()
+
+        return node
+
     def insert_get_parent(self, key, verbose=False) -> (BinarySearchNode or None, bool, bool):
         """
         Find and return which node should be the parent
@@ -122,6 +293,101 @@ class BinarySearchTree(BinaryTree):
         if not node:
             return None
 
+        self.remove_node(node, verbose=verbose)
+
+        if self.debug:
+            self.validate()
+
+        return node
+
+    def remove_node(self, node, verbose=False) -> BinarySearchNode or None:
+        """
+        Remove node from the tree
+        If it has two children, its successor takes its place
+        Pointers are relinked directly and sizes and heights are updated
+        in one walk up from the lowest changed node
+        When verbose, each step is shown instead, see remove_node_in_steps
+        :param node: node in this tree
+        :param verbose: boolean show actions during delete
+        :return: lowest node whose subtree lost a node, None if node was a childless head
+        """
+        left = node.left
+        right = node.right
+        if left is None or right is None:
+            # Only child (or None) takes the place of node
+            successor = None
+            lowest_changed = node.parent
+        else:
+            # Successor is the leftmost node of the right subtree,
+            # it has no left child
+            successor = right
+            while successor.left is not None:
+                successor = successor.left
+            lowest_changed = successor if successor is right else successor.parent
+
+        if verbose:
+            self.remove_node_in_steps(node, verbose=verbose)
+            return lowest_changed
+
+        if successor is None:
+            self.transplant(node, left if left is not None else right)
+        else:
+            if successor is not right:
+                # Successor's right subtree takes the place of successor
+                problem_child = successor.right
+                lowest_changed.left = problem_child
+                if problem_child is not None:
+                    problem_child.parent = lowest_changed
+                # Right subtree of node goes under successor
+                successor.right = right
+                right.parent = successor
+
+            # Left subtree of node goes under successor
+            successor.left = left
+            left.parent = successor
+            self.transplant(node, successor)
+            # Successor takes the place of node, one node smaller
+            successor.size = node.size
+            successor.height = node.height
+
+        # Detach node from the tree
+        node.parent = None
+        node.left = None
+        node.right = None
+
+        # Every node from here up lost one node
+        if lowest_changed is not None:
+            lowest_changed.update_upwards()
+
+        return lowest_changed
+
+    def transplant(self, node, replacement):
+        """
+        Link replacement (may be None) into the place of node under its parent,
+        one direction each way, without updating sizes or heights
+        :param node: node being replaced
+        :param replacement: node or None
+        :return: no return value
+        """
+        parent = node.parent
+        if parent is None:
+            self.head = replacement
+        elif parent.left is node:
+            parent.left = replacement
+        else:
+            parent.right = replacement
+        if replacement is not None:
+            replacement.parent = parent
+
+    def remove_node_in_steps(self, node, verbose=False):
+        """
+        Remove node from the tree one subtree at a time,
+        showing each step when verbose
+        Slower than remove_node, but every step is a whole tree
+        :param node: node in this tree
+        :param verbose: boolean show actions during delete
+        :return: no return value
+        """
         # Find replacement node
         right = node.get_right()
         left = node.get_left()
@@ -176,6 +442,9 @@ class BinarySearchTree(BinaryTree):
             left = left.remove_as_subtree()
             replacement.set_left(left)
 
+            # Link replacement subtree to the parent of node
+            node.replace_with(replacement)
+
         # Clean up any loose ends
         if self.head == node:
             self.head = replacement
@@ -184,8 +453,6 @@ class BinarySearchTree(BinaryTree):
         if verbose:
             self.show(primary_highlights=replacement)
 
-        return node
-
     def search(self, key, verbose=False) -> BinarySearchNode or None:
         """
         Find first instance of a node with the given search key
@@ -225,3 +492,422 @@ class BinarySearchTree(BinaryTree):
             self.show(primary_highlights=node)
 
         return node
+
+    def range(self, low=None, high=None):
+        """
+        Generate keys from low to high, both inclusive, in order
+        Subtrees outside of [low, high] are skipped,
+        so a range of k keys costs O(log n + k) in a balanced tree
+        Do not change the tree while iterating
+        :param low: smallest key to yield, None for no lower bound
+        :param high: largest key to yield, None for no upper bound
+        :return: generator of keys
+        """
+        # Nodes whose left subtrees are being walked
+        stack = []
+        node = self.head
+        while node is not None or len(stack) > 0:
+            # Walk down to the leftmost node not yet yielded
+            while node is not None:
+                if low is not None and node.key < low:
+                    # Node and its left subtree are all below low
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            if len(stack) == 0:
+                return
+            node = stack.pop()
+            if high is not None and node.key > high:
+                # Everything after this is above high
+                return
+            yield node.key
+            node = node.right
+
+    def floor(self, key, verbose=False) -> BinarySearchNode or None:
+        """
+        Find a node with the largest key less than or equal to key
+        :param key: search key
+        :param verbose: boolean show actions during search
+        :return: node or None if every key is greater
+        """
+        floor_node = None
+        node = self.head
+        while node is not None:
+            # Show process if verbose
+            if verbose:
+                self.show(secondary_highlights=node)
+
+            this_key = node.key
+            if key == this_key:
+                floor_node = node
+                break
+            if key < this_key:
+                node = node.left
+            else:
+                # Best so far, but there may be a larger key on the right
+                floor_node = node
+                node = node.right
+
+        # Show found item if verbose
+        if floor_node is not None and verbose:
+            self.show(primary_highlights=floor_node)
+
+        return floor_node
+
+    def ceiling(self, key, verbose=False) -> BinarySearchNode or None:
+        """
+        Find a node with the smallest key greater than or equal to key
+        :param key: search key
+        :param verbose: boolean show actions during search
+        :return: node or None if every key is smaller
+        """
+        ceiling_node = None
+        node = self.head
+        while node is not None:
+            # Show process if verbose
+            if verbose:
+                self.show(secondary_highlights=node)
+
+            this_key = node.key
+            if key == this_key:
+                ceiling_node = node
+                break
+            if key > this_key:
+                node = node.right
+            else:
+                # Best so far, but there may be a smaller key on the left
+                ceiling_node = node
+                node = node.left
+
+        # Show found item if verbose
+        if ceiling_node is not None and verbose:
+            self.show(primary_highlights=ceiling_node)
+
+        return ceiling_node
+
+    def select(self, index, verbose=False) -> BinarySearchNode or None:
+        """
+        Find the node with the index-th smallest key (index 0 is the smallest)
+        Subtree sizes tell which side it is on, O(height)
+        :param index: int position in sorted order, negative counts from the end
+        :param verbose: boolean show actions during search
+        :return: node or None if index is out of range
+        """
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            return None
+
+        node = self.head
+        while node is not None:
+            # Show process if verbose
+            if verbose:
+                self.show(secondary_highlights=node)
+
+            left_size = BinarySearchNode.size_of(node.left)
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                break
+            else:
+                # Skip the left subtree and this node
+                index -= left_size + 1
+                node = node.right
+
+        # Show found item if verbose
+        if node is not None and verbose:
+            self.show(primary_highlights=node)
+
+        return node
+
+    def rank(self, key, verbose=False) -> int:
+        """
+        Count the keys less than key, O(height)
+        select(rank(key)) is the first node with a key >= key
+        :param key: search key
+        :param verbose: boolean show actions during search
+        :return: int number of keys < key
+        """
+        rank = 0
+        node = self.head
+        while node is not None:
+            # Show process if verbose
+            if verbose:
+                self.show(secondary_highlights=node)
+
+            if key <= node.key:
+                node = node.left
+            else:
+                # Left subtree and this node are all smaller
+                rank += BinarySearchNode.size_of(node.left) + 1
+                node = node.right
+
+        return rank
+
+    @staticmethod
+    def as_key_array(keys):
+        """
+        Flat integer array of keys for the batch methods
+        :param keys: iterable or np.ndarray of integers
+        :return: np.ndarray of integers
+        """
+        keys = np.asarray(keys if isinstance(keys, np.ndarray) else list(keys)).ravel()
+        # Assert valid input
+        assert(keys.size == 0 or np.issubdtype(keys.dtype, np.integer))
+        return keys
+
+    def contains_many(self, keys):
+        """
+        Find which keys are in the tree
+        The batch is sorted and split at each node, keys < node go left and keys > node go right,
+        so each node is visited once per batch instead of once per key
+        :param keys: iterable or np.ndarray of integers
+        :return: np.ndarray of booleans, True where the key is in the tree
+        """
+        keys = self.as_key_array(keys)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        found = np.zeros(unique_keys.size, dtype=bool)
+        sorted_keys = unique_keys.tolist()
+
+        # Stack of (node, low, high), sorted_keys[low:high] belong in subtree of node
+        stack = [(self.head, 0, len(sorted_keys))]
+        while len(stack) > 0:
+            node, low, high = stack.pop()
+            if node is None or low >= high:
+                continue
+            key = node.key
+            split = bisect_left(sorted_keys, key, low, high)
+            after = split
+            if split < high and sorted_keys[split] == key:
+                found[split] = True
+                after += 1
+            stack.append((node.left, low, split))
+            stack.append((node.right, after, high))
+
+        return found[inverse.ravel()]
+
+    def insert_many(self, keys, verbose=False):
+        """
+        Insert every key, sorted first
+        A plain binary search tree splits the batch down the tree as contains_many does,
+        and attaches a balanced subtree of new nodes wherever a part of it reaches an empty child
+        Trees that rebalance insert one key at a time, in sorted order,
+        unless they are empty and the batch can be built as in from_sorted
+        :param keys: iterable or np.ndarray of integers
+        :param verbose: boolean show tree after insert
+        :return: np.ndarray of booleans, True where the key was not in the tree before
+        """
+        keys = self.as_key_array(keys)
+        is_new = ~self.contains_many(keys)
+        sorted_keys = np.sort(keys, kind='stable').tolist()
+
+        if self.is_empty():
+            self.head = self.build_subtree(sorted_keys, 0, len(sorted_keys), 1, len(sorted_keys).bit_length())
+        elif self.rebalances:
+            for key in sorted_keys:
+                self.insert(key)
+        else:
+            self.insert_sorted(sorted_keys)
+
+        # Show tree if verbose
+        if verbose:
+            self.show()
+
+        if self.debug:
+            self.validate()
+
+        return is_new
+
+    def insert_sorted(self, sorted_keys):
+        """
+        Attach new nodes for sorted_keys under a non-empty tree
+        Equal keys go right, as in insert
+        Sizes and heights of the nodes visited are updated once, bottom up
+        :param sorted_keys: list of integers, sorted ascending
+        :return: no return value
+        """
+        # Nodes visited, every parent before its children
+        visited = []
+        # Stack of (node, low, high), sorted_keys[low:high] belong in subtree of node
+        stack = [(self.head, 0, len(sorted_keys))]
+        while len(stack) > 0:
+            node, low, high = stack.pop()
+            visited.append(node)
+            split = bisect_left(sorted_keys, node.key, low, high)
+
+            # Keys < node.key go left, the rest go right
+            for child, child_low, child_high, is_left in ((node.left, low, split, True),
+                                                          (node.right, split, high, False)):
+                if child_low >= child_high:
+                    continue
+                if child is not None:
+                    stack.append((child, child_low, child_high))
+                    continue
+                subtree = self.build_subtree(sorted_keys, child_low, child_high, 1, 0)
+                subtree.parent = node
+                if is_left:
+                    node.left = subtree
+                else:
+                    node.right = subtree
+
+        # Children before parents
+        for node in reversed(visited):
+            node.update_size()
+            node.update_height()
+
+    def delete_many(self, keys, verbose=False):
+        """
+        Delete one node for each key, smallest key first
+        Keys that are not in the tree are found with one contains_many walk
+        and skipped, the others are deleted one at a time
+        :param keys: iterable or np.ndarray of integers
+        :param verbose: boolean show tree after delete
+        :return: np.ndarray of booleans, True where a node was deleted
+        """
+        keys = self.as_key_array(keys)
+        deleted = self.contains_many(keys)
+        key_list = keys.tolist()
+
+        # Delete found keys in sorted order
+        # A key found once may be in the batch more often than in the tree
+        order = np.argsort(keys, kind='stable')
+        for i in order[deleted[order]].tolist():
+            deleted[i] = self.delete(key_list[i]) is not None
+
+        # Show tree if verbose
+        if verbose:
+            self.show()
+
+        return deleted
+
+    def save(self, path):
+        """
+        Write the tree to a snapshot file, flattened into arrays
+        Node i (in pre-order, the head is 0) is keys[i], linked to
+        parents[i], lefts[i] and rights[i] by index (-1 if empty),
+        the layout of CompactBinarySearchTree
+        :param path: str path of file, overwritten
+        :return: no return value
+        """
+        nodes = []
+        parents = []
+        lefts = []
+        rights = []
+        # Stack of (node, index of parent)
+        stack = [(self.head, -1)] if self.head is not None else []
+        while len(stack) > 0:
+            node, parent_index = stack.pop()
+            index = len(nodes)
+            nodes.append(node)
+            parents.append(parent_index)
+            lefts.append(-1)
+            rights.append(-1)
+            if parent_index >= 0:
+                if nodes[parent_index].left is node:
+                    lefts[parent_index] = index
+                else:
+                    rights[parent_index] = index
+            # Push right first, so left subtrees come first
+            if node.right is not None:
+                stack.append((node.right, index))
+            if node.left is not None:
+                stack.append((node.left, index))
+
+        arrays = {'keys': np.array([node.key for node in nodes], dtype=np.int64),
+                  'parents': np.array(parents, dtype=np.int32),
+                  'lefts': np.array(lefts, dtype=np.int32),
+                  'rights': np.array(rights, dtype=np.int32)}
+        arrays.update(self.snapshot_arrays(nodes))
+        meta = {'structure': 'tree',
+                'class': type(self).__name__,
+                'head': 0 if len(nodes) > 0 else -1,
+                'count': len(nodes),
+                'free_head': -1}
+        Snapshot.write(path, arrays, meta)
+
+    def snapshot_arrays(self, nodes):
+        """
+        Arrays of whatever else nodes of this tree store, for save
+        :param nodes: list [node] in the order they are saved
+        :return: dict {str name: np.ndarray}, empty for a BinarySearchTree
+        """
+        return {}
+
+    def restore_snapshot_arrays(self, nodes, arrays):
+        """
+        Set whatever else nodes of this tree store, for load
+        :param nodes: list [node or None] by index in the snapshot
+        :param arrays: dict {str name: np.ndarray} arrays of the snapshot
+        :return: no return value
+        """
+        pass
+
+    @classmethod
+    def load(cls, path):
+        """
+        Rebuild a tree of the same shape from a snapshot, O(n)
+        No keys are compared and no rebalancing is done,
+        unlike inserting every key again.
+        Snapshots of a CompactBinarySearchTree load as well
+        The shape of a snapshot of another class may break the rules of a
+        self-balancing tree, so such a tree is built balanced from the sorted keys instead
+        (see from_sorted), O(n log n)
+        :param path: str path of file written by save
+        :return: tree of this class
+        :raises SnapshotException: if the file does not hold a tree
+        """
+        arrays, meta = Snapshot.read(path, mode='r')
+        Snapshot.check(meta, 'tree', path)
+
+        keys = arrays['keys'].tolist()
+        lefts = arrays['lefts'].tolist()
+        rights = arrays['rights'].tolist()
+        # Indexes of the nodes reachable from the head, every parent before its children
+        reachable = []
+        stack = [meta['head']] if meta['head'] >= 0 else []
+        while len(stack) > 0:
+            index = stack.pop()
+            reachable.append(index)
+            for child_index in (rights[index], lefts[index]):
+                if child_index >= 0:
+                    stack.append(child_index)
+
+        if cls.rebalances and meta['class'] != cls.__name__:
+            return cls.from_sorted(np.sort(arrays['keys'][reachable], kind='stable'))
+
+        tree = cls()
+        node_class = cls.node_class
+        # Nodes by index, only those reachable from the head are created
+        nodes = [None] * len(keys)
+        # Nodes in the order they are created, every parent before its children
+        created = []
+        for index in reachable:
+            node = node_class(key=keys[index], tree=tree)
+            nodes[index] = node
+            created.append(node)
+
+        # Link both ways directly, then sizes and heights from the bottom up
+        for index, node in enumerate(nodes):
+            if node is None:
+                continue
+            left = lefts[index]
+            right = rights[index]
+            if left >= 0:
+                node.left = nodes[left]
+                nodes[left].parent = node
+            if right >= 0:
+                node.right = nodes[right]
+                nodes[right].parent = node
+        for node in reversed(created):
+            node.update_size()
+            node.update_height()
+
+        tree.head = nodes[meta['head']] if meta['head'] >= 0 else None
+        tree.restore_snapshot_arrays(nodes, arrays)
+
+        if tree.debug:
+            tree.validate()
+
+        return tree
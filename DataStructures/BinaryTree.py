@@ -11,15 +11,10 @@ class BinaryTree:
     """
     # Head of tree is a *Node or None(empty)
     head = None
-    # This is a good time-saving idea,
-    # But I think that its potential for bugs
-    # is too high to implement
-    #
-    #   Height of tree
-    #   height = 0
-    #
-    #   When height may have changed, set to true
-    #   height_unknown = False
+    # Validate the whole tree after every insert and delete, O(n)
+    # For debugging and staging, not production
+    debug = False
+    # Highlight colors for verbose
     HIGHLIGHT_FORE = colorama.Fore.MAGENTA
     HIGHLIGHT_BACK = colorama.Back.WHITE
     SECONDARY_FORE = colorama.Fore.BLACK
@@ -31,6 +26,7 @@ class BinaryTree:
         and height of tree
         and largest number of digits in any entry in tree
         by crawling tree O(n)
+        BinarySearchNode keeps height and count for its subtree instead
         :return (int, int, int): (node count, height of tree, max # digits)
         """
         if self.is_empty():
@@ -77,6 +73,35 @@ class BinaryTree:
         """
         return self.head is None
 
+    def in_order(self):
+        """
+        Generate every node from left to right (in order)
+        Uses a stack instead of recursion, so deep trees do not
+        reach the recursion limit, and nodes are yielded as they are found
+        Do not change the tree while iterating
+        :return: generator of nodes
+        """
+        # Nodes whose left subtrees are being walked
+        stack = []
+        node = self.head
+        while node is not None or len(stack) > 0:
+            # Walk down to the leftmost node not yet yielded
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            # Then everything right of it
+            node = node.right
+
+    def __iter__(self):
+        """
+        Iterate over keys in order, see in_order
+        :return: generator of keys
+        """
+        for node in self.in_order():
+            yield node.key
+
     def show(self, primary_highlights=(None,), secondary_highlights=(None,)):
         """
         Show binary tree
@@ -0,0 +1,351 @@
+import numpy as np
+from DataStructures.FastBuffer import FastBuffer
+from DataStructures.HashTable import HashTable, HashTablePropertyException
+
+
+class ChainedHashTable(HashTable):
+    """
+    Implement hash table by separate chaining (closed addressing)
+
+    Every bucket heads a linked list of the entries whose keys hash to it.
+    There are no node objects: entry i is keys[i] and values[i],
+    linked to the next entry in its bucket by nexts[i] (NONE at the end),
+    as CompactBinarySearchTree links its nodes.
+    Entries of deleted keys are linked into a free list through nexts
+    and reused by later puts.
+
+    Slots, as the methods of HashTable call them, are entries here.
+
+    For simplicity, all keys must be integers
+    """
+    # Index of an empty bucket or the end of a chain
+    NONE = -1
+    # Average keys per bucket, chains stay short
+    max_load_factor = 1.0
+
+    def __init__(self, capacity=16, value_dtype=np.int64):
+        """
+        :param capacity: int number of keys that fit before memory is allocated
+        :param value_dtype: NumPy dtype of values, object for any Python object
+        """
+        self.value_dtype = np.dtype(value_dtype)
+        # Entries, allocated separately from buckets
+        self.entry_count = int(capacity)
+        self.keys = np.zeros(self.entry_count, dtype=np.int64)
+        self.values = np.zeros(self.entry_count, dtype=self.value_dtype)
+        self.nexts = np.full(self.entry_count, self.NONE, dtype=np.int32)
+        # First free entry, later free entries are linked through nexts
+        self.free_head = self.NONE
+        # Entries from here on have never been used
+        self.next_unused = 0
+        self.update_buffers()
+        super().__init__(capacity=capacity, value_dtype=value_dtype)
+
+    def allocate(self, slots):
+        """
+        Set new, empty buckets
+        Entries are kept, relink must put them back in buckets
+        @overrides method in HashTable
+        :param slots: int power-of-two number of buckets
+        :return: no return value
+        """
+        super().allocate(slots)
+        self.heads = np.full(slots, self.NONE, dtype=np.int32)
+        self.head_buffer = FastBuffer.of(self.heads)
+
+    def update_buffers(self):
+        """
+        Set buffers of the entry arrays, whenever they are (re)allocated
+        Memoryviews where possible (see FastBuffer), else the arrays
+        :return: no return value
+        """
+        self.key_buffer = FastBuffer.of(self.keys)
+        self.next_buffer = FastBuffer.of(self.nexts)
+        self.update_value_buffer()
+
+    def reallocate(self, new_entry_count):
+        """
+        Move every entry array into a new array of new_entry_count
+        :param new_entry_count: int new size, at least the number of entries used
+        :return: no return value
+        """
+        used = self.next_unused
+        assert new_entry_count >= used
+
+        def moved(array, fill):
+            new_array = np.full(new_entry_count, fill, dtype=array.dtype)
+            new_array[:used] = array[:used]
+            return new_array
+
+        self.keys = moved(self.keys, 0)
+        self.values = moved(self.values, 0)
+        self.nexts = moved(self.nexts, self.NONE)
+        self.entry_count = new_entry_count
+        self.update_buffers()
+
+    def new_entries(self, count):
+        """
+        Take entries for new keys, from the free list first
+        :param count: int number of entries
+        :return: np.ndarray of int64 entries
+        """
+        reused = []
+        while self.free_head != self.NONE and len(reused) < count:
+            reused.append(self.free_head)
+            self.free_head = self.next_buffer[self.free_head]
+
+        unused = count - len(reused)
+        if self.next_unused + unused > self.entry_count:
+            self.reallocate(max(int(np.ceil(self.entry_count * self.growth_factor)), self.next_unused + unused))
+        entries = np.concatenate((np.array(reused, dtype=np.int64),
+                                  np.arange(self.next_unused, self.next_unused + unused, dtype=np.int64)))
+        self.next_unused += unused
+
+        return entries
+
+    def find(self, key):
+        """
+        Find the entry of key along the chain of its bucket
+        @overrides method in HashTable
+        :param key: int key
+        :return: int entry or None
+        """
+        keys = self.key_buffer
+        nexts = self.next_buffer
+
+        entry = self.head_buffer[self.hash(key)]
+        while entry != self.NONE:
+            if keys[entry] == key:
+                return entry
+            entry = nexts[entry]
+        return None
+
+    def find_many(self, keys):
+        """
+        Find the entries of many keys, walking all of their chains at once
+        Each step reads the next entry of every key still searching,
+        so the number of steps is the longest chain, not the number of keys
+        @overrides method in HashTable
+        :param keys: np.ndarray of int64 keys
+        :return: np.ndarray of int64 entries, -1 where the key is not in the table
+        """
+        found_entries = np.full(keys.size, -1, dtype=np.int64)
+        # Index in keys and current entry of every key still searching
+        searching = np.arange(keys.size)
+        entries = self.heads[self.hash_many(keys)]
+        while True:
+            go_on = entries != self.NONE
+            searching = searching[go_on]
+            entries = entries[go_on]
+            if searching.size == 0:
+                break
+            is_found = self.keys[entries] == keys[searching]
+            found_entries[searching[is_found]] = entries[is_found]
+            searching = searching[~is_found]
+            entries = self.nexts[entries[~is_found]]
+
+        return found_entries
+
+    def add(self, key):
+        """
+        Put key in a new entry at the head of the chain of its bucket
+        @overrides method in HashTable
+        :param key: int key, not in table
+        :return: int entry of key
+        """
+        self.make_room(1)
+        if self.free_head != self.NONE:
+            entry = self.free_head
+            self.free_head = self.next_buffer[entry]
+        else:
+            if self.next_unused >= self.entry_count:
+                self.reallocate(max(int(np.ceil(self.entry_count * self.growth_factor)), self.next_unused + 1))
+            entry = self.next_unused
+            self.next_unused += 1
+
+        bucket = self.hash(key)
+        self.key_buffer[entry] = key
+        self.next_buffer[entry] = self.head_buffer[bucket]
+        self.head_buffer[bucket] = entry
+        self.count += 1
+
+        return entry
+
+    def add_many(self, keys):
+        """
+        Add many distinct keys in new entries, resizing once first
+        @overrides method in HashTable
+        :param keys: np.ndarray of unique int64 keys, none in table
+        :return: np.ndarray of int64 entries, parallel to keys
+        """
+        self.make_room(keys.size)
+        entries = self.new_entries(keys.size)
+        self.keys[entries] = keys
+        self.link_many(entries)
+        self.count += keys.size
+        return entries
+
+    def link_many(self, entries):
+        """
+        Link many entries into the chains of their buckets at once
+        Entries are sorted by bucket. Each links to the one before it
+        in the same bucket, the first of a bucket to its old head,
+        and the last of a bucket becomes its new head
+        :param entries: np.ndarray of int64 entries, not in any chain
+        :return: no return value
+        """
+        if entries.size == 0:
+            return
+
+        buckets = self.hash_many(self.keys[entries])
+        order = np.argsort(buckets, kind='stable')
+        entries = entries[order]
+        buckets = buckets[order]
+
+        same_bucket = buckets[1:] == buckets[:-1]
+        self.nexts[entries[0]] = self.heads[buckets[0]]
+        self.nexts[entries[1:]] = np.where(same_bucket, entries[:-1], self.heads[buckets[1:]])
+        is_last = np.append(~same_bucket, True)
+        self.heads[buckets[is_last]] = entries[is_last]
+
+    def remove(self, entry):
+        """
+        Unlink entry from the chain of its bucket and free it
+        @overrides method in HashTable
+        :param entry: int entry of key
+        :return: no return value
+        """
+        nexts = self.next_buffer
+        bucket = self.hash(self.key_buffer[entry])
+
+        previous = self.NONE
+        current = self.head_buffer[bucket]
+        while current != entry:
+            previous = current
+            current = nexts[current]
+        if previous == self.NONE:
+            self.head_buffer[bucket] = nexts[entry]
+        else:
+            nexts[previous] = nexts[entry]
+
+        nexts[entry] = self.free_head
+        self.free_head = entry
+        self.count -= 1
+
+    def remove_many(self, entries):
+        """
+        Remove many entries at once
+        Rather than unlinking each entry, every bucket that holds one
+        is emptied and its other entries are linked in again
+        @overrides method in HashTable
+        :param entries: np.ndarray of distinct int64 entries
+        :return: no return value
+        """
+        if entries.size == 0:
+            return
+
+        buckets = np.unique(self.hash_many(self.keys[entries]))
+        kept = self.chain_entries(buckets)
+        kept = kept[~np.isin(kept, entries)]
+        self.heads[buckets] = self.NONE
+        self.link_many(kept)
+
+        # Free list runs through entries in order, then on to the old free list
+        self.nexts[entries[:-1]] = entries[1:]
+        self.nexts[entries[-1]] = self.free_head
+        self.free_head = int(entries[0])
+        self.count -= entries.size
+
+    def chain_entries(self, buckets):
+        """
+        Every entry in the chains of the given buckets,
+        walking all of the chains at once
+        :param buckets: np.ndarray of int64 buckets
+        :return: np.ndarray of int64 entries
+        """
+        chains = []
+        entries = self.heads[buckets].astype(np.int64)
+        entries = entries[entries != self.NONE]
+        while entries.size > 0:
+            chains.append(entries)
+            entries = self.nexts[entries].astype(np.int64)
+            entries = entries[entries != self.NONE]
+
+        return np.concatenate(chains) if len(chains) > 0 else np.zeros(0, dtype=np.int64)
+
+    def make_room(self, extra):
+        """
+        Relink every entry into more buckets
+        if extra more keys would make more than max_load_factor keys per bucket
+        Entries do not move, only the buckets are new
+        @overrides method in HashTable
+        :param extra: int number of keys about to be added
+        :return: no return value
+        """
+        size = self.count + extra
+        if size > self.slots * self.max_load_factor:
+            entries = self.get_slots()
+            self.allocate(self.slots_for(size * self.growth_factor))
+            self.link_many(entries)
+
+    def get_slots(self):
+        """
+        Entries of every key
+        @overrides method in HashTable
+        :return: np.ndarray of int64 entries
+        """
+        return self.chain_entries(np.arange(self.slots))
+
+    def validate(self):
+        """
+        Check every chain, O(n)
+        Every entry is in the chain of its own bucket, once,
+        and no key is in the table twice
+        @overrides method in HashTable
+        :return: True if table is consistent
+        :raises HashTablePropertyException: at the first entry that is not
+        """
+        for bucket in range(self.slots):
+            entry = self.head_buffer[bucket]
+            steps = 0
+            while entry != self.NONE:
+                if self.hash(self.key_buffer[entry]) != bucket:
+                    raise HashTablePropertyException(
+                        message="Key {} is in bucket {}, not {}".format(
+                            self.key_buffer[entry], bucket, self.hash(self.key_buffer[entry])))
+                steps += 1
+                if steps > self.count:
+                    raise HashTablePropertyException(message="Bucket {} has a cycle".format(bucket))
+                entry = self.next_buffer[entry]
+
+        entries = self.get_slots()
+        if entries.size != self.count:
+            raise HashTablePropertyException(
+                message="Table has {} entries in buckets, but count {}".format(entries.size, self.count))
+        if np.unique(self.keys[entries]).size != entries.size:
+            raise HashTablePropertyException(message="Table has a key more than once")
+
+        return True
+
+    def show(self):
+        """
+        Show table, one bucket per line
+        Each bucket lists its chain from head to end
+        :return: no return value
+        """
+        if self.count == 0:
+            print ('*****************')
+            print ('No keys in table')
+            print ('*****************')
+            return
+
+        bucket_width = len(str(self.slots - 1))
+        print ('**** {} keys in {} buckets ****'.format(self.count, self.slots))
+        for bucket in range(self.slots):
+            chain = []
+            entry = self.head_buffer[bucket]
+            while entry != self.NONE:
+                chain.append('{}: {}'.format(self.key_buffer[entry], self.value_buffer[entry]))
+                entry = self.next_buffer[entry]
+            print ('{} | {}'.format(str(bucket).rjust(bucket_width), ' -> '.join(chain)))
+        print ('*' * 30)
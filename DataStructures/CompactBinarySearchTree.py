@@ -0,0 +1,357 @@
+import numpy as np
+from DataStructures.BinarySearchNode import BinarySearchNode
+from DataStructures.BinarySearchTree import BinarySearchTree
+from DataStructures.FastBuffer import FastBuffer
+from DataStructures.Snapshot import Snapshot
+
+
+class CompactBinarySearchTree:
+    """
+    Implement binary search tree as parallel NumPy arrays (struct-of-arrays)
+
+    Node i is keys[i], with links parents[i], lefts[i] and rights[i]
+    to other nodes by index (NONE if empty). There are no node objects,
+    so each node takes 20 bytes instead of a Python object of its own.
+    Slots of deleted nodes are linked into a free list through lefts
+    and reused by later inserts.
+
+    Same interface as BinarySearchTree (insert, search, delete, show),
+    except that nodes are indexes rather than BinarySearchNode objects.
+
+    For simplicity, all input must be integers
+    """
+    # Index of an empty subtree
+    NONE = -1
+    # When full, allocate growth_factor times the current space
+    growth_factor = 2
+
+    def __init__(self, tree_size=10):
+        """
+        :param tree_size: int number of nodes that fit before more memory is allocated
+        """
+        self.tree_size = int(tree_size)
+        self.keys = np.zeros(self.tree_size, dtype=np.int64)
+        self.parents = np.full(self.tree_size, self.NONE, dtype=np.int32)
+        self.lefts = np.full(self.tree_size, self.NONE, dtype=np.int32)
+        self.rights = np.full(self.tree_size, self.NONE, dtype=np.int32)
+        # Index of head of tree, NONE(empty)
+        self.head = self.NONE
+        # Number of nodes in tree
+        self.count = 0
+        # First free slot, later free slots are linked through lefts
+        self.free_head = self.NONE
+        # Slots from here on have never been used
+        self.next_unused = 0
+        self.update_buffers()
+
+    def update_buffers(self):
+        """
+        Set buffers of the arrays, whenever they are (re)allocated
+        Memoryviews where possible (see FastBuffer), else the arrays
+        :return: no return value
+        """
+        self.key_buffer = FastBuffer.of(self.keys)
+        self.parent_buffer = FastBuffer.of(self.parents)
+        self.left_buffer = FastBuffer.of(self.lefts)
+        self.right_buffer = FastBuffer.of(self.rights)
+
+    def reallocate(self, new_tree_size):
+        """
+        Move every array into a new array of new_tree_size
+        :param new_tree_size: int new size, at least the number of slots used
+        :return: no return value
+        """
+        used = self.next_unused
+        assert new_tree_size >= used
+
+        def moved(array, fill):
+            new_array = np.full(new_tree_size, fill, dtype=array.dtype)
+            new_array[:used] = array[:used]
+            return new_array
+
+        self.keys = moved(self.keys, 0)
+        self.parents = moved(self.parents, self.NONE)
+        self.lefts = moved(self.lefts, self.NONE)
+        self.rights = moved(self.rights, self.NONE)
+        self.tree_size = new_tree_size
+        self.update_buffers()
+
+    def reserve(self, new_tree_size):
+        """
+        Pre-size the tree so that new_tree_size nodes fit
+        without any further allocation
+        :param new_tree_size: int number of nodes to fit
+        :return: no return value
+        """
+        if new_tree_size > self.tree_size:
+            self.reallocate(new_tree_size)
+
+    def new_node(self, key):
+        """
+        Take a slot for a new node, from the free list if possible
+        :param key: key of new node
+        :return: int index of new node
+        """
+        if self.free_head != self.NONE:
+            node = self.free_head
+            self.free_head = self.left_buffer[node]
+        else:
+            if self.next_unused >= self.tree_size:
+                self.reallocate(max(int(np.ceil(self.tree_size * self.growth_factor)), self.next_unused + 1))
+            node = self.next_unused
+            self.next_unused += 1
+
+        self.key_buffer[node] = key
+        self.parent_buffer[node] = self.NONE
+        self.left_buffer[node] = self.NONE
+        self.right_buffer[node] = self.NONE
+        self.count += 1
+
+        return node
+
+    def free_node(self, node):
+        """
+        Return a slot to the free list
+        :param node: int index of deleted node
+        :return: no return value
+        """
+        self.parent_buffer[node] = self.NONE
+        self.right_buffer[node] = self.NONE
+        self.left_buffer[node] = self.free_head
+        self.free_head = node
+        self.count -= 1
+
+    def is_empty(self):
+        """
+        :return: True if (tree is empty) else False
+        """
+        return self.head == self.NONE
+
+    def get_key(self, node):
+        """
+        :param node: int index of node
+        :return: int key of node
+        """
+        return self.key_buffer[node]
+
+    def insert(self, key, verbose=False):
+        """
+        Insert key into tree
+        Equal keys go to the right, as in BinarySearchTree
+        :param key: key of new node
+        :param verbose: boolean show tree after insert
+        :return: int index of new node
+        """
+        # Assert valid input
+        assert(isinstance(key, (int, np.integer)))
+
+        # Take the slot first, it may reallocate the buffers
+        node = self.new_node(key)
+        keys = self.key_buffer
+        lefts = self.left_buffer
+        rights = self.right_buffer
+
+        # Find new parent node in tree by binary search
+        parent = self.NONE
+        child = self.head
+        while child != self.NONE:
+            parent = child
+            child = lefts[child] if key < keys[child] else rights[child]
+
+        # Insert node here
+        self.parent_buffer[node] = parent
+        if parent == self.NONE:
+            self.head = node
+        elif key < keys[parent]:
+            lefts[parent] = node
+        else:
+            rights[parent] = node
+
+        if verbose:
+            self.show()
+
+        return node
+
+    def search(self, key, verbose=False):
+        """
+        Find first instance of a node with the given search key
+        :param key: search key
+        :param verbose: boolean show tree after search
+        :return: int index of node or None
+        """
+        keys = self.key_buffer
+        lefts = self.left_buffer
+        rights = self.right_buffer
+
+        node = self.head
+        while node != self.NONE:
+            this_key = keys[node]
+            if key == this_key:
+                break
+            node = lefts[node] if key < this_key else rights[node]
+
+        if verbose:
+            self.show()
+
+        return node if node != self.NONE else None
+
+    def successor(self, node):
+        """
+        Get the node with the smallest key in the right subtree of node
+        :param node: int index of node
+        :return: int index of successor or None
+        """
+        lefts = self.left_buffer
+        successor = self.right_buffer[node]
+        if successor == self.NONE:
+            return None
+        while lefts[successor] != self.NONE:
+            successor = lefts[successor]
+        return successor
+
+    def replace_with(self, node, replacement):
+        """
+        Link replacement (may be NONE) into the place of node under its parent
+        :param node: int index of node being replaced
+        :param replacement: int index of replacement or NONE
+        :return: no return value
+        """
+        parent = self.parent_buffer[node]
+        if parent == self.NONE:
+            self.head = replacement
+        elif self.left_buffer[parent] == node:
+            self.left_buffer[parent] = replacement
+        else:
+            self.right_buffer[parent] = replacement
+        if replacement != self.NONE:
+            self.parent_buffer[replacement] = parent
+
+    def delete(self, key, verbose=False):
+        """
+        Delete a node in the tree by the passed key value.
+        Do not raise exception on not found.
+        :param key: key of node to delete
+        :param verbose: boolean show tree after delete
+        :return: int key of deleted node, or None if not found
+        """
+        node = self.search(key)
+        if node is None:
+            return None
+
+        lefts = self.left_buffer
+        rights = self.right_buffer
+        parents = self.parent_buffer
+        left = lefts[node]
+        right = rights[node]
+        if left == self.NONE:
+            self.replace_with(node, right)
+        elif right == self.NONE:
+            self.replace_with(node, left)
+        else:
+            # Successor has no left child, it takes the place of node
+            successor = self.successor(node)
+            if successor != right:
+                # Successor's right subtree takes its place
+                self.replace_with(successor, rights[successor])
+                rights[successor] = right
+                parents[right] = successor
+            self.replace_with(node, successor)
+            lefts[successor] = left
+            parents[left] = successor
+
+        deleted_key = self.key_buffer[node]
+        self.free_node(node)
+
+        if verbose:
+            self.show()
+
+        return deleted_key
+
+    def get_memory_bytes(self):
+        """
+        :return: int bytes allocated for the arrays of the tree
+        """
+        return self.keys.nbytes + self.parents.nbytes + self.lefts.nbytes + self.rights.nbytes
+
+    def save(self, path):
+        """
+        Write the arrays of the tree to a snapshot file, as they are in memory
+        Only slots that were ever used are written
+        :param path: str path of file, overwritten
+        :return: no return value
+        """
+        used = self.next_unused
+        arrays = {'keys': self.keys[:used],
+                  'parents': self.parents[:used],
+                  'lefts': self.lefts[:used],
+                  'rights': self.rights[:used]}
+        meta = {'structure': 'tree',
+                'class': type(self).__name__,
+                'head': self.head,
+                'count': self.count,
+                'free_head': self.free_head}
+        Snapshot.write(path, arrays, meta)
+
+    @classmethod
+    def load(cls, path, mode='c'):
+        """
+        Map a tree snapshot into a new tree, O(1)
+        Nodes are paged in from the file as they are visited.
+        The first node added beyond the snapshot copies the arrays into memory
+        Snapshots of a BinarySearchTree (or any tree extending it) load as well
+        :param path: str path of file written by save
+        :param mode: np.memmap mode, 'c' (default) keeps changes in memory,
+                     'r' maps read-only. Changes are never written back to the file,
+                     save again to keep them
+        :return: CompactBinarySearchTree
+        :raises SnapshotException: if the file does not hold a tree, or mode is not 'c' or 'r'
+        """
+        arrays, meta = Snapshot.read(path, mode=mode)
+        Snapshot.check(meta, 'tree', path)
+
+        tree = cls(tree_size=0)
+        tree.keys = arrays['keys']
+        tree.parents = arrays['parents']
+        tree.lefts = arrays['lefts']
+        tree.rights = arrays['rights']
+        tree.tree_size = tree.next_unused = len(tree.keys)
+        tree.head = meta['head']
+        tree.count = meta['count']
+        tree.free_head = meta['free_head']
+        tree.update_buffers()
+
+        return tree
+
+    def to_binary_search_tree(self):
+        """
+        Copy into a BinarySearchTree of the same shape, O(n)
+        :return: BinarySearchTree
+        """
+        tree = BinarySearchTree()
+        if self.is_empty():
+            return tree
+
+        tree.head = BinarySearchNode(key=self.get_key(self.head), tree=tree)
+        # Stack holds (index, node) pairs whose children are not yet copied
+        stack = [(self.head, tree.head)]
+        while len(stack) > 0:
+            index, node = stack.pop()
+            left = self.left_buffer[index]
+            right = self.right_buffer[index]
+            if left != self.NONE:
+                left_node = BinarySearchNode(key=self.get_key(left), tree=tree)
+                node.set_left(left_node)
+                stack.append((left, left_node))
+            if right != self.NONE:
+                right_node = BinarySearchNode(key=self.get_key(right), tree=tree)
+                node.set_right(right_node)
+                stack.append((right, right_node))
+
+        return tree
+
+    def show(self):
+        """
+        Show tree in the same layout as BinaryTree.show
+        :return: no return value
+        """
+        self.to_binary_search_tree().show()
@@ -0,0 +1,481 @@
+import numpy as np
+from DataStructures.FastBuffer import FastBuffer
+from DataStructures.LinkedList import LinkedListPropertyException
+
+
+class CompactLinkedList:
+    """
+    Implement doubly linked list as parallel NumPy arrays (struct-of-arrays)
+
+    Node i is keys[i], with links prevs[i] and nexts[i]
+    to other nodes by index (NONE at either end). There are no node objects,
+    so each node takes 16 bytes, and moving or removing nodes creates no garbage.
+    Slots of removed nodes are linked into a free list through nexts
+    and reused by later pushes, as in CompactBinarySearchTree.
+
+    Same interface as LinkedList, except that nodes are indexes
+    rather than LinkedNode objects. Moving nodes within the list is O(1).
+    Joining in another list (concat, splice) copies its arrays in one NumPy operation each,
+    rather than relinking in O(1), since its nodes live in other arrays.
+
+    For simplicity, all keys must be integers
+    """
+    # Index of no node
+    NONE = -1
+    # prevs of a slot in the free list
+    FREE = -2
+    # When full, allocate growth_factor times the current space
+    growth_factor = 2
+
+    def __init__(self, list_size=16):
+        """
+        :param list_size: int number of nodes that fit before more memory is allocated
+        """
+        self.list_size = int(list_size)
+        self.keys = np.zeros(self.list_size, dtype=np.int64)
+        self.prevs = np.full(self.list_size, self.NONE, dtype=np.int32)
+        self.nexts = np.full(self.list_size, self.NONE, dtype=np.int32)
+        # Indexes of first and last nodes, NONE(empty)
+        self.head = self.NONE
+        self.tail = self.NONE
+        # Number of nodes in list
+        self.count = 0
+        # First free slot, later free slots are linked through nexts
+        self.free_head = self.NONE
+        # Slots from here on have never been used
+        self.next_unused = 0
+        self.update_buffers()
+
+    def __len__(self):
+        """
+        :return: int number of nodes in list
+        """
+        return self.count
+
+    def __iter__(self):
+        """
+        Iterate over keys from head to tail
+        :return: generator of int keys
+        """
+        keys = self.key_buffer
+        nexts = self.next_buffer
+        node = self.head
+        while node != self.NONE:
+            yield keys[node]
+            node = nexts[node]
+
+    @classmethod
+    def from_array(cls, keys):
+        """
+        Build a list of keys in order
+        :param keys: iterable or np.ndarray of integers
+        :return: list of this class
+        """
+        keys = np.asarray(keys if isinstance(keys, np.ndarray) else list(keys), dtype=np.int64).ravel()
+        linked_list = cls(list_size=max(keys.size, 1))
+        linked_list.extend(keys)
+        return linked_list
+
+    def update_buffers(self):
+        """
+        Set buffers of the arrays, whenever they are (re)allocated
+        Memoryviews where possible (see FastBuffer), else the arrays
+        :return: no return value
+        """
+        self.key_buffer = FastBuffer.of(self.keys)
+        self.prev_buffer = FastBuffer.of(self.prevs)
+        self.next_buffer = FastBuffer.of(self.nexts)
+
+    def reallocate(self, new_list_size):
+        """
+        Move every array into a new array of new_list_size
+        :param new_list_size: int new size, at least the number of slots used
+        :return: no return value
+        """
+        used = self.next_unused
+        assert new_list_size >= used
+
+        def moved(array, fill):
+            new_array = np.full(new_list_size, fill, dtype=array.dtype)
+            new_array[:used] = array[:used]
+            return new_array
+
+        self.keys = moved(self.keys, 0)
+        self.prevs = moved(self.prevs, self.NONE)
+        self.nexts = moved(self.nexts, self.NONE)
+        self.list_size = new_list_size
+        self.update_buffers()
+
+    def reserve(self, new_list_size):
+        """
+        Pre-size the list so that new_list_size nodes fit
+        without any further allocation
+        :param new_list_size: int number of nodes to fit
+        :return: no return value
+        """
+        if new_list_size > self.list_size:
+            self.reallocate(new_list_size)
+
+    def take_unused(self, count):
+        """
+        Take never-used slots, allocating more memory if needed
+        :param count: int number of slots
+        :return: int first slot taken, the others follow it
+        """
+        if self.next_unused + count > self.list_size:
+            self.reallocate(max(int(np.ceil(self.list_size * self.growth_factor)), self.next_unused + count))
+        first = self.next_unused
+        self.next_unused += count
+        return first
+
+    def new_node(self, key):
+        """
+        Take a slot for a new node, from the free list if possible
+        :param key: key of new node
+        :return: int index of new node, not linked
+        """
+        if self.free_head != self.NONE:
+            node = self.free_head
+            self.free_head = self.next_buffer[node]
+        else:
+            node = self.take_unused(1)
+
+        self.key_buffer[node] = key
+        return node
+
+    def free_node(self, node):
+        """
+        Return a slot to the free list
+        :param node: int index of removed node
+        :return: no return value
+        """
+        self.prev_buffer[node] = self.FREE
+        self.next_buffer[node] = self.free_head
+        self.free_head = node
+
+    def is_empty(self):
+        """
+        :return: True if (list is empty) else False
+        """
+        return self.head == self.NONE
+
+    def get_key(self, node):
+        """
+        :param node: int index of node
+        :return: int key of node
+        """
+        return self.key_buffer[node]
+
+    def get_next(self, node):
+        """
+        :param node: int index of node
+        :return: int index of node after it, or None
+        """
+        node = self.next_buffer[node]
+        return node if node != self.NONE else None
+
+    def get_prev(self, node):
+        """
+        :param node: int index of node
+        :return: int index of node before it, or None
+        """
+        node = self.prev_buffer[node]
+        return node if node != self.NONE else None
+
+    def link_after(self, first, last, after):
+        """
+        Link a chain of nodes first...last into the list after a node
+        :param first: int first node of chain
+        :param last: int last node of chain, reachable from first by nexts
+        :param after: int node in list, or NONE to link at the head
+        :return: no return value
+        """
+        prevs = self.prev_buffer
+        nexts = self.next_buffer
+        before = self.head if after == self.NONE else nexts[after]
+        prevs[first] = after
+        nexts[last] = before
+        if after == self.NONE:
+            self.head = first
+        else:
+            nexts[after] = first
+        if before == self.NONE:
+            self.tail = last
+        else:
+            prevs[before] = last
+
+    def unlink(self, first, last):
+        """
+        Unlink a chain of nodes first...last from the list
+        The chain keeps its inner links
+        :param first: int first node of chain
+        :param last: int last node of chain, reachable from first by nexts
+        :return: no return value
+        """
+        prevs = self.prev_buffer
+        nexts = self.next_buffer
+        before = prevs[first]
+        after = nexts[last]
+        if before == self.NONE:
+            self.head = after
+        else:
+            nexts[before] = after
+        if after == self.NONE:
+            self.tail = before
+        else:
+            prevs[after] = before
+        prevs[first] = self.NONE
+        nexts[last] = self.NONE
+
+    def push_front(self, key):
+        """
+        Add key before the head
+        :param key: key of new node
+        :return: int index of new node
+        """
+        return self.insert_after(self.NONE, key)
+
+    def push_back(self, key):
+        """
+        Add key after the tail
+        :param key: key of new node
+        :return: int index of new node
+        """
+        return self.insert_after(self.tail, key)
+
+    def insert_after(self, node, key):
+        """
+        Add key after node
+        :param node: int index of node in list, or NONE (None) to add at the head
+        :param key: key of new node
+        :return: int index of new node
+        """
+        # Assert valid input
+        assert(isinstance(key, (int, np.integer)))
+
+        new_node = self.new_node(key)
+        self.link_after(new_node, new_node, self.NONE if node is None else node)
+        self.count += 1
+        return new_node
+
+    def insert_before(self, node, key):
+        """
+        Add key before node
+        :param node: int index of node in list, or NONE (None) to add at the tail
+        :param key: key of new node
+        :return: int index of new node
+        """
+        after = self.tail if node is None or node == self.NONE else self.prev_buffer[node]
+        return self.insert_after(after, key)
+
+    def extend(self, keys):
+        """
+        Add keys after the tail, in order
+        New nodes take never-used slots side by side,
+        and are linked to each other in one NumPy operation
+        :param keys: iterable or np.ndarray of integers
+        :return: np.ndarray of int indexes of new nodes
+        """
+        keys = np.asarray(keys if isinstance(keys, np.ndarray) else list(keys)).ravel()
+        # Assert valid input
+        assert(keys.size == 0 or np.issubdtype(keys.dtype, np.integer))
+        if keys.size == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        first = self.take_unused(keys.size)
+        nodes = np.arange(first, first + keys.size)
+        self.keys[nodes] = keys
+        self.nexts[nodes[:-1]] = nodes[1:]
+        self.prevs[nodes[1:]] = nodes[:-1]
+        self.link_after(first, first + keys.size - 1, self.tail)
+        self.count += keys.size
+
+        return nodes
+
+    def remove(self, node):
+        """
+        Remove node from the list, O(1)
+        :param node: int index of node in list
+        :return: int key of node
+        """
+        key = self.key_buffer[node]
+        self.unlink(node, node)
+        self.count -= 1
+        self.free_node(node)
+        return key
+
+    def pop_front(self):
+        """
+        Remove the head
+        :return: int key of head, or None if empty
+        """
+        return None if self.head == self.NONE else self.remove(self.head)
+
+    def pop_back(self):
+        """
+        Remove the tail
+        :return: int key of tail, or None if empty
+        """
+        return None if self.tail == self.NONE else self.remove(self.tail)
+
+    def search(self, key):
+        """
+        Find the first node with key, O(n)
+        :param key: search key
+        :return: int index of node or None
+        """
+        keys = self.key_buffer
+        nexts = self.next_buffer
+        node = self.head
+        while node != self.NONE and keys[node] != key:
+            node = nexts[node]
+        return node if node != self.NONE else None
+
+    def move_range(self, first, last, after):
+        """
+        Move the nodes first...last to after a node, O(1)
+        :param first: int first node to move
+        :param last: int last node to move, at or after first
+        :param after: int node in list but not in first...last,
+                      or NONE (None) to move to the head
+        :return: no return value
+        """
+        after = self.NONE if after is None else after
+        if self.prev_buffer[first] == after:
+            # Already there
+            return
+        self.unlink(first, last)
+        self.link_after(first, last, after)
+
+    def move_to_front(self, node):
+        """
+        Move node to the head, O(1)
+        :param node: int index of node in list
+        :return: no return value
+        """
+        if node != self.head:
+            self.unlink(node, node)
+            self.link_after(node, node, self.NONE)
+
+    def move_to_back(self, node):
+        """
+        Move node to the tail, O(1)
+        :param node: int index of node in list
+        :return: no return value
+        """
+        if node != self.tail:
+            self.unlink(node, node)
+            self.link_after(node, node, self.tail)
+
+    def splice(self, after, other):
+        """
+        Move every node of another list into this one after a node
+        The arrays of other are copied after the slots of this list, links shifted,
+        so node i of other becomes node i + offset of this list.
+        Its free slots join the free list, and other is left empty
+        :param after: int node in this list, or NONE (None) to splice at the head
+        :param other: CompactLinkedList, not this one
+        :return: int offset added to the indexes of the nodes of other
+        """
+        assert other is not self
+        used = other.next_unused
+        offset = self.take_unused(used)
+        if used == 0:
+            return offset
+
+        shift = np.int32(offset)
+        prevs = other.prevs[:used]
+        nexts = other.nexts[:used]
+        self.keys[offset:offset + used] = other.keys[:used]
+        self.prevs[offset:offset + used] = np.where(prevs >= 0, prevs + shift, prevs)
+        self.nexts[offset:offset + used] = np.where(nexts >= 0, nexts + shift, nexts)
+
+        # Free list runs through the free slots of other in order, then on to the old free list
+        free = np.flatnonzero(prevs == self.FREE) + offset
+        if free.size > 0:
+            self.nexts[free[:-1]] = free[1:]
+            self.nexts[free[-1]] = self.free_head
+            self.free_head = int(free[0])
+
+        if other.head != self.NONE:
+            self.link_after(other.head + offset, other.tail + offset, self.NONE if after is None else after)
+            self.count += other.count
+
+        other.head = self.NONE
+        other.tail = self.NONE
+        other.count = 0
+        other.free_head = self.NONE
+        other.next_unused = 0
+
+        return offset
+
+    def concat(self, other):
+        """
+        Move every node of another list to after the tail (see splice)
+        :param other: CompactLinkedList, not this one
+        :return: int offset added to the indexes of the nodes of other
+        """
+        return self.splice(self.tail, other)
+
+    def get_keys(self):
+        """
+        :return: np.ndarray of keys from head to tail
+        """
+        return np.fromiter(iter(self), dtype=np.int64, count=self.count)
+
+    def validate(self):
+        """
+        Check every link, O(n)
+        Every node links back to the node before it,
+        head and tail are the ends, count is the number of nodes,
+        and every other used slot is in the free list
+        :return: True if list is consistent
+        :raises LinkedListPropertyException: at the first node that is not
+        """
+        prevs = self.prev_buffer
+        nexts = self.next_buffer
+        count = 0
+        previous = self.NONE
+        node = self.head
+        while node != self.NONE:
+            if prevs[node] != previous:
+                raise LinkedListPropertyException(
+                    message="Node {} does not link back to the node before it".format(node))
+            count += 1
+            if count > self.count:
+                raise LinkedListPropertyException(message="List has more than count {} nodes".format(self.count))
+            previous = node
+            node = nexts[node]
+
+        if previous != self.tail:
+            raise LinkedListPropertyException(message="Last node is not the tail")
+        if count != self.count:
+            raise LinkedListPropertyException(message="List has {} nodes, but count {}".format(count, self.count))
+
+        free_count = 0
+        node = self.free_head
+        while node != self.NONE:
+            if prevs[node] != self.FREE:
+                raise LinkedListPropertyException(message="Slot {} is in the free list, but not free".format(node))
+            free_count += 1
+            if free_count > self.next_unused:
+                raise LinkedListPropertyException(message="Free list has a cycle")
+            node = nexts[node]
+        if count + free_count != self.next_unused:
+            raise LinkedListPropertyException(
+                message="{} nodes and {} free slots, but {} slots used".format(count, free_count, self.next_unused))
+
+        return True
+
+    def show(self):
+        """
+        Show keys from head to tail
+        :return: no return value
+        """
+        if self.head == self.NONE:
+            print ('****************')
+            print ('No nodes in list')
+            print ('****************')
+            return
+
+        print ('Head | ' + ' <-> '.join(str(key) for key in self) + ' | Tail')
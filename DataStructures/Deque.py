@@ -0,0 +1,356 @@
+import numpy as np
+from DataStructures.FastBuffer import FastBuffer
+
+
+class Deque:
+    """
+    Implement double-ended queue as a NumPy ring buffer
+
+    Items are of any NumPy dtype (int64 by default),
+    or any Python object with dtype=object.
+    Items sit in one array of power-of-two capacity, from head onwards,
+    wrapping around from the end of the array to its start.
+    Positions wrap with & mask instead of %, and either end
+    grows or shrinks by moving head or count, never the items.
+
+    The batch methods (push_many_*, pop_many_*) copy whole slices,
+    at most two per batch where it wraps around,
+    instead of one item at a time.
+
+    Bounded (max_size) deques never grow past max_size items.
+    Pushing to a full deque pushes nothing, and push_many_* push only
+    the items that fit and return how many that was,
+    so that producers can wait for consumers (back-pressure).
+
+    Stack and Queue use one end each
+    """
+    # Returned when popping from an empty deque
+    default_value = None
+
+    def __init__(self, capacity=16, dtype=np.int64, max_size=None):
+        """
+        :param capacity: int number of items that fit before more memory is allocated,
+                         rounded up to a power of two
+        :param dtype: NumPy dtype of items, object for any Python object
+        :param max_size: int most items ever held, or None for no limit
+        """
+        assert max_size is None or max_size >= 1
+        self.max_size = max_size
+        if max_size is not None:
+            capacity = min(capacity, max_size)
+        # Index of first item
+        self.head = 0
+        # Number of items
+        self.count = 0
+        self.allocate(self.capacity_for(capacity), np.dtype(dtype))
+
+    def __len__(self):
+        """
+        :return: int number of items
+        """
+        return self.count
+
+    def __iter__(self):
+        """
+        Iterate over items from front to back
+        :return: generator of items
+        """
+        return iter(self.get_items().tolist())
+
+    @staticmethod
+    def capacity_for(size):
+        """
+        :param size: int number of items
+        :return: int smallest power of two that fits size items, at least 1
+        """
+        return 1 << max(int(size) - 1, 0).bit_length()
+
+    def allocate(self, capacity, dtype):
+        """
+        Set a new, empty array of the given capacity
+        :param capacity: int power-of-two number of items
+        :param dtype: NumPy dtype of items
+        :return: no return value
+        """
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.items = np.zeros(capacity, dtype=dtype)
+        # A memoryview where possible (see FastBuffer), else the array
+        self.buffer = FastBuffer.of(self.items)
+        # Object slots hold references, dropped as soon as they are vacated
+        self.holds_objects = self.items.dtype.kind == 'O'
+
+    def reallocate(self, capacity):
+        """
+        Move the items into a new array of the given capacity,
+        unwrapped so that head is 0
+        :param capacity: int power-of-two number of items, at least count
+        :return: no return value
+        """
+        assert capacity >= self.count
+        items = self.get_items()
+        self.allocate(capacity, self.items.dtype)
+        self.items[:self.count] = items
+        self.head = 0
+
+    def reserve(self, size):
+        """
+        Pre-size the deque so that size items fit
+        without any further allocation
+        :param size: int number of items to fit
+        :return: no return value
+        """
+        if size > self.capacity:
+            self.reallocate(self.capacity_for(size))
+
+    def is_empty(self):
+        """
+        :return: True if (deque has no items) else False
+        """
+        return self.count == 0
+
+    def is_full(self):
+        """
+        :return: True if (deque is bounded and holds max_size items) else False
+        """
+        return self.max_size is not None and self.count >= self.max_size
+
+    def get_free_space(self):
+        """
+        :return: int number of items that may be pushed, None if unbounded
+        """
+        return None if self.max_size is None else self.max_size - self.count
+
+    def room_for(self, size):
+        """
+        Make room for size more items, growing if needed
+        Bounded deques only make room up to max_size
+        :param size: int number of items about to be pushed
+        :return: int number of those items that fit
+        """
+        if self.max_size is not None:
+            size = min(size, self.max_size - self.count)
+        if self.count + size > self.capacity:
+            # Capacity doubles at least, so growing is amortized O(1) per item
+            self.reallocate(self.capacity_for(max(self.count + size, 2 * self.capacity)))
+        return size
+
+    def push_back(self, item):
+        """
+        Add item after the last item
+        :param item: new item
+        :return: True if (item was pushed) else False, when full
+        """
+        # One test in the common case, there is room and no bound
+        if self.count >= self.capacity or self.max_size is not None:
+            if self.is_full():
+                return False
+            if self.count >= self.capacity:
+                self.room_for(1)
+        self.buffer[(self.head + self.count) & self.mask] = item
+        self.count += 1
+        return True
+
+    def push_front(self, item):
+        """
+        Add item before the first item
+        :param item: new item
+        :return: True if (item was pushed) else False, when full
+        """
+        # One test in the common case, there is room and no bound
+        if self.count >= self.capacity or self.max_size is not None:
+            if self.is_full():
+                return False
+            if self.count >= self.capacity:
+                self.room_for(1)
+        self.head = (self.head - 1) & self.mask
+        self.buffer[self.head] = item
+        self.count += 1
+        return True
+
+    def pop_back(self):
+        """
+        Remove the last item
+        :return: last item, or default_value if empty
+        """
+        if self.count == 0:
+            return self.default_value
+        self.count -= 1
+        position = (self.head + self.count) & self.mask
+        item = self.buffer[position]
+        if self.holds_objects:
+            self.buffer[position] = None
+        return item
+
+    def pop_front(self):
+        """
+        Remove the first item
+        :return: first item, or default_value if empty
+        """
+        if self.count == 0:
+            return self.default_value
+        item = self.buffer[self.head]
+        if self.holds_objects:
+            self.buffer[self.head] = None
+        self.head = (self.head + 1) & self.mask
+        self.count -= 1
+        return item
+
+    def peek_back(self):
+        """
+        :return: last item, or default_value if empty
+        """
+        if self.count == 0:
+            return self.default_value
+        return self.buffer[(self.head + self.count - 1) & self.mask]
+
+    def peek_front(self):
+        """
+        :return: first item, or default_value if empty
+        """
+        if self.count == 0:
+            return self.default_value
+        return self.buffer[self.head]
+
+    def write_at(self, start, items):
+        """
+        Copy items into the ring from position start on,
+        wrapping around to the start of the array
+        :param start: int position in [0, capacity)
+        :param items: np.ndarray of items, no more than capacity
+        :return: no return value
+        """
+        size = len(items)
+        first = min(size, self.capacity - start)
+        self.items[start:start + first] = items[:first]
+        self.items[:size - first] = items[first:]
+
+    def read_at(self, start, size):
+        """
+        Copy size items out of the ring from position start on,
+        wrapping around to the start of the array
+        :param start: int position in [0, capacity)
+        :param size: int number of items, no more than capacity
+        :return: np.ndarray of items
+        """
+        end = start + size
+        if end <= self.capacity:
+            return self.items[start:end].copy()
+        return np.concatenate((self.items[start:], self.items[:end - self.capacity]))
+
+    def release_at(self, start, size):
+        """
+        Set size vacated slots from position start on to None,
+        wrapping around to the start of the array,
+        so that the deque no longer keeps popped objects alive
+        Only object deques hold references, others are left as they are
+        :param start: int position in [0, capacity)
+        :param size: int number of slots, no more than capacity
+        :return: no return value
+        """
+        if self.holds_objects:
+            first = min(size, self.capacity - start)
+            self.items[start:start + first] = None
+            self.items[:size - first] = None
+
+    def as_item_array(self, items):
+        """
+        Flat array of items of this deque's dtype for the batch methods
+        :param items: iterable or np.ndarray of items
+        :return: np.ndarray of items
+        """
+        if not isinstance(items, np.ndarray):
+            items = list(items)
+        return np.asarray(items, dtype=self.items.dtype).ravel()
+
+    def push_many_back(self, items):
+        """
+        Add items after the last item, in order
+        Bounded deques push as many as fit, from the first item on
+        :param items: iterable or np.ndarray of items
+        :return: int number of items pushed
+        """
+        items = self.as_item_array(items)
+        size = self.room_for(len(items))
+        self.write_at((self.head + self.count) & self.mask, items[:size])
+        self.count += size
+        return size
+
+    def push_many_front(self, items):
+        """
+        Add items before the first item, one after another,
+        as push_front on each, so the last item ends up first
+        Bounded deques push as many as fit, from the first item on
+        :param items: iterable or np.ndarray of items
+        :return: int number of items pushed
+        """
+        items = self.as_item_array(items)
+        size = self.room_for(len(items))
+        self.head = (self.head - size) & self.mask
+        self.write_at(self.head, items[:size][::-1])
+        self.count += size
+        return size
+
+    def pop_many_back(self, k):
+        """
+        Remove the last k items
+        :param k: int number of items, fewer if the deque has fewer, none if negative
+        :return: np.ndarray of items, in the order pop_back returns them (last first)
+        """
+        size = max(min(int(k), self.count), 0)
+        self.count -= size
+        start = (self.head + self.count) & self.mask
+        items = self.read_at(start, size)
+        self.release_at(start, size)
+        return items[::-1]
+
+    def pop_many_front(self, k):
+        """
+        Remove the first k items
+        :param k: int number of items, fewer if the deque has fewer, none if negative
+        :return: np.ndarray of items, in order (first first)
+        """
+        size = max(min(int(k), self.count), 0)
+        items = self.read_at(self.head, size)
+        self.release_at(self.head, size)
+        self.head = (self.head + size) & self.mask
+        self.count -= size
+        return items
+
+    def clear(self):
+        """
+        Remove every item, keeping the memory
+        :return: no return value
+        """
+        self.release_at(self.head, self.count)
+        self.head = 0
+        self.count = 0
+
+    def get_items(self):
+        """
+        :return: np.ndarray copy of items from front to back
+        """
+        return self.read_at(self.head, self.count)
+
+    def show(self):
+        """
+        Show items from front to back,
+        then the ring as it is in memory, with the front marked
+        :return: no return value
+        """
+        if self.count == 0:
+            print ('*****************')
+            print ('No items in {}'.format(type(self).__name__))
+            print ('*****************')
+            return
+
+        size = 'of at most {} '.format(self.max_size) if self.max_size is not None else ''
+        print ('**** {} items {}in {} slots ****'.format(self.count, size, self.capacity))
+        print ('Front | ' + ' '.join(str(item) for item in self.get_items().tolist()) + ' | Back')
+        ring = []
+        for position in range(self.capacity):
+            is_used = (position - self.head) & self.mask < self.count
+            cell = str(self.buffer[position]) if is_used else '_'
+            ring.append('[' + cell + ']' if position == self.head else cell)
+        print ('Ring  | ' + ' '.join(ring))
+        print ('*' * 30)
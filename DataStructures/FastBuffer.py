@@ -0,0 +1,34 @@
+class FastBuffer:
+    """
+    Read and write NumPy arrays item by item, as fast as Python allows
+
+    Indexing a memoryview yields Python ints and floats
+    instead of boxed NumPy scalars, which is faster in loops.
+    A memoryview only indexes the native formats of the struct module, so
+    float16, long double, complex, datetime, non-native byte order,
+    structured and object arrays are indexed through the array itself
+    """
+    # Single-character memoryview formats that support indexing
+    FORMATS = '?bBhHiIlLqQnNfd'
+
+    @staticmethod
+    def of(array):
+        """
+        Buffer to index an array with, item by item
+        :param array: np.ndarray
+        :return: memoryview of array if it supports indexing, else array itself
+        """
+        dtype = array.dtype
+        if dtype.kind in 'biuf' and dtype.isnative:
+            view = memoryview(array)
+            if len(view.format) == 1 and view.format in FastBuffer.FORMATS:
+                return view
+        return array
+
+    @staticmethod
+    def is_fast(array):
+        """
+        :param array: np.ndarray
+        :return: True if (of(array) is a memoryview) else False
+        """
+        return isinstance(FastBuffer.of(array), memoryview)
@@ -0,0 +1,433 @@
+import numpy as np
+from DataStructures.FastBuffer import FastBuffer
+
+
+class HashTablePropertyException(Exception):
+    def __init__(self, expression="HashTableProperty", message="Hash table property not satisfied"):
+        self.expression = expression
+        self.message = message
+
+
+class HashTable:
+    """
+    Implement hash table of integer keys, stored in NumPy arrays
+
+    Values are of any NumPy dtype (int64 by default), records included,
+    or any Python object with dtype=object.
+    Every key is hashed to one of a power-of-two number of slots (or buckets)
+    by Fibonacci hashing, so finding a key is O(1) on average
+    instead of a descent through a tree.
+
+    How collisions are resolved is left to extending classes
+    (find, add and remove, and their batch versions):
+        OpenAddressingHashTable     probes the next slots of one array
+        ChainedHashTable            links the keys of each bucket into a list
+
+    The batch methods (contains_many, get_many, put_many, delete_many)
+    hash and probe a whole array of keys at once with NumPy,
+    so a batch costs a few NumPy operations per probe step
+    instead of a few Python operations per key.
+
+    For simplicity, all keys must be integers
+    """
+    # 2^64 / golden ratio
+    # Multiplying by it spreads nearby keys over the whole 64-bit range,
+    # and the top bits of the product are the slot
+    HASH_MULTIPLIER = 11400714819323198485
+    MASK_64 = 0xFFFFFFFFFFFFFFFF
+    # Never fewer slots than this
+    min_slots = 8
+    # Value of keys put without one, and of keys get_many does not find
+    default_value = 0
+    # Resize when more than max_load_factor of the slots are used, set by extending classes
+    max_load_factor = None
+    # Memory management
+    # After a resize, the table holds at most max_load_factor / growth_factor keys per slot,
+    # so that resizes are far enough apart for put to be amortized O(1)
+    growth_factor = 2
+    # Validate the whole table after every change, O(n)
+    # For debugging and staging, not production
+    debug = False
+
+    def __init__(self, capacity=16, value_dtype=np.int64):
+        """
+        :param capacity: int number of keys that fit before the table is resized
+        :param value_dtype: NumPy dtype of values, object for any Python object
+        """
+        self.value_dtype = np.dtype(value_dtype)
+        # Number of keys in table
+        self.count = 0
+        self.allocate(self.slots_for(capacity))
+
+    def __len__(self):
+        """
+        :return: int number of keys in table
+        """
+        return self.count
+
+    def __contains__(self, key):
+        """
+        :param key: int key in question
+        :return: True if (key is in table) else False
+        """
+        return self.contains(key)
+
+    def __getitem__(self, key):
+        """
+        :param key: int key in question
+        :return: value of key
+        :raises KeyError: if key is not in table
+        """
+        slot = self.find(self.as_key(key))
+        if slot is None:
+            raise KeyError(key)
+        return self.value_buffer[slot]
+
+    def __setitem__(self, key, value):
+        """
+        :param key: int key
+        :param value: new value of key
+        :return: no return value
+        """
+        self.put(key, value)
+
+    def __delitem__(self, key):
+        """
+        :param key: int key
+        :return: no return value
+        :raises KeyError: if key is not in table
+        """
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def __iter__(self):
+        """
+        Iterate over keys, in no particular order
+        :return: generator of int keys
+        """
+        return iter(self.get_keys().tolist())
+
+    def slots_for(self, size):
+        """
+        Smallest power-of-two number of slots
+        that fits size keys below max_load_factor
+        :param size: int number of keys
+        :return: int number of slots
+        """
+        slots = self.min_slots
+        while size > slots * self.max_load_factor:
+            slots *= 2
+        return slots
+
+    def allocate(self, slots):
+        """
+        Set new, empty arrays with the given number of slots
+        Extending classes allocate their own arrays, then call this
+        :param slots: int power-of-two number of slots
+        :return: no return value
+        """
+        self.slots = slots
+        self.mask = slots - 1
+        # Top bits of a 64-bit product index 2^(64 - shift) slots
+        self.shift = 64 - (slots.bit_length() - 1)
+
+    def hash(self, key):
+        """
+        Slot of one key
+        :param key: int key
+        :return: int slot in [0, slots)
+        """
+        return ((key * self.HASH_MULTIPLIER) & self.MASK_64) >> self.shift
+
+    def hash_many(self, keys):
+        """
+        Slots of an array of keys, the same as hash for each key
+        Unsigned 64-bit products wrap around, as & MASK_64 does in hash
+        :param keys: np.ndarray of integers
+        :return: np.ndarray of int64 slots
+        """
+        products = keys.astype(np.uint64) * np.uint64(self.HASH_MULTIPLIER)
+        return (products >> np.uint64(self.shift)).astype(np.int64)
+
+    @staticmethod
+    def as_key(key):
+        """
+        Verify key is an integer
+        :param key: int or np.integer key
+        :return: int key
+        """
+        # Assert valid input
+        assert(isinstance(key, (int, np.integer)))
+        return int(key)
+
+    @staticmethod
+    def as_key_array(keys):
+        """
+        Flat int64 array of keys for the batch methods
+        :param keys: iterable or np.ndarray of integers
+        :return: np.ndarray of int64
+        """
+        keys = np.asarray(keys if isinstance(keys, np.ndarray) else list(keys)).ravel()
+        # Assert valid input
+        assert(keys.size == 0 or np.issubdtype(keys.dtype, np.integer))
+        return keys.astype(np.int64, copy=False)
+
+    def update_value_buffer(self):
+        """
+        Set value_buffer whenever values is (re)allocated
+        A memoryview where possible (see FastBuffer), else the array
+        :return: no return value
+        """
+        self.value_buffer = FastBuffer.of(self.values)
+
+    def contains(self, key):
+        """
+        :param key: int key in question
+        :return: True if (key is in table) else False
+        """
+        return self.find(self.as_key(key)) is not None
+
+    def get(self, key, default=None):
+        """
+        :param key: int key in question
+        :param default: returned if key is not in table
+        :return: value of key, or default
+        """
+        slot = self.find(self.as_key(key))
+        return default if slot is None else self.value_buffer[slot]
+
+    def put(self, key, value=default_value, verbose=False):
+        """
+        Set the value of key, adding key if it is not in the table
+        :param key: int key
+        :param value: new value of key
+        :param verbose: boolean show table after put
+        :return: True if (key is new) else False
+        """
+        key = self.as_key(key)
+        slot = self.find(key)
+        is_new = slot is None
+        if is_new:
+            slot = self.add(key)
+        self.value_buffer[slot] = value
+
+        if verbose:
+            self.show()
+
+        if self.debug:
+            self.validate()
+
+        return is_new
+
+    def delete(self, key, verbose=False):
+        """
+        Delete key from the table
+        Do not raise exception on not found.
+        :param key: int key
+        :param verbose: boolean show table after delete
+        :return: True if (key was in table) else False
+        """
+        slot = self.find(self.as_key(key))
+        if slot is not None:
+            self.remove(slot)
+
+        if verbose:
+            self.show()
+
+        if self.debug:
+            self.validate()
+
+        return slot is not None
+
+    def contains_many(self, keys):
+        """
+        Find which keys are in the table
+        :param keys: iterable or np.ndarray of integers
+        :return: np.ndarray of booleans, True where the key is in the table
+        """
+        return self.find_many(self.as_key_array(keys)) >= 0
+
+    def get_many(self, keys, default=default_value):
+        """
+        Get the values of many keys at once
+        :param keys: iterable or np.ndarray of integers
+        :param default: value where the key is not in the table
+        :return: np.ndarray of values, parallel to keys
+        """
+        slots = self.find_many(self.as_key_array(keys))
+        found = slots >= 0
+        values = np.full(slots.size, default, dtype=self.value_dtype)
+        values[found] = self.values[slots[found]]
+        return values
+
+    def put_many(self, keys, values=None, verbose=False):
+        """
+        Set the values of many keys at once, adding the keys not in the table
+        Where a key is in the batch more than once, its last value is kept
+        :param keys: iterable or np.ndarray of integers
+        :param values: scalar or np.ndarray of values, parallel to keys
+                       (default: default_value)
+        :param verbose: boolean show table after put
+        :return: np.ndarray of booleans, True where the key was not in the table before
+        """
+        keys = self.as_key_array(keys)
+        values = np.broadcast_to(np.asarray(self.default_value if values is None else values,
+                                            dtype=self.value_dtype), keys.shape)
+
+        # Last instance of each key, found as the first instance in reverse
+        unique_keys, reversed_index = np.unique(keys[::-1], return_index=True)
+        unique_values = values[keys.size - 1 - reversed_index]
+
+        slots = self.find_many(unique_keys)
+        found = slots >= 0
+        self.values[slots[found]] = unique_values[found]
+        # New keys may resize the table, which moves the keys already found
+        new_slots = self.add_many(unique_keys[~found])
+        self.values[new_slots] = unique_values[~found]
+
+        if verbose:
+            self.show()
+
+        if self.debug:
+            self.validate()
+
+        return ~np.isin(keys, unique_keys[found])
+
+    def delete_many(self, keys, verbose=False):
+        """
+        Delete many keys at once
+        :param keys: iterable or np.ndarray of integers
+        :param verbose: boolean show table after delete
+        :return: np.ndarray of booleans, True where the key was in the table
+        """
+        keys = self.as_key_array(keys)
+        unique_keys = np.unique(keys)
+        slots = self.find_many(unique_keys)
+        found = slots >= 0
+        self.remove_many(slots[found])
+
+        if verbose:
+            self.show()
+
+        if self.debug:
+            self.validate()
+
+        return np.isin(keys, unique_keys[found])
+
+    def reserve(self, size):
+        """
+        Pre-size the table so that size keys fit
+        without any further resize
+        :param size: int number of keys to fit
+        :return: no return value
+        """
+        if size > self.count:
+            self.make_room(size - self.count)
+
+    def items(self):
+        """
+        Every key and its value, in no particular order
+        :return: (np.ndarray of int64 keys, np.ndarray of values)
+        """
+        slots = self.get_slots()
+        return self.keys[slots], self.values[slots]
+
+    def get_keys(self):
+        """
+        :return: np.ndarray of every key, in no particular order
+        """
+        return self.keys[self.get_slots()]
+
+    def get_load_factor(self):
+        """
+        :return: float keys per slot
+        """
+        return self.count / self.slots
+
+    def find(self, key):
+        """
+        Find the slot of key
+        Implemented by extending classes
+        :param key: int key
+        :return: int slot or None
+        """
+        raise NotImplementedError
+
+    def find_many(self, keys):
+        """
+        Find the slots of many keys
+        Implemented by extending classes
+        :param keys: np.ndarray of int64 keys
+        :return: np.ndarray of int64 slots, -1 where the key is not in the table
+        """
+        raise NotImplementedError
+
+    def add(self, key):
+        """
+        Add a key that is not in the table, resizing if needed
+        Implemented by extending classes
+        :param key: int key
+        :return: int slot of key
+        """
+        raise NotImplementedError
+
+    def add_many(self, keys):
+        """
+        Add many distinct keys that are not in the table, resizing if needed
+        Implemented by extending classes
+        :param keys: np.ndarray of unique int64 keys
+        :return: np.ndarray of int64 slots, parallel to keys
+        """
+        raise NotImplementedError
+
+    def remove(self, slot):
+        """
+        Remove the key in slot
+        Implemented by extending classes
+        :param slot: int slot of key
+        :return: no return value
+        """
+        raise NotImplementedError
+
+    def remove_many(self, slots):
+        """
+        Remove the keys in many slots
+        Implemented by extending classes
+        :param slots: np.ndarray of distinct int64 slots
+        :return: no return value
+        """
+        raise NotImplementedError
+
+    def make_room(self, extra):
+        """
+        Resize the table if extra more keys would not fit
+        Implemented by extending classes
+        :param extra: int number of keys about to be added
+        :return: no return value
+        """
+        raise NotImplementedError
+
+    def get_slots(self):
+        """
+        Slots of every key
+        Implemented by extending classes
+        :return: np.ndarray of int64 slots
+        """
+        raise NotImplementedError
+
+    def validate(self):
+        """
+        Check every key, O(n)
+        Implemented by extending classes
+        :return: True if table is consistent
+        :raises HashTablePropertyException: if it is not
+        """
+        raise NotImplementedError
+
+    def show(self):
+        """
+        Show table
+        Implemented by extending classes
+        :return: no return value
+        """
+        raise NotImplementedError
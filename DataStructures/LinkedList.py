@@ -0,0 +1,340 @@
+from DataStructures.LinkedNode import LinkedNode
+
+
+class LinkedListPropertyException(Exception):
+    def __init__(self, expression="LinkedListProperty", message="Linked list property not satisfied"):
+        self.expression = expression
+        self.message = message
+
+
+class LinkedList:
+    """
+    Implement doubly linked list of LinkedNode objects
+
+    Adding or removing a node next to one already in hand is O(1),
+    and so is moving a run of nodes (move_range, move_to_front)
+    or joining a whole other list in (concat, splice),
+    because only the links at the two ends change.
+
+    Removed nodes may be kept in a pool (pool_size) and reused by later pushes,
+    so that lists that churn through nodes, such as LRU caches,
+    stop allocating and freeing a node object for every push.
+    A removed node must not be used again by the caller.
+
+    For simplicity, all keys must be integers
+    """
+    node_class = LinkedNode
+
+    def __init__(self, pool_size=0):
+        """
+        :param pool_size: int most removed nodes kept for reuse, 0 for no pool
+        """
+        # First and last nodes, None(empty)
+        self.head = None
+        self.tail = None
+        # Number of nodes in list
+        self.count = 0
+        # Removed nodes to reuse, linked through next
+        self.pool_size = int(pool_size)
+        self.pool_head = None
+        self.pool_count = 0
+
+    def __len__(self):
+        """
+        :return: int number of nodes in list
+        """
+        return self.count
+
+    def __iter__(self):
+        """
+        Iterate over keys from head to tail
+        :return: generator of keys
+        """
+        node = self.head
+        while node is not None:
+            yield node.key
+            node = node.next
+
+    @classmethod
+    def from_array(cls, keys, pool_size=0):
+        """
+        Build a list of keys in order
+        :param keys: iterable or np.ndarray of integers
+        :param pool_size: int most removed nodes kept for reuse
+        :return: list of this class
+        """
+        linked_list = cls(pool_size=pool_size)
+        linked_list.extend(keys)
+        return linked_list
+
+    def is_empty(self):
+        """
+        :return: True if (list is empty) else False
+        """
+        return self.head is None
+
+    def new_node(self, key):
+        """
+        Get a node for key, from the pool if possible
+        :param key: key of new node
+        :return: LinkedNode not in any list
+        """
+        node = self.pool_head
+        if node is None:
+            return self.node_class(key)
+
+        self.pool_head = node.next
+        self.pool_count -= 1
+        node.key = key
+        node.next = None
+        return node
+
+    def free_node(self, node):
+        """
+        Keep a removed node in the pool, if there is room
+        :param node: LinkedNode no longer in list
+        :return: no return value
+        """
+        node.prev = None
+        if self.pool_count < self.pool_size:
+            node.next = self.pool_head
+            self.pool_head = node
+            self.pool_count += 1
+        else:
+            node.next = None
+
+    def link_after(self, first, last, after):
+        """
+        Link a chain of nodes first...last into the list after a node
+        :param first: LinkedNode first node of chain
+        :param last: LinkedNode last node of chain, reachable from first by next
+        :param after: LinkedNode in list, or None to link at the head
+        :return: no return value
+        """
+        before = self.head if after is None else after.next
+        first.prev = after
+        last.next = before
+        if after is None:
+            self.head = first
+        else:
+            after.next = first
+        if before is None:
+            self.tail = last
+        else:
+            before.prev = last
+
+    def unlink(self, first, last):
+        """
+        Unlink a chain of nodes first...last from the list
+        The chain keeps its inner links
+        :param first: LinkedNode first node of chain
+        :param last: LinkedNode last node of chain, reachable from first by next
+        :return: no return value
+        """
+        before = first.prev
+        after = last.next
+        if before is None:
+            self.head = after
+        else:
+            before.next = after
+        if after is None:
+            self.tail = before
+        else:
+            after.prev = before
+        first.prev = None
+        last.next = None
+
+    def push_front(self, key):
+        """
+        Add key before the head
+        :param key: key of new node
+        :return: new node
+        """
+        return self.insert_after(None, key)
+
+    def push_back(self, key):
+        """
+        Add key after the tail
+        :param key: key of new node
+        :return: new node
+        """
+        return self.insert_after(self.tail, key)
+
+    def insert_after(self, node, key):
+        """
+        Add key after node
+        :param node: LinkedNode in list, or None to add at the head
+        :param key: key of new node
+        :return: new node
+        """
+        new_node = self.new_node(key)
+        self.link_after(new_node, new_node, node)
+        self.count += 1
+        return new_node
+
+    def insert_before(self, node, key):
+        """
+        Add key before node
+        :param node: LinkedNode in list, or None to add at the tail
+        :param key: key of new node
+        :return: new node
+        """
+        return self.insert_after(self.tail if node is None else node.prev, key)
+
+    def extend(self, keys):
+        """
+        Add keys after the tail, in order
+        :param keys: iterable or np.ndarray of integers
+        :return: no return value
+        """
+        if hasattr(keys, 'tolist'):
+            keys = keys.tolist()
+        for key in keys:
+            self.push_back(key)
+
+    def remove(self, node):
+        """
+        Remove node from the list, O(1)
+        :param node: LinkedNode in list
+        :return: key of node
+        """
+        key = node.key
+        self.unlink(node, node)
+        self.count -= 1
+        self.free_node(node)
+        return key
+
+    def pop_front(self):
+        """
+        Remove the head
+        :return: key of head, or None if empty
+        """
+        return None if self.head is None else self.remove(self.head)
+
+    def pop_back(self):
+        """
+        Remove the tail
+        :return: key of tail, or None if empty
+        """
+        return None if self.tail is None else self.remove(self.tail)
+
+    def search(self, key):
+        """
+        Find the first node with key, O(n)
+        :param key: search key
+        :return: LinkedNode or None
+        """
+        node = self.head
+        while node is not None and node.key != key:
+            node = node.next
+        return node
+
+    def move_range(self, first, last, after):
+        """
+        Move the nodes first...last to after a node, O(1)
+        :param first: LinkedNode first node to move
+        :param last: LinkedNode last node to move, at or after first
+        :param after: LinkedNode in list but not in first...last,
+                      or None to move to the head
+        :return: no return value
+        """
+        if first.prev is after:
+            # Already there
+            return
+        self.unlink(first, last)
+        self.link_after(first, last, after)
+
+    def move_to_front(self, node):
+        """
+        Move node to the head, O(1)
+        :param node: LinkedNode in list
+        :return: no return value
+        """
+        if node is not self.head:
+            self.unlink(node, node)
+            self.link_after(node, node, None)
+
+    def move_to_back(self, node):
+        """
+        Move node to the tail, O(1)
+        :param node: LinkedNode in list
+        :return: no return value
+        """
+        if node is not self.tail:
+            self.unlink(node, node)
+            self.link_after(node, node, self.tail)
+
+    def splice(self, after, other):
+        """
+        Move every node of another list into this one after a node, O(1)
+        The other list is left empty, its nodes now belong to this list
+        :param after: LinkedNode in this list, or None to splice at the head
+        :param other: LinkedList, not this one
+        :return: no return value
+        """
+        assert other is not self
+        if other.head is None:
+            return
+        self.link_after(other.head, other.tail, after)
+        self.count += other.count
+        other.head = None
+        other.tail = None
+        other.count = 0
+
+    def concat(self, other):
+        """
+        Move every node of another list to after the tail, O(1)
+        :param other: LinkedList, not this one
+        :return: no return value
+        """
+        self.splice(self.tail, other)
+
+    def get_keys(self):
+        """
+        :return: list of keys from head to tail
+        """
+        return list(self)
+
+    def validate(self):
+        """
+        Check every link, O(n)
+        Every node links back to the node before it,
+        head and tail are the ends, and count is the number of nodes
+        :return: True if list is consistent
+        :raises LinkedListPropertyException: at the first node that is not
+        """
+        if self.head is not None and self.head.prev is not None:
+            raise LinkedListPropertyException(message="Head {} has a previous node".format(self.head.key))
+
+        count = 0
+        previous = None
+        node = self.head
+        while node is not None:
+            if node.prev is not previous:
+                raise LinkedListPropertyException(
+                    message="Node {} does not link back to the node before it".format(node.key))
+            count += 1
+            if count > self.count:
+                raise LinkedListPropertyException(message="List has more than count {} nodes".format(self.count))
+            previous = node
+            node = node.next
+
+        if previous is not self.tail:
+            raise LinkedListPropertyException(message="Last node is not the tail")
+        if count != self.count:
+            raise LinkedListPropertyException(message="List has {} nodes, but count {}".format(count, self.count))
+
+        return True
+
+    def show(self):
+        """
+        Show keys from head to tail
+        :return: no return value
+        """
+        if self.head is None:
+            print ('****************')
+            print ('No nodes in list')
+            print ('****************')
+            return
+
+        print ('Head | ' + ' <-> '.join(str(key) for key in self) + ' | Tail')
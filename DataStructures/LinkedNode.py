@@ -0,0 +1,45 @@
+from DataStructures.Node import Node
+
+
+class LinkedNode(Node):
+    """
+    Node of a doubly linked list
+    A node points to the nodes before and after it
+    """
+    __slots__ = ('prev', 'next')
+
+    @classmethod
+    def or_none(cls, node):
+        """
+        Verify passed node is a member of this class
+        Return either the node or None
+        :param node: node in question
+        :return: LinkedNode object || None
+        """
+        return node if isinstance(node, cls) else None
+
+    def __init__(self, key, prev=None, next=None):
+        """
+        Initialize with kwargs for each object variable
+        :param key: key value for new node
+        :param prev: LinkedNode before new node
+        :param next: LinkedNode after new node
+        """
+        super().__init__(key)
+
+        self.prev = LinkedNode.or_none(prev)
+        self.next = LinkedNode.or_none(next)
+
+    def get_prev(self):
+        """
+        Return node before this one (None if not set)
+        :return: previous node
+        """
+        return LinkedNode.or_none(self.prev)
+
+    def get_next(self):
+        """
+        Return node after this one (None if not set)
+        :return: next node
+        """
+        return LinkedNode.or_none(self.next)
@@ -5,7 +5,9 @@ class Node:
     Very basic ADT of a node
     Designed to be inherited for more interesting ADTs
     """
-    key = 0
+    # Fixed attributes, no per-instance __dict__
+    # Subclasses declare only the attributes they add
+    __slots__ = ('key',)
 
     @classmethod
     def or_none(cls, node):
@@ -0,0 +1,285 @@
+import numpy as np
+from DataStructures.FastBuffer import FastBuffer
+from DataStructures.HashTable import HashTable, HashTablePropertyException
+
+
+class OpenAddressingHashTable(HashTable):
+    """
+    Implement hash table by open addressing with linear probing
+
+    Keys, values and the state of every slot are parallel NumPy arrays.
+    A key that collides goes to the next free slot after its own,
+    so a search reads slots left to right from the slot of the key
+    until it finds the key or an EMPTY slot, usually in the same cache line.
+
+    Deleted keys leave a DELETED slot (tombstone) behind,
+    so that searches for keys further along do not stop there.
+    New keys reuse tombstones, and resizing clears them.
+
+    For simplicity, all keys must be integers
+    """
+    # States of slots
+    EMPTY = 0
+    FULL = 1
+    DELETED = 2
+    # Longer runs of full slots make probing slow above about half full
+    # Tombstones count as used
+    max_load_factor = 0.5
+
+    def allocate(self, slots):
+        """
+        Set new, empty arrays with the given number of slots
+        @overrides method in HashTable
+        :param slots: int power-of-two number of slots
+        :return: no return value
+        """
+        super().allocate(slots)
+        self.keys = np.zeros(slots, dtype=np.int64)
+        self.values = np.zeros(slots, dtype=self.value_dtype)
+        self.states = np.zeros(slots, dtype=np.uint8)
+        # Number of DELETED slots
+        self.tombstones = 0
+        self.update_buffers()
+
+    def update_buffers(self):
+        """
+        Set buffers of the arrays, whenever they are (re)allocated
+        Memoryviews where possible (see FastBuffer), else the arrays
+        :return: no return value
+        """
+        self.key_buffer = FastBuffer.of(self.keys)
+        self.state_buffer = FastBuffer.of(self.states)
+        self.update_value_buffer()
+
+    def find(self, key):
+        """
+        Find the slot of key by probing from its own slot
+        @overrides method in HashTable
+        :param key: int key
+        :return: int slot or None
+        """
+        keys = self.key_buffer
+        states = self.state_buffer
+        mask = self.mask
+
+        slot = self.hash(key)
+        # There is always an EMPTY slot, max_load_factor < 1
+        while states[slot] != self.EMPTY:
+            if keys[slot] == key and states[slot] == self.FULL:
+                return slot
+            slot = (slot + 1) & mask
+        return None
+
+    def find_many(self, keys):
+        """
+        Find the slots of many keys, probing for all of them at once
+        Each step reads the next slot of every key still probing,
+        so the number of steps is the longest probe, not the number of keys
+        @overrides method in HashTable
+        :param keys: np.ndarray of int64 keys
+        :return: np.ndarray of int64 slots, -1 where the key is not in the table
+        """
+        found_slots = np.full(keys.size, -1, dtype=np.int64)
+        # Index in keys and current slot of every key still probing
+        probing = np.arange(keys.size)
+        slots = self.hash_many(keys)
+        while probing.size > 0:
+            states = self.states[slots]
+            is_found = (states == self.FULL) & (self.keys[slots] == keys[probing])
+            found_slots[probing[is_found]] = slots[is_found]
+            # Stop at the key or an EMPTY slot
+            go_on = ~is_found & (states != self.EMPTY)
+            probing = probing[go_on]
+            slots = (slots[go_on] + 1) & self.mask
+
+        return found_slots
+
+    def add(self, key):
+        """
+        Put key in the first slot from its own that is not FULL
+        @overrides method in HashTable
+        :param key: int key, not in table
+        :return: int slot of key
+        """
+        self.make_room(1)
+        states = self.state_buffer
+        mask = self.mask
+
+        slot = self.hash(key)
+        while states[slot] == self.FULL:
+            slot = (slot + 1) & mask
+        if states[slot] == self.DELETED:
+            self.tombstones -= 1
+        states[slot] = self.FULL
+        self.key_buffer[slot] = key
+        self.count += 1
+
+        return slot
+
+    def add_many(self, keys):
+        """
+        Add many distinct keys, resizing once first
+        @overrides method in HashTable
+        :param keys: np.ndarray of unique int64 keys, none in table
+        :return: np.ndarray of int64 slots, parallel to keys
+        """
+        self.make_room(keys.size)
+        return self.place_many(keys)
+
+    def place_many(self, keys):
+        """
+        Put many distinct keys in the first slot from their own that is not FULL
+        All keys probe at once. Where several reach the same free slot in a step,
+        the first of them takes it and the others probe on, so each step places
+        at least one key. There must be room for all of them
+        :param keys: np.ndarray of unique int64 keys, none in table
+        :return: np.ndarray of int64 slots, parallel to keys
+        """
+        placed_slots = np.zeros(keys.size, dtype=np.int64)
+        # Index in keys and current slot of every key still probing
+        probing = np.arange(keys.size)
+        slots = self.hash_many(keys)
+        while probing.size > 0:
+            is_free = np.flatnonzero(self.states[slots] != self.FULL)
+            free_slots, first = np.unique(slots[is_free], return_index=True)
+            winners = is_free[first]
+
+            self.tombstones -= int(np.count_nonzero(self.states[free_slots] == self.DELETED))
+            self.states[free_slots] = self.FULL
+            self.keys[free_slots] = keys[probing[winners]]
+            placed_slots[probing[winners]] = free_slots
+
+            go_on = np.ones(probing.size, dtype=bool)
+            go_on[winners] = False
+            probing = probing[go_on]
+            slots = (slots[go_on] + 1) & self.mask
+
+        self.count += keys.size
+        return placed_slots
+
+    def remove(self, slot):
+        """
+        Remove the key in slot, leaving a tombstone
+        If the next slot is EMPTY, no search continues past slot,
+        so slot and the tombstones just before it become EMPTY instead
+        @overrides method in HashTable
+        :param slot: int slot of key
+        :return: no return value
+        """
+        states = self.state_buffer
+        mask = self.mask
+        self.count -= 1
+
+        if states[(slot + 1) & mask] != self.EMPTY:
+            states[slot] = self.DELETED
+            self.tombstones += 1
+            return
+
+        states[slot] = self.EMPTY
+        slot = (slot - 1) & mask
+        while states[slot] == self.DELETED:
+            states[slot] = self.EMPTY
+            self.tombstones -= 1
+            slot = (slot - 1) & mask
+
+    def remove_many(self, slots):
+        """
+        Remove the keys in many slots, leaving tombstones
+        @overrides method in HashTable
+        :param slots: np.ndarray of distinct int64 slots
+        :return: no return value
+        """
+        self.states[slots] = self.DELETED
+        self.tombstones += slots.size
+        self.count -= slots.size
+
+    def make_room(self, extra):
+        """
+        Rehash the table if extra more keys
+        would fill more than max_load_factor of the slots, tombstones included
+        The new size depends on the number of keys only,
+        so a table of mostly tombstones is rehashed at the same size or smaller
+        @overrides method in HashTable
+        :param extra: int number of keys about to be added
+        :return: no return value
+        """
+        size = self.count + extra
+        if size + self.tombstones > self.slots * self.max_load_factor:
+            self.rehash(self.slots_for(size * self.growth_factor))
+
+    def rehash(self, slots):
+        """
+        Move every key and value into new arrays of the given number of slots
+        :param slots: int power-of-two number of slots, fits every key
+        :return: no return value
+        """
+        old_slots = self.get_slots()
+        keys = self.keys[old_slots]
+        values = self.values[old_slots]
+
+        self.allocate(slots)
+        self.count = 0
+        self.values[self.place_many(keys)] = values
+
+    def get_slots(self):
+        """
+        Slots of every key
+        @overrides method in HashTable
+        :return: np.ndarray of int64 slots
+        """
+        return np.flatnonzero(self.states == self.FULL)
+
+    def validate(self):
+        """
+        Check every slot, O(n)
+        Counts match the states of the slots, and every key is found
+        by probing from its own slot, in the slot it is in
+        @overrides method in HashTable
+        :return: True if table is consistent
+        :raises HashTablePropertyException: at the first key that is not found
+        """
+        full_slots = self.get_slots()
+        if full_slots.size != self.count:
+            raise HashTablePropertyException(
+                message="Table has {} full slots, but count {}".format(full_slots.size, self.count))
+        tombstones = int(np.count_nonzero(self.states == self.DELETED))
+        if tombstones != self.tombstones:
+            raise HashTablePropertyException(
+                message="Table has {} tombstones, but counts {}".format(tombstones, self.tombstones))
+        if self.count + self.tombstones >= self.slots:
+            raise HashTablePropertyException(message="Table has no EMPTY slot")
+
+        keys = self.keys[full_slots]
+        found_slots = self.find_many(keys)
+        wrong = np.flatnonzero(found_slots != full_slots)
+        if wrong.size > 0:
+            raise HashTablePropertyException(
+                message="Key {} in slot {} is found in slot {}".format(
+                    keys[wrong[0]], full_slots[wrong[0]], found_slots[wrong[0]]))
+
+        return True
+
+    def show(self):
+        """
+        Show table, one slot per line
+        Empty slots are blank, tombstones are marked x
+        :return: no return value
+        """
+        if self.count == 0:
+            print ('*****************')
+            print ('No keys in table')
+            print ('*****************')
+            return
+
+        slot_width = len(str(self.slots - 1))
+        print ('**** {} keys in {} slots ****'.format(self.count, self.slots))
+        for slot in range(self.slots):
+            state = self.state_buffer[slot]
+            if state == self.FULL:
+                entry = '{}: {}'.format(self.key_buffer[slot], self.value_buffer[slot])
+            elif state == self.DELETED:
+                entry = 'x'
+            else:
+                entry = ''
+            print ('{} | {}'.format(str(slot).rjust(slot_width), entry))
+        print ('*' * 30)
@@ -0,0 +1,165 @@
+from DataStructures.PairingNode import PairingNode
+import numpy as np
+
+
+class PairingHeap:
+    """
+    Implement pairing heap, a heap-ordered tree whose nodes have any number of children
+
+    Merging two heaps links their roots, O(1),
+    where BinaryHeap.merge copies and rebuilds, O(n).
+    Adding is O(1) and extracting is amortized O(log n).
+
+    For simplicity, only allow integers
+    """
+
+    def __init__(self, values=None, largest_first=True):
+        """
+        :param values: optional iterable of initial values
+        :param largest_first: boolean max heap if True, else min heap
+        """
+        # Head of heap is a PairingNode or None(empty)
+        self.head = None
+        self.size = 0
+        self.largest_first = largest_first
+        # When an item is not found
+        self.default_value = -np.inf if largest_first else np.inf
+
+        if values is not None:
+            self.extend(values)
+
+    def has_priority(self, key_0, key_1):
+        """
+        Whether an item with key_0 belongs above an item with key_1
+        :param key_0: key of first item
+        :param key_1: key of second item
+        :return: boolean key_0 strictly before key_1
+        """
+        return key_0 > key_1 if self.largest_first else key_0 < key_1
+
+    def is_empty(self):
+        """
+        :return: True if (heap is empty) else False
+        """
+        return self.head is None
+
+    def link(self, node_0, node_1):
+        """
+        Link two heaps by making the root of lower priority
+        the first child of the other
+        :param node_0: PairingNode root of first heap or None
+        :param node_1: PairingNode root of second heap or None
+        :return: PairingNode root of linked heap or None
+        """
+        if node_0 is None:
+            return node_1
+        if node_1 is None:
+            return node_0
+
+        if self.has_priority(node_1.get_key(), node_0.get_key()):
+            node_0, node_1 = node_1, node_0
+        node_0.add_child(node_1)
+
+        return node_0
+
+    def add_item(self, new_value):
+        """
+        Add item to heap as a heap of its own, linked to the root, O(1)
+        :param new_value: new integer value
+        :return: PairingNode new node
+        """
+        assert(isinstance(new_value, (int, np.integer)))
+
+        node = PairingNode(key=int(new_value))
+        self.head = self.link(self.head, node)
+        self.size += 1
+
+        return node
+
+    def extend(self, new_values):
+        """
+        Add many items to heap
+        :param new_values: iterable of new integer values
+        :return: no return value
+        """
+        for new_value in new_values:
+            self.add_item(new_value)
+
+    def merge(self, other):
+        """
+        Move all items of another pairing heap into this heap, O(1)
+        The other heap is emptied, since its nodes now belong to this heap
+        :param other: PairingHeap of the same order
+        :return: no return value
+        """
+        assert isinstance(other, PairingHeap)
+        assert other.largest_first == self.largest_first
+        if other is self:
+            return
+
+        self.head = self.link(self.head, other.head)
+        self.size += other.size
+        other.head = None
+        other.size = 0
+
+    def get_top(self):
+        """
+        Get first item (highest priority) without removing it
+        :return: int first item or default value if heap is empty
+        """
+        return self.default_value if self.head is None else self.head.get_key()
+
+    def extract_top(self):
+        """
+        Remove first item (highest priority)
+        Its children are linked in pairs from left to right,
+        then the pairs are linked from right to left, amortized O(log n)
+        :return: int first item or default value if heap is empty
+        """
+        if self.head is None:
+            return self.default_value
+
+        top_value = self.head.get_key()
+        children = self.head.pop_children()
+
+        # First pass: link pairs of children, left to right
+        pairs = [self.link(children[i], children[i + 1] if i + 1 < len(children) else None)
+                 for i in range(0, len(children), 2)]
+
+        # Second pass: link pairs into one heap, right to left
+        head = None
+        for pair in reversed(pairs):
+            head = self.link(pair, head)
+
+        self.head = head
+        self.size -= 1
+
+        return top_value
+
+    def show(self):
+        """
+        Show heap, one node per line,
+        each child indented beneath its parent
+        :return: no return value
+        """
+        if self.is_empty():
+            print ('****************')
+            print ('No items in heap')
+            print ('****************')
+            return
+
+        print ('****************')
+        # Stack holds (node, depth of node)
+        stack = [(self.head, 0)]
+        while len(stack) > 0:
+            node, depth = stack.pop()
+            print ('    ' * depth + str(node.get_key()))
+
+            # Siblings after this node, then children first
+            sibling = node.get_sibling()
+            if sibling is not None and depth > 0:
+                stack.append((sibling, depth))
+            child = node.get_child()
+            if child is not None:
+                stack.append((child, depth + 1))
+        print ('****************')
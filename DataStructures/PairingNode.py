@@ -0,0 +1,74 @@
+from DataStructures.Node import Node
+
+
+class PairingNode(Node):
+    """
+    Node of a pairing heap
+    Children are a linked list:
+    a node points to its first child and to its next sibling
+    """
+    __slots__ = ('child', 'sibling')
+
+    @classmethod
+    def or_none(cls, node):
+        """
+        Verify passed node is a member of this class
+        Return either the node or None
+        :param node: node in question
+        :return: PairingNode object || None
+        """
+        return node if isinstance(node, cls) else None
+
+    def __init__(self, key, child=None, sibling=None):
+        """
+        Initialize with kwargs for each object variable
+        :param key: key value for new node
+        :param child: PairingNode first child of new node
+        :param sibling: PairingNode next sibling of new node
+        """
+        super().__init__(key)
+
+        self.child   = PairingNode.or_none(child)
+        self.sibling = PairingNode.or_none(sibling)
+
+    def get_child(self):
+        """
+        Return first child node (None if not set)
+        :return: first child node
+        """
+        return PairingNode.or_none(self.child)
+
+    def get_sibling(self):
+        """
+        Return next sibling node (None if not set)
+        :return: next sibling node
+        """
+        return PairingNode.or_none(self.sibling)
+
+    def add_child(self, new_child):
+        """
+        Add passed node as the first child of this node
+        Its former siblings are replaced by the children of this node
+        :param new_child: new child node
+        :return: no return value
+        """
+        node = PairingNode.or_none(new_child)
+        if node is not None:
+            node.sibling = self.child
+            self.child = node
+
+    def pop_children(self):
+        """
+        Remove all children of this node
+        :return: list [PairingNode] former children, unlinked from each other
+        """
+        children = []
+        child = self.get_child()
+        while child is not None:
+            next_sibling = child.get_sibling()
+            child.sibling = None
+            children.append(child)
+            child = next_sibling
+        self.child = None
+
+        return children
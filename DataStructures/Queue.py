@@ -0,0 +1,19 @@
+from DataStructures.Deque import Deque
+
+
+class Queue(Deque):
+    """
+    Implement queue (first in, first out) as a NumPy ring buffer
+
+    Items are pushed to the back of a Deque and popped from its front.
+    pop_many returns items in the order they were pushed.
+
+    Bounded (max_size) queues push nothing when full (see Deque)
+    """
+    # Aliases rather than methods that call Deque,
+    # so that each push and pop is one Python call
+    push = Deque.push_back
+    pop = Deque.pop_front
+    peek = Deque.peek_front
+    push_many = Deque.push_many_back
+    pop_many = Deque.pop_many_front
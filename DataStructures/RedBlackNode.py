@@ -0,0 +1,40 @@
+from DataStructures.BinarySearchNode import BinarySearchNode
+
+
+class RedBlackNode(BinarySearchNode):
+    """
+    Binary search node colored red or black
+    """
+    __slots__ = ('is_red',)
+
+    @classmethod
+    def or_none(cls, node):
+        """
+        Verify passed node is a member of this class
+        Return either the node or None
+        :param node: node in question
+        :return: RedBlackNode object || None
+        """
+        return node if isinstance(node, cls) else None
+
+    @staticmethod
+    def is_red_node(node):
+        """
+        Whether node is red
+        Empty subtrees (None) count as black
+        :param node: RedBlackNode or None
+        :return: boolean node is red
+        """
+        return node is not None and node.is_red
+
+    def __init__(self, key, tree=None, parent=None, left=None, right=None):
+        """
+        Initialize with kwargs for each object variable
+        :param key: key value for new node
+        :param parent: RedBlackNode parent of new new node
+        :param left: RedBlackNode left child of new node
+        :param right: RedBlackNode right child of new node
+        """
+        super().__init__(key, tree=tree, parent=parent, left=left, right=right)
+        # New nodes are red
+        self.is_red = True
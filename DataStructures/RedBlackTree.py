@@ -0,0 +1,226 @@
+import numpy as np
+from DataStructures.RedBlackNode import RedBlackNode
+from DataStructures.BinarySearchTree import BinarySearchTree
+from DataStructures.Snapshot import SnapshotException
+
+
+class RedBlackTree(BinarySearchTree):
+    """
+    Implement red-black tree, a self-balancing binary search tree
+
+    Every node is red or black, the head is black,
+    a red node has no red children, and every path from a node
+    down to an empty subtree passes through the same number of black nodes.
+    The longest path is then at most twice the shortest, so the height is O(log n).
+
+    Rebalancing recolors nodes and uses at most two rotations per insert
+    and three per delete, fewer than an AVL tree may need.
+
+    For simplicity, all input must be integers
+    """
+    node_class = RedBlackNode
+    rebalances = True
+
+    def insert(self, key, verbose=False):
+        """
+        Insert key into tree as a red node, then repair red-black properties
+        @overrides method in BinarySearchTree
+        :param key: key of new node
+        :param verbose: boolean show actions during insert
+        :return: new node
+        """
+        node = super().insert(key, verbose=verbose)
+        self.insert_fixup(node, verbose=verbose)
+
+        if self.debug:
+            self.validate()
+
+        return node
+
+    def bulk_loaded(self, node, depth, height):
+        """
+        Color each node built by from_sorted
+        Every level is full except maybe the lowest,
+        so all nodes are black except the lowest level, which is red
+        @overrides method in BinarySearchTree
+        :param node: RedBlackNode whose subtrees are complete
+        :param depth: int depth of node, the head is at depth 1
+        :param height: int depth of the lowest level of the tree
+        :return: no return value
+        """
+        # The head is always black
+        node.is_red = depth == height and depth > 1
+
+    def snapshot_arrays(self, nodes):
+        """
+        Save the color of each node
+        @overrides method in BinarySearchTree
+        :param nodes: list [RedBlackNode] in the order they are saved
+        :return: dict {'is_red': np.ndarray of booleans}
+        """
+        return {'is_red': np.array([node.is_red for node in nodes], dtype=bool)}
+
+    def restore_snapshot_arrays(self, nodes, arrays):
+        """
+        Restore the color of each node
+        @overrides method in BinarySearchTree
+        :param nodes: list [RedBlackNode or None] by index in the snapshot
+        :param arrays: dict {str name: np.ndarray} arrays of the snapshot
+        :return: no return value
+        :raises SnapshotException: if the snapshot has no colors
+        """
+        if 'is_red' not in arrays:
+            raise SnapshotException(message="Snapshot has no colors, it is not of a RedBlackTree")
+        for node, is_red in zip(nodes, arrays['is_red'].tolist()):
+            if node is not None:
+                node.is_red = is_red
+
+    def insert_fixup(self, node, verbose=False):
+        """
+        A new red node may have a red parent
+        Push the problem up the tree by recoloring,
+        then end it with one or two rotations
+        :param node: RedBlackNode newly inserted node
+        :param verbose: boolean show rotations
+        :return: no return value
+        """
+        is_red = RedBlackNode.is_red_node
+        while is_red(node.get_parent()):
+            parent = node.get_parent()
+            # Parent is red, so it is not the head and has a parent
+            grandparent = parent.get_parent()
+            parent_is_left = parent.is_left_child()
+            uncle = grandparent.get_right() if parent_is_left else grandparent.get_left()
+
+            if is_red(uncle):
+                # Red uncle: recolor and continue from grandparent
+                parent.is_red = False
+                uncle.is_red = False
+                grandparent.is_red = True
+                node = grandparent
+                continue
+
+            # Black uncle: rotate node to the outside, then rotate grandparent
+            if parent_is_left:
+                if node.is_right_child():
+                    node = parent
+                    parent = node.rotate_left(verbose=verbose)
+                parent.is_red = False
+                grandparent.is_red = True
+                grandparent.rotate_right(verbose=verbose)
+            else:
+                if node.is_left_child():
+                    node = parent
+                    parent = node.rotate_right(verbose=verbose)
+                parent.is_red = False
+                grandparent.is_red = True
+                grandparent.rotate_left(verbose=verbose)
+
+        self.head.is_red = False
+
+    def delete(self, key, verbose=False) -> RedBlackNode or None:
+        """
+        Delete a node in the tree by the passed key value,
+        then repair red-black properties if a black node left its place
+        @overrides method in BinarySearchTree
+        :param key: key of node to delete
+        :param verbose: boolean show actions during delete
+        :return: returns the node if it is in the tree
+        """
+        # Assert valid input
+        assert(isinstance(key, int))
+
+        # Find where the structure will change before it does
+        node = self.search(key, verbose=verbose)
+        if node is None:
+            return None
+        left = node.get_left()
+        right = node.get_right()
+        successor = None
+        if left is None or right is None:
+            # Node leaves, its only child (or None) takes its place
+            removed_black = not node.is_red
+            child = left if left is not None else right
+            child_parent = node.get_parent()
+        else:
+            # Successor takes the place (and color) of node,
+            # successor's right child takes the place of successor
+            successor = node.successor()
+            removed_black = not successor.is_red
+            child = successor.get_right()
+            child_parent = successor if successor == right else successor.get_parent()
+
+        self.remove_node(node, verbose=verbose)
+
+        if successor is not None:
+            successor.is_red = node.is_red
+        if removed_black:
+            self.delete_fixup(child, child_parent, verbose=verbose)
+
+        if self.debug:
+            self.validate()
+
+        return node
+
+    def delete_fixup(self, node, parent, verbose=False):
+        """
+        Paths through node are missing one black node
+        Recolor and rotate around its sibling until a red node can be made black
+        :param node: RedBlackNode or None, in the place of the removed black node
+        :param parent: RedBlackNode parent of node (node may be None)
+        :param verbose: boolean show rotations
+        :return: no return value
+        """
+        is_red = RedBlackNode.is_red_node
+        while node != self.head and not is_red(node):
+            if node == parent.get_left():
+                sibling = parent.get_right()
+                if is_red(sibling):
+                    # Red sibling: rotate so that the sibling is black
+                    sibling.is_red = False
+                    parent.is_red = True
+                    parent.rotate_left(verbose=verbose)
+                    sibling = parent.get_right()
+                if not is_red(sibling.get_left()) and not is_red(sibling.get_right()):
+                    # Black sibling, black nephews: recolor and move up
+                    sibling.is_red = True
+                    node = parent
+                    parent = node.get_parent()
+                else:
+                    if not is_red(sibling.get_right()):
+                        # Inner nephew red: rotate it to the outside
+                        sibling.get_left().is_red = False
+                        sibling.is_red = True
+                        sibling = sibling.rotate_right(verbose=verbose)
+                    # Outer nephew red: rotate parent, done
+                    sibling.is_red = parent.is_red
+                    parent.is_red = False
+                    sibling.get_right().is_red = False
+                    parent.rotate_left(verbose=verbose)
+                    node = self.head
+                    parent = None
+            else:
+                sibling = parent.get_left()
+                if is_red(sibling):
+                    sibling.is_red = False
+                    parent.is_red = True
+                    parent.rotate_right(verbose=verbose)
+                    sibling = parent.get_left()
+                if not is_red(sibling.get_left()) and not is_red(sibling.get_right()):
+                    sibling.is_red = True
+                    node = parent
+                    parent = node.get_parent()
+                else:
+                    if not is_red(sibling.get_left()):
+                        sibling.get_right().is_red = False
+                        sibling.is_red = True
+                        sibling = sibling.rotate_left(verbose=verbose)
+                    sibling.is_red = parent.is_red
+                    parent.is_red = False
+                    sibling.get_left().is_red = False
+                    parent.rotate_right(verbose=verbose)
+                    node = self.head
+                    parent = None
+
+        if node is not None:
+            node.is_red = False
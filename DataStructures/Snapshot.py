@@ -0,0 +1,124 @@
+import json
+import numpy as np
+
+
+class SnapshotException(Exception):
+    def __init__(self, expression="Snapshot", message="Not a valid snapshot"):
+        self.expression = expression
+        self.message = message
+
+
+class Snapshot:
+    """
+    Binary snapshot of the arrays of a data structure
+
+    File layout:
+        bytes 0-7       magic, MAGIC
+        bytes 8-15      offset of header (little-endian uint64)
+        bytes 16-23     length of header
+        bytes 64-       each array, raw and contiguous, starting on a 64-byte boundary
+        header          JSON: the metadata of the structure,
+                        and the dtype, shape and offset of each array
+
+    Arrays are written as they are in memory, so reading maps them
+    with np.memmap instead of parsing them: opening a snapshot is O(1),
+    and the operating system pages the data in as it is used.
+    """
+    MAGIC = b'DSSNAP01'
+    # np.memmap modes that read may map with
+    # 'r+' is not one: the header (sizes, head, counts) is written once by write,
+    # so changes written through to the arrays would not match it
+    MODES = ('c', 'r')
+    # Arrays start on multiples of this, for aligned access
+    ALIGNMENT = 64
+
+    @staticmethod
+    def write(path, arrays, meta):
+        """
+        Write arrays and metadata to a snapshot file
+        :param path: str path of file, overwritten
+        :param arrays: dict {str name: np.ndarray}
+        :param meta: dict of JSON-serializable metadata
+        :return: no return value
+        """
+        entries = []
+        with open(path, 'wb') as file:
+            # Preamble is written again at the end, once the header offset is known
+            file.write(bytes(Snapshot.ALIGNMENT))
+            for name, array in arrays.items():
+                array = np.ascontiguousarray(array)
+                offset = Snapshot.align(file)
+                entries.append({'name': name,
+                                'descr': np.lib.format.dtype_to_descr(array.dtype),
+                                'shape': list(array.shape),
+                                'offset': offset})
+                if array.size > 0:
+                    array.tofile(file)
+
+            header = json.dumps({'meta': meta, 'arrays': entries}).encode('utf-8')
+            header_offset = file.tell()
+            file.write(header)
+
+            file.seek(0)
+            file.write(Snapshot.MAGIC)
+            file.write(np.array([header_offset, len(header)], dtype='<u8').tobytes())
+
+    @staticmethod
+    def align(file):
+        """
+        Pad file with zeros up to the next multiple of ALIGNMENT
+        :param file: file open for binary writing
+        :return: int new position
+        """
+        position = file.tell()
+        padding = -position % Snapshot.ALIGNMENT
+        file.write(bytes(padding))
+        return position + padding
+
+    @staticmethod
+    def read(path, mode='c'):
+        """
+        Map the arrays of a snapshot file into memory
+        :param path: str path of file
+        :param mode: np.memmap mode, one of MODES
+                     'c' copy-on-write, changes stay in memory (default)
+                     'r' read-only
+        :return: (dict {str name: np.memmap}, dict metadata)
+        :raises SnapshotException: if the file is not a snapshot, or mode is not one of MODES
+        """
+        if mode not in Snapshot.MODES:
+            raise SnapshotException(
+                message="Snapshots are mapped with mode {}, not {}".format(' or '.join(Snapshot.MODES), mode))
+        with open(path, 'rb') as file:
+            preamble = file.read(24)
+            if len(preamble) < 24 or preamble[:8] != Snapshot.MAGIC:
+                raise SnapshotException(message="{} is not a snapshot".format(path))
+            header_offset, header_length = np.frombuffer(preamble[8:24], dtype='<u8').tolist()
+            file.seek(header_offset)
+            header = json.loads(file.read(header_length).decode('utf-8'))
+
+        arrays = {}
+        for entry in header['arrays']:
+            dtype = np.lib.format.descr_to_dtype(entry['descr'])
+            shape = tuple(entry['shape'])
+            if int(np.prod(shape)) == 0:
+                # Empty arrays cannot be mapped
+                arrays[entry['name']] = np.zeros(shape, dtype=dtype)
+            else:
+                arrays[entry['name']] = np.memmap(path, dtype=dtype, mode=mode, offset=entry['offset'], shape=shape)
+
+        return arrays, header['meta']
+
+    @staticmethod
+    def check(meta, structure, path=''):
+        """
+        Verify a snapshot holds the expected kind of structure
+        :param meta: dict metadata of snapshot
+        :param structure: str expected structure, e.g. 'heap' or 'tree'
+        :param path: str path of file, for the message
+        :return: no return value
+        :raises SnapshotException: if it does not
+        """
+        if meta.get('structure') != structure:
+            raise SnapshotException(
+                message="{} holds a {}, not a {}".format(path, meta.get('structure'), structure))
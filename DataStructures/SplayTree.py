@@ -0,0 +1,126 @@
+from DataStructures.BinarySearchNode import BinarySearchNode
+from DataStructures.BinarySearchTree import BinarySearchTree
+
+
+class SplayTree(BinarySearchTree):
+    """
+    Implement splay tree, a self-adjusting binary search tree
+
+    Every node that is inserted or searched for is rotated up to the head ("splayed"),
+    so recently used keys are near the top. Operations take amortized O(log n),
+    and keys that are used often take close to O(1).
+
+    Same interface as BinarySearchTree: insert, search, delete
+    For simplicity, all input must be integers
+    """
+    rebalances = True
+
+    def insert(self, key, verbose=False):
+        """
+        Insert key into tree, then splay new node to the head
+        @overrides method in BinarySearchTree
+        :param key: key of new node
+        :param verbose: boolean show actions during insert
+        :return: new node
+        """
+        node = super().insert(key, verbose=verbose)
+        self.splay(node, verbose=verbose)
+
+        if self.debug:
+            self.validate()
+
+        return node
+
+    def search(self, key, verbose=False) -> BinarySearchNode or None:
+        """
+        Find first instance of a node with the given search key,
+        then splay it to the head
+        If the key is not found, splay the last node searched instead
+        delete searches through this method, so it also deletes from the head
+        @overrides method in BinarySearchTree
+        :param key: search key
+        :param verbose: boolean show actions during search
+        :return: node
+        """
+
+        # Value not in tree if tree is empty
+        if self.is_empty():
+            return None
+
+        # Loop until the key is found or we hit the bottom of the tree
+        node = self.head
+        last_node = None
+        while node is not None:
+            this_key = node.get_key()
+            if key == this_key:
+                # Key found! Stop at first match
+                break
+
+            # Show process if verbose
+            if verbose:
+                self.show(secondary_highlights=node)
+
+            last_node = node
+            if key < this_key:
+                # Key belongs on the left side of this node (re BST property)
+                node = node.get_left()
+            else:
+                # Key belongs on the right side of this node
+                node = node.get_right()
+
+        # Bring the node, or the closest node to it, to the head
+        self.splay(node if node is not None else last_node, verbose=verbose)
+
+        if self.debug:
+            self.validate()
+
+        # Show found item if verbose
+        if node is not None and verbose:
+            self.show(primary_highlights=node)
+
+        return node
+
+    @staticmethod
+    def splay(node, verbose=False):
+        """
+        Rotate node up to the head of the tree
+        Pairs of rotations (zig-zig, zig-zag) roughly halve the depth
+        of every node on the path, which keeps operations amortized O(log n)
+        Every ancestor of node is rotated on the way up,
+        so rotations need not update heights above them
+        :param node: BinarySearchNode to bring to the head
+        :param verbose: boolean show rotations
+        :return: no return value
+        """
+        if node is None:
+            return
+
+        while node.get_parent() is not None:
+            parent = node.get_parent()
+            grandparent = parent.get_parent()
+            node_is_left = node.is_left_child()
+
+            if grandparent is None:
+                # Zig: parent is the head, one rotation
+                if node_is_left:
+                    parent.rotate_right(verbose=verbose, update_ancestors=False)
+                else:
+                    parent.rotate_left(verbose=verbose, update_ancestors=False)
+            elif node_is_left == parent.is_left_child():
+                # Zig-zig: node and parent on the same side
+                # Rotate grandparent first, then parent
+                if node_is_left:
+                    grandparent.rotate_right(verbose=verbose, update_ancestors=False)
+                    parent.rotate_right(verbose=verbose, update_ancestors=False)
+                else:
+                    grandparent.rotate_left(verbose=verbose, update_ancestors=False)
+                    parent.rotate_left(verbose=verbose, update_ancestors=False)
+            else:
+                # Zig-zag: node and parent on opposite sides
+                # Rotate parent, then grandparent
+                if node_is_left:
+                    parent.rotate_right(verbose=verbose, update_ancestors=False)
+                    grandparent.rotate_left(verbose=verbose, update_ancestors=False)
+                else:
+                    parent.rotate_left(verbose=verbose, update_ancestors=False)
+                    grandparent.rotate_right(verbose=verbose, update_ancestors=False)
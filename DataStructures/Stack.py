@@ -0,0 +1,20 @@
+from DataStructures.Deque import Deque
+
+
+class Stack(Deque):
+    """
+    Implement stack (last in, first out) as a NumPy ring buffer
+
+    Items are pushed to and popped from the back of a Deque.
+    pop_many returns items in the order pop would,
+    most recently pushed first.
+
+    Bounded (max_size) stacks push nothing when full (see Deque)
+    """
+    # Aliases rather than methods that call Deque,
+    # so that each push and pop is one Python call
+    push = Deque.push_back
+    pop = Deque.pop_back
+    peek = Deque.peek_back
+    push_many = Deque.push_many_back
+    pop_many = Deque.pop_many_back
@@ -0,0 +1,102 @@
+import random
+import numpy as np
+import pytest
+from DataStructures.BinaryHeap import HandleNotFoundException
+from DataStructures.BinaryMaxHeap import BinaryMaxHeap
+from DataStructures.BinaryMinHeap import BinaryMinHeap
+
+
+@pytest.mark.parametrize('dtype', [np.int64, np.int8, np.uint32, np.float64, np.float32,
+                                   np.float16, np.longdouble, '>i4', '>f8'])
+def test_any_number_dtype(dtype):
+    values = np.array([5, 1, 9, 3, 7, 2], dtype=dtype)
+    for heap_class, expected in ((BinaryMaxHeap, [9, 7, 5, 3, 2, 1]), (BinaryMinHeap, [1, 2, 3, 5, 7, 9])):
+        heap = heap_class(heap_size=2, dtype=dtype)
+        for value in values:
+            heap.add_item(value)
+        heap.validate()
+        assert [heap.extract_top() for _ in range(len(values))] == expected
+
+
+def test_extract_many_shrinks_to_live_size():
+    heap = BinaryMaxHeap(heap_size=10000)
+    heap.extend(np.arange(10000))
+    top = heap.extract_many(9990)
+    assert top.tolist() == list(range(9999, 9, -1))
+    assert heap.last_item + 1 == 10
+    assert heap.heap_size < 10 * BinaryMaxHeap.growth_factor ** 2
+    heap.validate()
+
+
+@pytest.mark.parametrize('growth_factor', [1, 0.5, 1.5])
+def test_shrink_ends_for_any_growth_factor(growth_factor):
+    heap = BinaryMaxHeap(heap_size=100)
+    heap.growth_factor = growth_factor
+    heap.extend(range(5))
+    assert heap.extract_max() == 4
+    assert heap.extract_many(2).tolist() == [3, 2]
+    assert heap.heap_size >= heap.last_item + 1
+    heap.validate()
+
+
+@pytest.mark.parametrize('heap_class', [BinaryMaxHeap, BinaryMinHeap])
+@pytest.mark.parametrize('arity', [2, 3, 4])
+def test_handles_against_oracle(heap_class, arity):
+    """
+    values[handle] is the oracle, the heap must agree with it after every change
+    """
+    generator = random.Random(arity)
+    best = max if heap_class is BinaryMaxHeap else min
+    heap = heap_class(heap_size=2, arity=arity, track_handles=True)
+    values = {}
+    for handle, value in zip(heap.extend([5, 1, 9]).tolist(), [5, 1, 9]):
+        values[handle] = value
+
+    for _ in range(800):
+        operation = generator.randrange(5) if len(values) > 0 else 0
+        if operation == 0:
+            value = generator.randrange(100)
+            handle = heap.add_item(value)
+            assert handle not in values
+            values[handle] = value
+        elif operation == 1:
+            handle = generator.choice(list(values))
+            values[handle] = generator.randrange(100)
+            heap.update_priority(handle, values[handle])
+        elif operation == 2:
+            handle = generator.choice(list(values))
+            assert heap.remove(handle) == values.pop(handle)
+            with pytest.raises(HandleNotFoundException):
+                heap.get_position(handle)
+        elif operation == 3:
+            assert heap.extract_top() == best(values.values())
+            # The extracted item's handle is gone, whichever it was
+            handle = next(handle for handle in values if heap.positions[handle] < 0)
+            del values[handle]
+        else:
+            handle = generator.choice(list(values))
+            assert heap.get_value_of(handle) == values[handle]
+            assert heap.get_value_at(heap.get_position(handle)) == values[handle]
+
+        heap.validate()
+        assert heap.last_item + 1 == len(values)
+        for handle, value in values.items():
+            assert heap.get_value_of(handle) == value
+
+
+@pytest.mark.parametrize('heap_class', [BinaryMaxHeap, BinaryMinHeap])
+@pytest.mark.parametrize('other_class', [BinaryMaxHeap, BinaryMinHeap])
+@pytest.mark.parametrize('sizes', [(0, 5), (5, 0), (50, 3), (3, 50)])
+def test_merge(heap_class, other_class, sizes):
+    generator = random.Random(sum(sizes))
+    values = [generator.randrange(1000) for _ in range(sizes[0])]
+    other_values = [generator.randrange(1000) for _ in range(sizes[1])]
+    heap = heap_class(values=values) if len(values) > 0 else heap_class()
+    other = other_class(values=other_values) if len(other_values) > 0 else other_class()
+    heap.merge(other)
+    heap.validate()
+    # The other heap is left as it was
+    other.validate()
+    assert other.last_item + 1 == len(other_values)
+    expected = sorted(values + other_values, reverse=heap_class is BinaryMaxHeap)
+    assert [heap.extract_top() for _ in range(len(expected))] == expected
@@ -0,0 +1,269 @@
+import math
+import random
+import numpy as np
+import pytest
+from DataStructures.AVLTree import AVLTree
+from DataStructures.BinarySearchTree import BinarySearchTree
+from DataStructures.BinaryTree import BinaryTree
+from DataStructures.CompactBinarySearchTree import CompactBinarySearchTree
+from DataStructures.RedBlackTree import RedBlackTree
+from DataStructures.SplayTree import SplayTree
+from tree_checks import check_tree
+
+TREE_CLASSES = [BinarySearchTree, AVLTree, RedBlackTree, SplayTree]
+
+
+@pytest.mark.parametrize('tree_class', TREE_CLASSES)
+def test_random_inserts_and_deletes(tree_class):
+    generator = random.Random(7)
+    tree = tree_class()
+    expected = []
+    for _ in range(1000):
+        key = generator.randrange(80)
+        if generator.random() < 0.6:
+            node = tree.insert(key)
+            assert node.key == key
+            expected.append(key)
+        else:
+            node = tree.delete(key)
+            if key in expected:
+                assert node.key == key
+                expected.remove(key)
+            else:
+                assert node is None
+        check_tree(tree, expected)
+
+
+@pytest.mark.parametrize('tree_class, height_bound', [
+    (AVLTree, lambda n: 1.44 * math.log2(n + 2)),
+    (RedBlackTree, lambda n: 2 * math.log2(n + 1)),
+])
+@pytest.mark.parametrize('order', ['ascending', 'descending'])
+def test_sorted_inserts_stay_balanced(tree_class, height_bound, order):
+    keys = list(range(500))
+    if order == 'descending':
+        keys.reverse()
+    tree = tree_class()
+    for key in keys:
+        tree.insert(key)
+    check_tree(tree, keys)
+    assert tree.head.height <= height_bound(len(keys))
+    for key in keys[:400]:
+        tree.delete(key)
+    check_tree(tree, keys[400:])
+    assert tree.head.height <= height_bound(100)
+
+
+def test_splay_brings_used_keys_to_the_head():
+    tree = SplayTree()
+    keys = list(range(0, 100, 2))
+    random.Random(3).shuffle(keys)
+    for key in keys:
+        tree.insert(key)
+        assert tree.head.key == key
+    for key in (40, 2, 98, 40):
+        assert tree.search(key).key == key
+        assert tree.head.key == key
+        check_tree(tree, keys)
+    # A missing key splays the last node on its search path
+    assert tree.search(41) is None
+    assert tree.head.key in (40, 42)
+    check_tree(tree, keys)
+
+
+def same_shape(tree, other):
+    """
+    Both trees have the same keys in the same places
+    """
+    stack = [(tree.head, other.head)]
+    while len(stack) > 0:
+        node, other_node = stack.pop()
+        if node is None or other_node is None:
+            assert node is None and other_node is None
+            continue
+        assert node.key == other_node.key
+        stack.append((node.left, other_node.left))
+        stack.append((node.right, other_node.right))
+
+
+def test_compact_tree_matches_binary_search_tree():
+    generator = random.Random(11)
+    compact = CompactBinarySearchTree(tree_size=2)
+    tree = BinarySearchTree()
+    expected = []
+    peak_count = 0
+    for _ in range(1000):
+        key = generator.randrange(80)
+        if generator.random() < 0.6:
+            compact.insert(key)
+            tree.insert(key)
+            expected.append(key)
+        else:
+            deleted = compact.delete(key)
+            tree.delete(key)
+            if key in expected:
+                assert deleted == key
+                expected.remove(key)
+            else:
+                assert deleted is None
+        assert compact.count == len(expected)
+        peak_count = max(peak_count, compact.count)
+        copy = compact.to_binary_search_tree()
+        check_tree(copy, expected)
+        same_shape(copy, tree)
+    # Freed slots are reused first, so no more slots were used than nodes were ever in the tree at once
+    assert compact.next_unused == peak_count
+
+
+def test_compact_tree_reuses_free_slots():
+    compact = CompactBinarySearchTree(tree_size=4)
+    for key in (2, 1, 3, 4):
+        compact.insert(key)
+    assert compact.delete(1) == 1
+    compact.insert(5)
+    assert compact.tree_size == 4
+    assert compact.next_unused == 4
+    check_tree(compact.to_binary_search_tree(), [2, 3, 4, 5])
+
+
+@pytest.mark.parametrize('tree_class', TREE_CLASSES)
+def test_nodes_have_slots(tree_class):
+    node = tree_class().insert(1)
+    assert not hasattr(node, '__dict__')
+
+
+@pytest.mark.parametrize('tree_class', TREE_CLASSES)
+@pytest.mark.parametrize('size', [0, 1, 2, 7, 8, 100])
+def test_from_sorted_is_balanced(tree_class, size):
+    keys = sorted(random.Random(size).randrange(50) for _ in range(size))
+    for tree in (tree_class.from_sorted(keys), tree_class.from_sorted(keys[::-1]),
+                 tree_class.from_array(np.array(keys[::-1]))):
+        assert isinstance(tree, tree_class)
+        check_tree(tree, keys)
+        if size > 0:
+            assert tree.head.height == size.bit_length()
+        # Bulk-loaded trees go on inserting and deleting as any other
+        tree.insert(25)
+        tree.delete(keys[0] if size > 0 else 25)
+        check_tree(tree, keys[1:] + [25] if size > 0 else [])
+
+
+@pytest.mark.parametrize('tree_class', TREE_CLASSES)
+def test_range_floor_and_ceiling(tree_class):
+    generator = random.Random(5)
+    keys = [generator.randrange(0, 200, 2) for _ in range(150)]
+    tree = tree_class()
+    for key in keys:
+        tree.insert(key)
+    keys.sort()
+    check_tree(tree, keys)
+    bounds = [None, -10, 0, 1, 57, 58, 100, 199, 198, 250]
+    for low in bounds:
+        for high in bounds:
+            assert list(tree.range(low, high)) == [key for key in keys
+                                                   if (low is None or key >= low) and (high is None or key <= high)]
+    for key in range(-5, 205):
+        floor = tree.floor(key)
+        ceiling = tree.ceiling(key)
+        below = [other for other in keys if other <= key]
+        above = [other for other in keys if other >= key]
+        assert (floor.key if floor is not None else None) == (below[-1] if len(below) > 0 else None)
+        assert (ceiling.key if ceiling is not None else None) == (above[0] if len(above) > 0 else None)
+    # Iterating is in order, and does not change the tree
+    assert list(tree) == keys
+    check_tree(tree, keys)
+
+
+@pytest.mark.parametrize('tree_class', TREE_CLASSES)
+def test_select_and_rank(tree_class):
+    generator = random.Random(9)
+    tree = tree_class()
+    expected = []
+    for _ in range(300):
+        key = generator.randrange(60)
+        if generator.random() < 0.7:
+            tree.insert(key)
+            expected.append(key)
+        elif tree.delete(key) is not None:
+            expected.remove(key)
+        expected.sort()
+        assert len(tree) == len(expected)
+        index = generator.randrange(-len(expected) - 2, len(expected) + 2)
+        node = tree.select(index)
+        if -len(expected) <= index < len(expected):
+            assert node.key == expected[index]
+        else:
+            assert node is None
+        key = generator.randrange(-1, 62)
+        assert tree.rank(key) == sum(1 for other in expected if other < key)
+    check_tree(tree, expected)
+    for index, key in enumerate(expected):
+        assert tree.select(index).key == key
+        assert tree.rank(key) == expected.index(key)
+
+
+@pytest.mark.parametrize('tree_class', TREE_CLASSES)
+def test_kept_count_and_height_match_a_crawl(tree_class):
+    generator = random.Random(13)
+    tree = tree_class()
+    for _ in range(400):
+        key = generator.randrange(1, 5000)
+        if generator.random() < 0.7:
+            tree.insert(key)
+        else:
+            tree.delete(key)
+        if not tree.is_empty():
+            # validate() checks the size and height of every node, this checks the head against a full crawl
+            tree.validate()
+            assert tree.get_count_height_and_max_digs() == BinaryTree.get_count_height_and_max_digs(tree)
+
+
+@pytest.mark.parametrize('tree_class', TREE_CLASSES)
+def test_batch_methods(tree_class):
+    generator = np.random.default_rng(17)
+    tree = tree_class()
+    expected = []
+    for _ in range(30):
+        batch = generator.integers(0, 100, size=generator.integers(0, 20))
+        is_new = tree.insert_many(batch)
+        assert is_new.tolist() == [key not in expected for key in batch.tolist()]
+        expected.extend(batch.tolist())
+        check_tree(tree, expected)
+
+        batch = generator.integers(-5, 105, size=generator.integers(0, 20))
+        assert tree.contains_many(batch).tolist() == [key in expected for key in batch.tolist()]
+
+        batch = generator.integers(0, 100, size=generator.integers(0, 10))
+        deleted = tree.delete_many(batch)
+        # Each key is deleted once for each time it is in the tree, smallest first
+        remaining = list(expected)
+        for key, was_deleted in sorted(zip(batch.tolist(), deleted.tolist()), key=lambda pair: pair[0]):
+            assert was_deleted == (key in remaining)
+            if was_deleted:
+                remaining.remove(key)
+        expected = remaining
+        check_tree(tree, expected)
+    assert tree.contains_many([]).size == 0
+
+
+@pytest.mark.parametrize('in_steps', [False, True])
+def test_remove_node(in_steps):
+    generator = random.Random(19)
+    keys = [generator.randrange(100) for _ in range(200)]
+    tree = BinarySearchTree()
+    for key in keys:
+        tree.insert(key)
+    # Every shape of removal: leaves, one child, two children and the head
+    while len(keys) > 0:
+        node = tree.select(generator.randrange(len(keys)))
+        if generator.random() < 0.1:
+            node = tree.head
+        keys.remove(node.key)
+        if in_steps:
+            tree.remove_node_in_steps(node)
+        else:
+            lowest_changed = tree.remove_node(node)
+            assert lowest_changed is None or lowest_changed.tree is tree
+            assert node.parent is None and node.left is None and node.right is None
+        check_tree(tree, keys)
+    assert tree.is_empty()
@@ -0,0 +1,105 @@
+import collections
+import random
+import pytest
+from DataStructures.BPlusTree import BPlusTree
+
+
+def check_bplus_tree(tree, expected_keys):
+    """
+    validate(), leaves all on the last level and linked in order,
+    and the keys against a sorted-list oracle
+    """
+    tree.validate()
+    levels = tree.get_levels()
+    for level in levels[:-1]:
+        assert not any(node.is_leaf() for node in level)
+    leaves = levels[-1] if len(levels) > 0 else []
+    assert all(node.is_leaf() for node in leaves)
+    leaf = tree.first_leaf()
+    for node in leaves:
+        assert leaf is node
+        leaf = leaf.next_leaf
+    assert leaf is None
+    assert list(tree) == sorted(expected_keys)
+    assert len(tree) == len(expected_keys)
+
+
+def count_calls(monkeypatch, *names):
+    """
+    Count calls to BPlusTree methods, so tests know which paths they took
+    """
+    calls = collections.Counter()
+    for name in names:
+        method = getattr(BPlusTree, name)
+
+        def counted(self, *args, _name=name, _method=method):
+            calls[_name] += 1
+            return _method(self, *args)
+        monkeypatch.setattr(BPlusTree, name, counted)
+    return calls
+
+
+@pytest.mark.parametrize('fanout', [3, 4, 5, 8])
+def test_random_inserts_and_deletes(monkeypatch, fanout):
+    calls = count_calls(monkeypatch, 'split', 'fix_underflow', 'merge')
+    generator = random.Random(fanout)
+    tree = BPlusTree(fanout=fanout)
+    expected = []
+    for _ in range(400):
+        key = generator.randrange(60)
+        tree.insert(key)
+        expected.append(key)
+    check_bplus_tree(tree, expected)
+    assert len(tree.get_levels()) > 2
+
+    for _ in range(600):
+        key = generator.randrange(70)
+        deleted = tree.delete(key)
+        if key in expected:
+            assert deleted == key
+            expected.remove(key)
+        else:
+            assert deleted is None
+        check_bplus_tree(tree, expected)
+
+    # Splits, borrows (underflows fixed without a merge) and merges all happened
+    assert calls['split'] > 0
+    assert calls['merge'] > 0
+    assert calls['fix_underflow'] > calls['merge']
+
+
+def test_drains_to_empty():
+    tree = BPlusTree(fanout=3)
+    keys = list(range(50))
+    for key in keys:
+        tree.insert(key)
+    random.Random(0).shuffle(keys)
+    for i, key in enumerate(keys):
+        assert tree.delete(key) == key
+        check_bplus_tree(tree, keys[i + 1:])
+    assert tree.is_empty()
+    assert tree.delete(0) is None
+
+
+@pytest.mark.parametrize('low, high', [(None, None), (10, 20), (None, 7), (33, None), (15, 15),
+                                       (-5, 3), (40, 99), (21, 20), (100, 200)])
+def test_range(low, high):
+    tree = BPlusTree(fanout=4)
+    expected = [key for key in range(0, 45, 3) for _ in range(2)]
+    for key in expected:
+        tree.insert(key)
+    check_bplus_tree(tree, expected)
+    assert list(tree.range(low, high)) == [key for key in expected
+                                           if (low is None or key >= low) and (high is None or key <= high)]
+
+
+def test_search():
+    tree = BPlusTree(fanout=5)
+    for key in range(0, 100, 2):
+        tree.insert(key)
+    for key in range(100):
+        node = tree.search(key)
+        if key % 2 == 0:
+            assert key in node.get_keys().tolist()
+        else:
+            assert node is None
@@ -0,0 +1,98 @@
+import collections
+import weakref
+import numpy as np
+import pytest
+from DataStructures.Deque import Deque
+from DataStructures.Stack import Stack
+from DataStructures.Queue import Queue
+
+
+@pytest.mark.parametrize('dtype', [np.int64, np.uint8, np.float64, np.float16, np.longdouble,
+                                   np.complex128, '>i4', '>f8', 'datetime64[s]', object])
+def test_any_dtype(dtype):
+    items = np.arange(1, 11).astype(dtype)
+    deque = Deque(capacity=2, dtype=dtype)
+    for item in items[:5]:
+        assert deque.push_back(item)
+    for item in items[5:]:
+        assert deque.push_front(item)
+    assert deque.pop_back() == items[4]
+    assert deque.pop_front() == items[9]
+    assert deque.peek_front() == items[8]
+    assert len(deque) == 8
+
+
+def test_matches_collections_deque():
+    rng = np.random.default_rng(0)
+    deque = Deque(capacity=2)
+    expected = collections.deque()
+    for _ in range(2000):
+        operation = rng.integers(6)
+        items = rng.integers(0, 100, rng.integers(0, 10)).tolist()
+        if operation == 0:
+            deque.push_many_back(items)
+            expected.extend(items)
+        elif operation == 1:
+            deque.push_many_front(items)
+            expected.extendleft(items)
+        elif operation == 2:
+            assert deque.pop_many_back(len(items)).tolist() == [expected.pop() for _ in range(min(len(items), len(expected)))]
+        elif operation == 3:
+            assert deque.pop_many_front(len(items)).tolist() == [expected.popleft() for _ in range(min(len(items), len(expected)))]
+        elif operation == 4:
+            assert deque.pop_back() == (expected.pop() if expected else None)
+        else:
+            assert deque.pop_front() == (expected.popleft() if expected else None)
+        assert list(deque) == list(expected)
+
+
+def test_bounded_back_pressure():
+    queue = Queue(max_size=4)
+    assert queue.push_many(range(6)) == 4
+    assert not queue.push(6)
+    assert queue.pop() == 0
+    assert queue.push(6)
+    assert queue.pop_many(10).tolist() == [1, 2, 3, 6]
+
+
+def test_stack_order():
+    stack = Stack()
+    stack.push_many([1, 2, 3])
+    stack.push(4)
+    assert stack.pop() == 4
+    assert stack.pop_many(2).tolist() == [3, 2]
+
+
+@pytest.mark.parametrize('k', [-1, -5, 0])
+def test_pop_many_nothing(k):
+    deque = Deque()
+    deque.push_many_back([1, 2])
+    assert deque.pop_many_back(k).size == 0
+    assert deque.pop_many_front(k).size == 0
+    assert len(deque) == 2
+    assert list(deque) == [1, 2]
+
+
+class Item:
+    pass
+
+
+@pytest.mark.parametrize('pop', ['pop_back', 'pop_front', 'pop_many_back', 'pop_many_front', 'clear'])
+def test_popped_objects_are_released(pop):
+    deque = Deque(capacity=4, dtype=object)
+    # Wrap around the end of the ring, so pop_many_* vacate two slices
+    deque.push_many_back([Item(), Item()])
+    deque.pop_many_front(2)
+    items = [Item() for _ in range(4)]
+    references = [weakref.ref(item) for item in items]
+    deque.push_many_back(items)
+    assert deque.head == 2
+    if pop in ('pop_back', 'pop_front'):
+        popped = [getattr(deque, pop)() for _ in range(4)]
+    elif pop == 'clear':
+        popped = deque.clear()
+    else:
+        popped = getattr(deque, pop)(4)
+    assert len(deque) == 0
+    del items, popped
+    assert all(reference() is None for reference in references)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from DataStructures.OpenAddressingHashTable import OpenAddressingHashTable
+from DataStructures.ChainedHashTable import ChainedHashTable
+
+TABLE_CLASSES = [OpenAddressingHashTable, ChainedHashTable]
+
+
+@pytest.mark.parametrize('table_class', TABLE_CLASSES)
+@pytest.mark.parametrize('value_dtype, values', [
+    (np.int64, [10, 20, 30]),
+    (np.float16, [0.5, 1.5, 2.5]),
+    (np.complex128, [1 + 2j, 3j, 4]),
+    ('>f8', [0.25, 0.5, 0.75]),
+    ('datetime64[s]', np.array(['2020-01-01', '2021-06-15', '2022-12-31'], dtype='datetime64[s]')),
+    ([('a', np.int32), ('b', np.float64)], np.array([(1, 1.5), (2, 2.5), (3, 3.5)],
+                                                    dtype=[('a', np.int32), ('b', np.float64)])),
+])
+def test_value_dtypes(table_class, value_dtype, values):
+    values = np.asarray(values, dtype=value_dtype)
+    table = table_class(capacity=2, value_dtype=value_dtype)
+    for key, value in zip([1, 2, 3], values):
+        table.put(key, value)
+    for key, value in zip([1, 2, 3], values):
+        assert table[key] == value
+    table.put_many([4, 5], values[:2])
+    assert (table.get_many([1, 2, 3, 4, 5]) == np.concatenate((values, values[:2]))).all()
+    table.validate()
+
+
+@pytest.mark.parametrize('table_class', TABLE_CLASSES)
+def test_matches_dict(table_class):
+    rng = np.random.default_rng(0)
+    table = table_class(capacity=4)
+    expected = {}
+    for _ in range(20):
+        keys = rng.integers(-200, 200, 50)
+        values = rng.integers(0, 1000, 50)
+        table.put_many(keys, values)
+        expected.update(zip(keys.tolist(), values.tolist()))
+        deleted = rng.integers(-200, 200, 30)
+        table.delete_many(deleted)
+        for key in deleted.tolist():
+            expected.pop(key, None)
+        table.validate()
+    assert len(table) == len(expected)
+    assert {key: table[key] for key in table} == expected
@@ -0,0 +1,168 @@
+import itertools
+import random
+import pytest
+from DataStructures.CompactLinkedList import CompactLinkedList
+from DataStructures.LinkedList import LinkedList, LinkedListPropertyException
+
+
+def new_list(list_class):
+    return LinkedList(pool_size=4) if list_class is LinkedList else CompactLinkedList(list_size=2)
+
+
+def check_list(linked_list, expected_keys):
+    """
+    validate() and the keys against a list oracle
+    """
+    linked_list.validate()
+    assert list(linked_list) == expected_keys
+    assert len(linked_list) == len(expected_keys)
+
+
+@pytest.mark.parametrize('list_class', [LinkedList, CompactLinkedList])
+def test_random_operations(list_class):
+    """
+    Every key is unique, so nodes[key] is its node and expected is the list of keys in order
+    """
+    generator = random.Random(1)
+    keys = itertools.count()
+    linked_list = new_list(list_class)
+    nodes = {}
+    expected = []
+
+    for step in range(1500):
+        operation = generator.randrange(9) if len(expected) > 0 else generator.randrange(3)
+        if operation == 0:
+            key = next(keys)
+            nodes[key] = linked_list.push_front(key)
+            expected.insert(0, key)
+        elif operation == 1:
+            key = next(keys)
+            nodes[key] = linked_list.push_back(key)
+            expected.append(key)
+        elif operation == 2:
+            # Splice a list of new keys in after a node, or at the head
+            other = new_list(list_class)
+            other_keys = [next(keys) for _ in range(generator.randrange(4))]
+            other_nodes = [other.push_back(key) for key in other_keys]
+            i = generator.randrange(len(expected) + 1)
+            after = nodes[expected[i - 1]] if i > 0 else None
+            offset = linked_list.splice(after, other)
+            for key, node in zip(other_keys, other_nodes):
+                nodes[key] = node if list_class is LinkedList else node + offset
+            expected[i:i] = other_keys
+            check_list(other, [])
+        elif operation == 3:
+            i = generator.randrange(len(expected))
+            key = next(keys)
+            if generator.random() < 0.5:
+                nodes[key] = linked_list.insert_after(nodes[expected[i]], key)
+                expected.insert(i + 1, key)
+            else:
+                nodes[key] = linked_list.insert_before(nodes[expected[i]], key)
+                expected.insert(i, key)
+        elif operation == 4:
+            key = expected.pop(generator.randrange(len(expected)))
+            assert linked_list.remove(nodes.pop(key)) == key
+        elif operation == 5:
+            if generator.random() < 0.5:
+                key = expected.pop(0)
+                assert linked_list.pop_front() == key
+            else:
+                key = expected.pop()
+                assert linked_list.pop_back() == key
+            del nodes[key]
+        elif operation == 6:
+            # Move a run of keys after a key outside of it, or to the head
+            i = generator.randrange(len(expected))
+            j = generator.randrange(i, len(expected))
+            run = expected[i:j + 1]
+            rest = expected[:i] + expected[j + 1:]
+            k = generator.randrange(len(rest) + 1)
+            after = nodes[rest[k - 1]] if k > 0 else None
+            linked_list.move_range(nodes[run[0]], nodes[run[-1]], after)
+            expected = rest[:k] + run + rest[k:]
+        elif operation == 7:
+            key = expected.pop(generator.randrange(len(expected)))
+            linked_list.move_to_front(nodes[key])
+            expected.insert(0, key)
+        else:
+            key = expected.pop(generator.randrange(len(expected)))
+            linked_list.move_to_back(nodes[key])
+            expected.append(key)
+
+        check_list(linked_list, expected)
+
+    while len(expected) > 0:
+        assert linked_list.pop_front() == expected.pop(0)
+    check_list(linked_list, [])
+    assert linked_list.pop_front() is None
+    assert linked_list.pop_back() is None
+
+
+@pytest.mark.parametrize('list_class', [LinkedList, CompactLinkedList])
+def test_concat(list_class):
+    first = list_class.from_array([1, 2, 3])
+    second = list_class.from_array([4, 5])
+    first.concat(second)
+    check_list(first, [1, 2, 3, 4, 5])
+    check_list(second, [])
+    first.concat(second)
+    check_list(first, [1, 2, 3, 4, 5])
+    second.concat(first)
+    check_list(second, [1, 2, 3, 4, 5])
+    check_list(first, [])
+
+
+def test_pool_reuses_nodes():
+    linked_list = LinkedList(pool_size=2)
+    nodes = [linked_list.push_back(key) for key in range(4)]
+    for node in nodes:
+        linked_list.remove(node)
+    # Only the first pool_size nodes removed are kept, and reused last removed first
+    assert linked_list.pool_count == 2
+    reused = [linked_list.push_back(key) for key in range(10, 13)]
+    assert reused[0] is nodes[1]
+    assert reused[1] is nodes[0]
+    assert all(reused[2] is not node for node in nodes)
+    assert linked_list.pool_count == 0
+    check_list(linked_list, [10, 11, 12])
+
+
+def test_no_pool():
+    linked_list = LinkedList()
+    node = linked_list.push_back(1)
+    linked_list.remove(node)
+    assert linked_list.pool_count == 0
+    assert linked_list.push_back(2) is not node
+
+
+def test_compact_reuses_free_slots():
+    linked_list = CompactLinkedList(list_size=4)
+    nodes = [linked_list.push_back(key) for key in range(4)]
+    linked_list.remove(nodes[1])
+    linked_list.remove(nodes[2])
+    # Freed slots are reused last freed first, without allocating more
+    assert linked_list.push_back(7) == nodes[2]
+    assert linked_list.push_back(8) == nodes[1]
+    assert linked_list.list_size == 4
+    check_list(linked_list, [0, 3, 7, 8])
+
+
+def test_compact_splice_keeps_free_slots():
+    linked_list = CompactLinkedList.from_array([1, 2])
+    other = CompactLinkedList.from_array([3, 4, 5])
+    removed = other.search(4)
+    other.remove(removed)
+    offset = linked_list.splice(None, other)
+    check_list(linked_list, [3, 5, 1, 2])
+    # The freed slot of other is free here too, and reused first
+    assert linked_list.push_back(6) == removed + offset
+    check_list(linked_list, [3, 5, 1, 2, 6])
+
+
+@pytest.mark.parametrize('list_class', [LinkedList, CompactLinkedList])
+def test_validate_finds_broken_links(list_class):
+    linked_list = list_class.from_array([1, 2, 3])
+    linked_list.count = 4
+    with pytest.raises(LinkedListPropertyException):
+        linked_list.validate()
@@ -0,0 +1,73 @@
+import random
+import numpy as np
+import pytest
+from DataStructures.PairingHeap import PairingHeap
+
+
+def check_pairing_heap(heap, expected_values):
+    """
+    No child has priority over its parent, size is the number of nodes,
+    and the values against a sorted-list oracle
+    """
+    values = []
+    stack = [heap.head] if heap.head is not None else []
+    while len(stack) > 0:
+        node = stack.pop()
+        values.append(node.get_key())
+        child = node.get_child()
+        while child is not None:
+            assert not heap.has_priority(child.get_key(), node.get_key())
+            stack.append(child)
+            child = child.get_sibling()
+    assert heap.head is None or heap.head.get_sibling() is None
+    assert sorted(values) == sorted(expected_values)
+    assert heap.size == len(expected_values)
+
+
+@pytest.mark.parametrize('largest_first', [True, False])
+def test_random_operations(largest_first):
+    generator = random.Random(int(largest_first))
+    best = max if largest_first else min
+    heap = PairingHeap(largest_first=largest_first)
+    expected = []
+    for _ in range(600):
+        operation = generator.randrange(3)
+        if operation == 0:
+            value = generator.randrange(100)
+            heap.add_item(value)
+            expected.append(value)
+        elif operation == 1:
+            other_values = [generator.randrange(100) for _ in range(generator.randrange(5))]
+            other = PairingHeap(values=other_values, largest_first=largest_first)
+            heap.merge(other)
+            expected.extend(other_values)
+            check_pairing_heap(other, [])
+        elif len(expected) > 0:
+            top = best(expected)
+            assert heap.get_top() == top
+            assert heap.extract_top() == top
+            expected.remove(top)
+        check_pairing_heap(heap, expected)
+
+    expected.sort(reverse=largest_first)
+    assert [heap.extract_top() for _ in range(len(expected))] == expected
+    assert heap.is_empty()
+    assert heap.extract_top() == heap.default_value
+    assert heap.get_top() == (-np.inf if largest_first else np.inf)
+
+
+def test_merge_empty_and_self():
+    heap = PairingHeap(values=[3, 1, 2])
+    heap.merge(PairingHeap())
+    heap.merge(heap)
+    check_pairing_heap(heap, [1, 2, 3])
+    empty = PairingHeap()
+    empty.merge(heap)
+    check_pairing_heap(empty, [1, 2, 3])
+    check_pairing_heap(heap, [])
+    assert [empty.extract_top() for _ in range(3)] == [3, 2, 1]
+
+
+def test_merge_other_order_is_rejected():
+    with pytest.raises(AssertionError):
+        PairingHeap().merge(PairingHeap(largest_first=False))
@@ -0,0 +1,145 @@
+import numpy as np
+import pytest
+from DataStructures.AVLTree import AVLTree
+from DataStructures.BinaryMaxHeap import BinaryMaxHeap
+from DataStructures.BinaryMinHeap import BinaryMinHeap
+from DataStructures.BinarySearchTree import BinarySearchTree
+from DataStructures.CompactBinarySearchTree import CompactBinarySearchTree
+from DataStructures.RedBlackTree import RedBlackTree
+from DataStructures.Snapshot import SnapshotException
+from DataStructures.SplayTree import SplayTree
+from tree_checks import check_tree
+
+KEYS = [50, 20, 80, 10, 30, 70, 90, 25, 35, 60, 5, 95]
+
+
+def compact_keys(tree):
+    return list(tree.to_binary_search_tree())
+
+
+@pytest.mark.parametrize('heap_class, extract, order', [(BinaryMaxHeap, 'extract_max', sorted(KEYS, reverse=True)),
+                                                         (BinaryMinHeap, 'extract_min', sorted(KEYS))])
+def test_heap_round_trip(tmp_path, heap_class, extract, order):
+    path = str(tmp_path / 'heap.bin')
+    heap = heap_class(heap_size=2)
+    for key in KEYS:
+        heap.add_item(key)
+    heap.save(path)
+
+    loaded = heap_class.load(path)
+    loaded.validate()
+    assert loaded.heap[:loaded.last_item + 1].tolist() == heap.heap[:heap.last_item + 1].tolist()
+    # Changes stay in memory, the file is unchanged
+    assert [getattr(loaded, extract)() for _ in KEYS] == order
+    loaded.add_item(7)
+    reloaded = heap_class.load(path)
+    reloaded.validate()
+    assert [getattr(reloaded, extract)() for _ in KEYS] == order
+
+
+def test_heap_of_other_order_is_rejected(tmp_path):
+    path = str(tmp_path / 'heap.bin')
+    BinaryMaxHeap(KEYS).save(path)
+    with pytest.raises(SnapshotException):
+        BinaryMinHeap.load(path)
+
+
+@pytest.mark.parametrize('tree_class', [BinarySearchTree, AVLTree, RedBlackTree, SplayTree])
+def test_tree_round_trip(tmp_path, tree_class):
+    path = str(tmp_path / 'tree.bin')
+    tree = tree_class()
+    for key in KEYS:
+        tree.insert(key)
+    tree.delete(30)
+    tree.save(path)
+
+    loaded = tree_class.load(path)
+    check_tree(loaded, set(KEYS) - {30})
+    assert loaded.get_count_height_and_max_digs() == tree.get_count_height_and_max_digs()
+    loaded.insert(40)
+    loaded.delete(50)
+    check_tree(loaded, set(KEYS) - {30, 50} | {40})
+
+    compact = CompactBinarySearchTree.load(path)
+    assert compact_keys(compact) == sorted(set(KEYS) - {30})
+
+
+def test_compact_tree_round_trip(tmp_path):
+    path = str(tmp_path / 'compact.bin')
+    tree = CompactBinarySearchTree()
+    for key in KEYS:
+        tree.insert(key)
+    tree.delete(20)
+    tree.save(path)
+
+    loaded = CompactBinarySearchTree.load(path)
+    assert loaded.count == len(KEYS) - 1
+    assert compact_keys(loaded) == sorted(set(KEYS) - {20})
+    # Free slots are reused after loading, the file is unchanged
+    loaded.delete(3)
+    loaded.delete(80)
+    loaded.insert(81)
+    assert compact_keys(loaded) == sorted(set(KEYS) - {20, 80} | {81})
+    reloaded = CompactBinarySearchTree.load(path)
+    assert reloaded.count == len(KEYS) - 1
+    assert compact_keys(reloaded) == sorted(set(KEYS) - {20})
+    assert list(BinarySearchTree.load(path)) == sorted(set(KEYS) - {20})
+
+
+def test_read_only_mode(tmp_path):
+    path = str(tmp_path / 'compact.bin')
+    tree = CompactBinarySearchTree()
+    for key in KEYS:
+        tree.insert(key)
+    tree.save(path)
+    loaded = CompactBinarySearchTree.load(path, mode='r')
+    assert loaded.search(35) is not None
+    with pytest.raises((TypeError, ValueError)):
+        loaded.delete(35)
+
+
+def test_write_through_mode_is_rejected(tmp_path):
+    heap_path = str(tmp_path / 'heap.bin')
+    tree_path = str(tmp_path / 'tree.bin')
+    BinaryMaxHeap(KEYS).save(heap_path)
+    BinarySearchTree.from_array(np.array(KEYS)).save(tree_path)
+    with pytest.raises(SnapshotException):
+        BinaryMaxHeap.load(heap_path, mode='r+')
+    with pytest.raises(SnapshotException):
+        CompactBinarySearchTree.load(tree_path, mode='r+')
+
+
+def test_empty_structures(tmp_path):
+    path = str(tmp_path / 'empty.bin')
+    BinaryMaxHeap().save(path)
+    assert BinaryMaxHeap.load(path).last_item == -1
+    BinarySearchTree().save(path)
+    assert BinarySearchTree.load(path).is_empty()
+    assert CompactBinarySearchTree.load(path).is_empty()
+
+
+def test_not_a_snapshot(tmp_path):
+    path = tmp_path / 'junk.bin'
+    path.write_bytes(b'not a snapshot at all, definitely not')
+    with pytest.raises(SnapshotException):
+        BinarySearchTree.load(str(path))
+
+
+@pytest.mark.parametrize('tree_class', [AVLTree, RedBlackTree, SplayTree])
+@pytest.mark.parametrize('saved_class', [BinarySearchTree, AVLTree, RedBlackTree, CompactBinarySearchTree])
+def test_self_balancing_tree_from_other_class(tmp_path, tree_class, saved_class):
+    path = str(tmp_path / 'tree.bin')
+    # Sorted inserts make one long branch in the unbalanced trees
+    tree = saved_class()
+    for key in range(20):
+        tree.insert(key)
+    tree.delete(7)
+    tree.save(path)
+
+    loaded = tree_class.load(path)
+    assert type(loaded) is tree_class
+    keys = [key for key in range(20) if key != 7]
+    check_tree(loaded, keys)
+    loaded.insert(100)
+    loaded.delete(0)
+    check_tree(loaded, keys[1:] + [100])
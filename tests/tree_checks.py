@@ -0,0 +1,47 @@
+"""
+Invariants of the self-balancing trees, checked on top of validate()
+"""
+from DataStructures.AVLTree import AVLTree
+from DataStructures.RedBlackTree import RedBlackTree
+
+
+def check_avl(tree):
+    """
+    Every node's subtree heights differ by at most one
+    """
+    for node in tree.in_order():
+        assert abs(node.get_balance()) <= 1, 'node {} has balance {}'.format(node.key, node.get_balance())
+
+
+def check_red_black(tree):
+    """
+    Head is black, no red node has a red child,
+    and every path from a node down to an empty child has the same number of black nodes
+    """
+    assert tree.head is None or not tree.head.is_red, 'head is red'
+    # Black height of each node's subtree, found bottom up
+    black_heights = {None: 0}
+    nodes = list(tree.in_order())
+    for node in sorted(nodes, key=lambda node: node.height):
+        left_height = black_heights[node.left]
+        right_height = black_heights[node.right]
+        assert left_height == right_height, 'node {} has black heights {} and {}'.format(
+            node.key, left_height, right_height)
+        if node.is_red:
+            for child in (node.left, node.right):
+                assert child is None or not child.is_red, 'red node {} has a red child'.format(node.key)
+        black_heights[node] = left_height + (0 if node.is_red else 1)
+
+
+def check_tree(tree, expected_keys):
+    """
+    validate(), the balance rules of the tree's class,
+    and the keys against a sorted-list oracle
+    """
+    tree.validate()
+    if isinstance(tree, AVLTree):
+        check_avl(tree)
+    if isinstance(tree, RedBlackTree):
+        check_red_black(tree)
+    assert list(tree) == sorted(expected_keys)
+    assert len(tree) == len(expected_keys)